@@ -0,0 +1,62 @@
+"""add ticker_mention_buckets for sliding-window trending
+
+Revision ID: 0005_mention_buckets
+Revises: 0004_recent_searches
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import inspect
+
+revision: str = "0005_mention_buckets"
+down_revision: Union[str, None] = "0004_recent_searches"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match app.services.trending_service (BUCKET_SECONDS, RETENTION).
+BUCKET_SECONDS = 300
+RETENTION_DAYS = 14
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    insp = inspect(conn)
+    if "ticker_mention_buckets" not in insp.get_table_names():
+        op.create_table(
+            "ticker_mention_buckets",
+            sa.Column("ticker_id", UUID(as_uuid=True), nullable=False),
+            sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("mention_count", sa.Integer(), server_default="0", nullable=False),
+            sa.PrimaryKeyConstraint("ticker_id", "bucket_start"),
+            sa.ForeignKeyConstraint(["ticker_id"], ["tickers.id"], ondelete="CASCADE"),
+        )
+        op.create_index(
+            "ix_ticker_mention_buckets_bucket_start",
+            "ticker_mention_buckets",
+            ["bucket_start"],
+            unique=False,
+        )
+    # Seed buckets from recent history so trending is populated right away.
+    op.execute(f"""
+        INSERT INTO ticker_mention_buckets (ticker_id, bucket_start, mention_count)
+        SELECT pt.ticker_id,
+               to_timestamp(floor(extract(epoch FROM p.created_at) / {BUCKET_SECONDS}) * {BUCKET_SECONDS}),
+               COUNT(*)
+        FROM post_tickers pt
+        JOIN posts p ON p.id = pt.post_id AND p.deleted_at IS NULL
+        WHERE p.created_at >= NOW() - INTERVAL '{RETENTION_DAYS} days'
+        GROUP BY 1, 2
+        ON CONFLICT (ticker_id, bucket_start) DO NOTHING;
+    """)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    insp = inspect(conn)
+    if "ticker_mention_buckets" not in insp.get_table_names():
+        return
+    op.drop_index("ix_ticker_mention_buckets_bucket_start", table_name="ticker_mention_buckets")
+    op.drop_table("ticker_mention_buckets")
@@ -0,0 +1,50 @@
+"""denormalize post created/deleted time onto post_tickers for ticker timelines
+
+Revision ID: 0006_ticker_timeline
+Revises: 0005_mention_buckets
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision: str = "0006_ticker_timeline"
+down_revision: Union[str, None] = "0005_mention_buckets"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = "ix_post_tickers_ticker_timeline"
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    insp = inspect(conn)
+    columns = {c["name"] for c in insp.get_columns("post_tickers")}
+    if "post_created_at" not in columns:
+        op.add_column("post_tickers", sa.Column("post_created_at", sa.DateTime(timezone=True), nullable=True))
+        op.add_column("post_tickers", sa.Column("post_deleted_at", sa.DateTime(timezone=True), nullable=True))
+        op.execute("""
+            UPDATE post_tickers pt
+            SET post_created_at = p.created_at,
+                post_deleted_at = p.deleted_at
+            FROM posts p
+            WHERE p.id = pt.post_id;
+        """)
+        op.alter_column("post_tickers", "post_created_at", nullable=False)
+    indexes = {i["name"] for i in insp.get_indexes("post_tickers")}
+    if INDEX_NAME not in indexes:
+        op.create_index(
+            INDEX_NAME,
+            "post_tickers",
+            ["ticker_id", sa.text("post_created_at DESC"), "post_id"],
+            unique=False,
+            postgresql_where=sa.text("post_deleted_at IS NULL"),
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name="post_tickers")
+    op.drop_column("post_tickers", "post_deleted_at")
+    op.drop_column("post_tickers", "post_created_at")
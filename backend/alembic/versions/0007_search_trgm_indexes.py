@@ -0,0 +1,40 @@
+"""pg_trgm GIN and prefix indexes for user and ticker search
+
+Revision ID: 0007_search_trgm
+Revises: 0006_ticker_timeline
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = "0007_search_trgm"
+down_revision: Union[str, None] = "0006_ticker_timeline"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# name -> (table, index definition). Trigram GIN indexes serve ILIKE '%q%' and the
+# similarity operator (%); text_pattern_ops btrees serve prefix LIKE 'q%' for short queries.
+INDEXES = {
+    "ix_users_username_trgm": ("users", "USING gin (username gin_trgm_ops) WHERE deleted_at IS NULL"),
+    "ix_users_display_name_trgm": ("users", "USING gin (display_name gin_trgm_ops) WHERE deleted_at IS NULL"),
+    "ix_users_username_prefix": ("users", "(username text_pattern_ops) WHERE deleted_at IS NULL"),
+    "ix_users_display_name_prefix": ("users", "(lower(display_name) text_pattern_ops) WHERE deleted_at IS NULL"),
+    "ix_tickers_symbol_trgm": ("tickers", "USING gin (symbol gin_trgm_ops)"),
+    "ix_tickers_name_trgm": ("tickers", "USING gin (name gin_trgm_ops)"),
+    "ix_tickers_symbol_prefix": ("tickers", "(symbol text_pattern_ops)"),
+}
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CONCURRENTLY cannot run in a transaction; it avoids locking users against writes.
+    with op.get_context().autocommit_block():
+        for name, (table, definition) in INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,40 @@
+"""generated tsvector column and GIN index for full-text post search
+
+Revision ID: 0008_posts_content_tsv
+Revises: 0007_search_trgm
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+from sqlalchemy import inspect
+
+revision: str = "0008_posts_content_tsv"
+down_revision: Union[str, None] = "0007_search_trgm"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = "ix_posts_content_tsv"
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    columns = {c["name"] for c in inspect(conn).get_columns("posts")}
+    if "content_tsv" not in columns:
+        # Adding a STORED generated column rewrites posts once (ACCESS EXCLUSIVE lock).
+        op.execute("""
+            ALTER TABLE posts
+            ADD COLUMN content_tsv tsvector
+            GENERATED ALWAYS AS (to_tsvector('english', content)) STORED;
+        """)
+    with op.get_context().autocommit_block():
+        op.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} "
+            "ON posts USING gin (content_tsv) WHERE deleted_at IS NULL"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}")
+    op.drop_column("posts", "content_tsv")
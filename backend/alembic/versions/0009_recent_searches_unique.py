@@ -0,0 +1,38 @@
+"""unique (user_id, type, result_id) on recent_searches for single-statement upsert
+
+Revision ID: 0009_recent_searches_unique
+Revises: 0008_posts_content_tsv
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = "0009_recent_searches_unique"
+down_revision: Union[str, None] = "0008_posts_content_tsv"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = "uq_recent_searches_user_type_result"
+
+
+def upgrade() -> None:
+    # Keep only the newest row per (user_id, type, result_id) so the unique index can build.
+    op.execute("""
+        DELETE FROM recent_searches r
+        USING recent_searches newer
+        WHERE newer.user_id = r.user_id
+          AND newer.type = r.type
+          AND newer.result_id = r.result_id
+          AND (newer.created_at, newer.id) > (r.created_at, r.id);
+    """)
+    with op.get_context().autocommit_block():
+        op.execute(
+            f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} "
+            "ON recent_searches (user_id, type, result_id)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}")
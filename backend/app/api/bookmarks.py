@@ -4,7 +4,7 @@ Bookmark endpoints: add/remove bookmark, list user's bookmarks.
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.middleware.auth import get_current_user
 from app.schemas.bookmark import (
     BookmarkedPostAuthor,
@@ -48,7 +48,7 @@ def remove_bookmark_endpoint(
 
 @router.get("/bookmarks", response_model=dict)
 def list_bookmarks_endpoint(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: CurrentUser = Depends(get_current_user),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=50),
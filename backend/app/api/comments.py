@@ -5,7 +5,7 @@ from typing import Optional, Tuple
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.middleware.auth import get_current_user, get_optional_user
 from app.schemas.comment import CommentAuthor, CommentResponse, CreateCommentRequest
 from app.schemas.poll import PollInfo
@@ -93,7 +93,7 @@ def create_comment_endpoint(
 @router.get("/posts/{post_id}/comments", response_model=dict)
 def list_comments_endpoint(
     post_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Optional[CurrentUser] = Depends(get_optional_user),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=50),
@@ -4,7 +4,7 @@ Content filter endpoints: mute/unmute, block/unblock, list filters.
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.middleware.auth import get_current_user
 from app.schemas.content_filter import (
     BlockResponse,
@@ -91,7 +91,7 @@ def unblock_user_endpoint(
 
 @router.get("/content-filters", response_model=dict)
 def get_content_filters_endpoint(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: CurrentUser = Depends(get_current_user),
 ):
     """Get current user's muted and blocked users."""
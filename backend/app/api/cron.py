@@ -6,14 +6,15 @@ Call from Vercel Cron or external cron with CRON_SECRET.
 from fastapi import APIRouter, Header, HTTPException, Request, status
 from sqlalchemy import text
 from app.config import get_settings
-from app.database import db_health_check, db_session
+from app.database import async_db_health_check, async_db_session
 from app.services.session_service import close_stale_sessions
+from app.services.trending_service import prune_mention_buckets
 
 router = APIRouter(prefix="/cron", tags=["cron"])
 
 settings = get_settings()
 
-def _verify_cron_request(
+def verify_cron_request(
     authorization: str | None,
     x_cron_secret: str | None,
 ) -> bool:
@@ -39,35 +40,51 @@ async def cron_daily(
     x_cron_secret: str | None = Header(default=None, alias="X-Cron-Secret"),
 ):
     """
-    Daily cron: DB health check, refresh daily_metrics + engagement_metrics, stale session cleanup.
+    Daily cron: DB health check, refresh daily_metrics + engagement_metrics, stale session cleanup,
+    prune expired trending mention buckets.
     Call once per day (e.g. 05:00 UTC). Requires CRON_SECRET via Authorization or X-Cron-Secret header.
     """
-    if not _verify_cron_request(authorization, x_cron_secret):
+    if not verify_cron_request(authorization, x_cron_secret):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid or missing cron secret")
 
-    results = {"db_health": False, "stale_sessions": None, "daily_metrics": None, "engagement_metrics": None}
+    results = {
+        "db_health": False,
+        "stale_sessions": None,
+        "daily_metrics": None,
+        "engagement_metrics": None,
+        "mention_buckets_pruned": None,
+    }
 
-    results["db_health"] = db_health_check()
+    results["db_health"] = await async_db_health_check()
 
+    # Async engine: the long REFRESH statements await the socket instead of blocking the loop.
+    # A failed step rolls back so the next one starts on a clean transaction.
     try:
-        with db_session() as db:
+        async with async_db_session() as db:
             try:
-                closed = close_stale_sessions(db)
-                results["stale_sessions"] = closed
+                results["stale_sessions"] = await db.run_sync(close_stale_sessions)
             except Exception as e:
+                await db.rollback()
                 results["stale_sessions"] = str(e)
             try:
-                db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY daily_metrics"))
-                db.commit()
+                await db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY daily_metrics"))
+                await db.commit()
                 results["daily_metrics"] = "ok"
             except Exception as e:
+                await db.rollback()
                 results["daily_metrics"] = str(e)
             try:
-                db.execute(text("REFRESH MATERIALIZED VIEW engagement_metrics"))
-                db.commit()
+                await db.execute(text("REFRESH MATERIALIZED VIEW engagement_metrics"))
+                await db.commit()
                 results["engagement_metrics"] = "ok"
             except Exception as e:
+                await db.rollback()
                 results["engagement_metrics"] = str(e)
+            try:
+                results["mention_buckets_pruned"] = await db.run_sync(prune_mention_buckets)
+            except Exception as e:
+                await db.rollback()
+                results["mention_buckets_pruned"] = str(e)
     except Exception as e:
         results["error"] = str(e)
 
@@ -83,12 +100,12 @@ async def cron_stale_sessions(
     Stale session cleanup: mark sessions as ended where no activity for 30+ min.
     Call every 30-60 min. Requires CRON_SECRET via Authorization or X-Cron-Secret header.
     """
-    if not _verify_cron_request(authorization, x_cron_secret):
+    if not verify_cron_request(authorization, x_cron_secret):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid or missing cron secret")
 
     try:
-        with db_session() as db:
-            closed = close_stale_sessions(db)
+        async with async_db_session() as db:
+            closed = await db.run_sync(close_stale_sessions)
         return {"ok": True, "closed": closed}
     except Exception as e:
         return {"ok": False, "error": str(e)}
@@ -5,7 +5,7 @@ from datetime import date
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.middleware.auth import get_current_user, require_admin
 from app.schemas.error import (
     ErrorLogResponse,
@@ -71,7 +71,7 @@ def log_error_endpoint(
 
 @router.get("", response_model=dict)
 def list_errors_endpoint(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: CurrentUser = Depends(require_admin),
     severity: str | None = Query(None, description="Filter by severity"),
     error_type: str | None = Query(None, description="Filter by error_type"),
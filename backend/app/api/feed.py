@@ -1,10 +1,12 @@
 """
 Feed endpoint: GET /feed (all posts, exclude muted/blocked for current user).
+GET /feed?mode=watchlist: posts about the user's watchlist tickers, keyset paginated.
 """
+from typing import List, Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_read_db
 from app.middleware.auth import get_current_user
 from app.schemas.post import (
     PollInfo,
@@ -15,13 +17,15 @@ from app.schemas.post import (
     UserInteractions,
 )
 from app.services.auth_service import CurrentUser
-from app.services.feed_service import get_feed
+from app.services.feed_service import get_feed, get_watchlist_feed
+from app.utils.cursor import encode_cursor
+from app.utils.http import parse_cursor_or_422
 from app.utils.responses import paginated_response
-from app.api.posts import _build_original_post_response
+from app.api.posts import _build_original_post_responses
 from app.services.post_service import (
     _get_stats_for_posts,
     _get_user_interactions,
-    get_post_tickers,
+    get_tickers_for_posts,
 )
 from app.services.poll_service import get_polls_for_posts
 
@@ -42,7 +46,7 @@ def _poll_info_from_tuple(t):
         expires_at=expires_at,
     )
 
-def _post_response(db: Session, post, author, stats: tuple, interactions: tuple, tickers: list, poll_info=None) -> PostInFeedResponse:
+def _post_response(post, author, stats: tuple, interactions: tuple, tickers: list, poll_info=None, original_post=None) -> PostInFeedResponse:
     """Build PostInFeedResponse from post, author, stats, interactions, tickers, optional poll, optional original_post for quote reposts."""
     likes, comments, reposts = stats
     liked, reposted = interactions
@@ -67,21 +71,14 @@ def _post_response(db: Session, post, author, stats: tuple, interactions: tuple,
         poll=poll_obj,
         original_post_id=str(post.original_post_id) if getattr(post, "original_post_id", None) else None,
         repost_type=getattr(post, "repost_type", None) or None,
-        original_post=_build_original_post_response(db, getattr(post, "original_post_id", None)),
+        original_post=original_post,
     )
 
-@router.get("", response_model=dict)
-def get_feed_endpoint(
-    db: Session = Depends(get_db),
-    current_user: CurrentUser = Depends(get_current_user),
-    page: int = Query(1, ge=1),
-    per_page: int = Query(20, ge=1, le=50),
-):
-    """Get home feed: all posts, excluding posts from muted/blocked users. Auth required."""
-    current_id = UUID(current_user.auth_user_id)
-    rows, total = get_feed(db, current_id, page=page, per_page=per_page)
-    if not rows:
-        return paginated_response([], page, per_page, total, has_next=False)
+def _feed_data(db: Session, rows: list, current_id: UUID) -> List[PostInFeedResponse]:
+    """
+    Hydrate (Post, User) rows into feed items with stats, interactions, tickers, polls and
+    quoted originals: a fixed number of set-based queries whatever the page size.
+    """
     post_ids = [p.id for p, _ in rows]
     # For normal reposts, stats and "reposted"/"liked" refer to the *original* post
     # (Repost table stores original post_id; reactions are on the original).
@@ -92,18 +89,52 @@ def get_feed_endpoint(
     logical_ids = list({logical_id(p) for p, _ in rows})
     stats_map = _get_stats_for_posts(db, logical_ids)
     interactions_map = _get_user_interactions(db, current_id, logical_ids)
-    tickers_map = {p.id: get_post_tickers(db, p.id) for p, _ in rows}
+    tickers_map = get_tickers_for_posts(db, post_ids)
     poll_map = get_polls_for_posts(db, post_ids, current_id)
-    data = [
+    originals = _build_original_post_responses(db, [p.original_post_id for p, _ in rows])
+    return [
         _post_response(
-            db,
             p,
             u,
             stats_map.get(logical_id(p), (0, 0, 0)),
             interactions_map.get(logical_id(p), (False, False)),
             tickers_map.get(p.id, []),
             poll_map.get(p.id),
+            originals.get(p.original_post_id),
         )
         for p, u in rows
     ]
-    return paginated_response(data, page, per_page, total)
+
+@router.get("", response_model=dict)
+def get_feed_endpoint(
+    db: Session = Depends(get_read_db),
+    current_user: CurrentUser = Depends(get_current_user),
+    page: int = Query(1, ge=1),
+    per_page: int = Query(20, ge=1, le=50),
+    mode: str = Query("all", pattern="^(all|watchlist)$"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor (watchlist mode only)"),
+):
+    """
+    Get home feed: all posts, excluding posts from muted/blocked users. Auth required.
+    mode=watchlist: posts mentioning any ticker on the user's watchlist, paged by
+    pagination.cursor (page is ignored, total is null).
+    """
+    current_id = UUID(current_user.auth_user_id)
+    if mode == "watchlist":
+        after = parse_cursor_or_422(cursor)
+        rows, next_key = get_watchlist_feed(db, current_id, per_page=per_page, cursor=after)
+        next_cursor = encode_cursor(*next_key) if next_key else None
+        data = _feed_data(db, rows, current_id) if rows else []
+        return paginated_response(
+            data,
+            1,
+            per_page,
+            None,
+            has_next=next_cursor is not None,
+            has_prev=after is not None,
+            cursor=next_cursor,
+        )
+    rows, total = get_feed(db, current_id, page=page, per_page=per_page)
+    if not rows:
+        return paginated_response([], page, per_page, total, has_next=False)
+    return paginated_response(_feed_data(db, rows, current_id), page, per_page, total)
@@ -5,7 +5,7 @@ from typing import Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.middleware.auth import get_current_user, get_optional_user
 from app.schemas.follow import FollowToggleResponse, FollowerFollowingItem
 from app.services.auth_service import CurrentUser
@@ -58,7 +58,7 @@ def unfollow_user_endpoint(
 @router.get("/users/{user_id}/followers", response_model=dict)
 def list_followers_endpoint(
     user_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Optional[CurrentUser] = Depends(get_optional_user),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=50),
@@ -87,7 +87,7 @@ def list_followers_endpoint(
 @router.get("/users/{user_id}/following", response_model=dict)
 def list_following_endpoint(
     user_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Optional[CurrentUser] = Depends(get_optional_user),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=50),
@@ -1,14 +1,16 @@
 """
-Metrics endpoints: GET /metrics/dashboard, /users, /engagement, /growth, /health, /trending, /export.
-Admin only (user.badge == 'admin').
+Metrics endpoints: GET /metrics/dashboard, /users, /engagement, /growth, /health, /caches, /trending, /export.
+Admin only (user.badge == 'admin'). GET /metrics/prometheus also accepts CRON_SECRET (scrapers).
 """
 from datetime import date
 from typing import Any, Dict, List, Optional
-from fastapi import APIRouter, Depends, Query
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, Header, Query, Request
+from fastapi.responses import PlainTextResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.middleware.auth import require_admin
+from app.api.cron import verify_cron_request
+from app.database import get_async_db, get_read_db
+from app.middleware.auth import get_current_user, require_admin
 from app.schemas.metrics import (
     EngagementMetrics,
     GrowthMetrics,
@@ -24,10 +26,13 @@ from app.services.metrics_service import (
     get_user_metrics,
     get_engagement_metrics_full,
     get_growth_metrics,
+    get_cache_metrics,
     get_health_metrics,
     get_trending_metrics,
     export_metrics,
 )
+from app.services.prometheus_export import CONTENT_TYPE as PROMETHEUS_CONTENT_TYPE, render_prometheus
+from app.services.telemetry import aggregate_snapshot
 
 router = APIRouter(prefix="/metrics", tags=["metrics"])
 
@@ -65,6 +70,7 @@ def _health_response(data: Dict[str, Any]) -> HealthMetrics:
         database=data.get("database", {}),
         storage=data.get("storage", {}),
         errors=data.get("errors", {}),
+        caches=data.get("caches", {}),
     )
 
 def _trending_response(data: Dict[str, Any]) -> TrendingMetrics:
@@ -93,11 +99,10 @@ def _trending_response(data: Dict[str, Any]) -> TrendingMetrics:
 
 @router.get("/dashboard", response_model=dict)
 def get_dashboard(
-    db: Session = Depends(get_db),
     current_user: CurrentUser = Depends(require_admin),
 ):
     """Get combined dashboard metrics (user, engagement, growth, health, trending). Auth required."""
-    raw = get_dashboard_metrics(db)
+    raw = get_dashboard_metrics()
     user_metrics = _user_metrics_response(raw.get("user_metrics", {}))
     engagement_metrics = _engagement_response(raw.get("engagement_metrics", {}))
     growth_metrics = GrowthMetrics(**raw.get("growth_metrics", {}))
@@ -117,7 +122,7 @@ def get_dashboard(
 
 @router.get("/users", response_model=dict)
 def get_users_metrics(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: CurrentUser = Depends(require_admin),
 ):
     """Get user metrics (DAU, MAU, signups, active users). Admin only."""
@@ -126,7 +131,7 @@ def get_users_metrics(
 
 @router.get("/engagement", response_model=dict)
 def get_engagement(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: CurrentUser = Depends(require_admin),
 ):
     """Get engagement metrics (posts, comments, reactions, averages). Admin only."""
@@ -135,7 +140,7 @@ def get_engagement(
 
 @router.get("/growth", response_model=dict)
 def get_growth(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: CurrentUser = Depends(require_admin),
 ):
     """Get growth metrics (week-over-week, month-over-month). Admin only."""
@@ -144,16 +149,41 @@ def get_growth(
 
 @router.get("/health", response_model=dict)
 def get_health(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: CurrentUser = Depends(require_admin),
 ):
     """Get platform health (errors, optional API/DB/storage). Admin only."""
     data = get_health_metrics(db)
     return {"data": _health_response(data).model_dump()}
 
+@router.get("/caches", response_model=dict)
+def get_caches(
+    current_user: CurrentUser = Depends(require_admin),
+):
+    """Get in-process cache hit rates (search results, auth, tickers, suggest) for this worker. Admin only."""
+    return {"data": get_cache_metrics()}
+
+async def _require_scraper_or_admin(
+    request: Request,
+    x_cron_secret: Optional[str] = Header(default=None, alias="X-Cron-Secret"),
+    db: AsyncSession = Depends(get_async_db),
+) -> None:
+    """Scrapers send CRON_SECRET (Authorization: Bearer or X-Cron-Secret); people an admin JWT."""
+    if verify_cron_request(request.headers.get("authorization"), x_cron_secret):
+        return
+    await require_admin(await get_current_user(request), db)
+
+@router.get("/prometheus", response_class=PlainTextResponse)
+def get_prometheus_metrics(_: None = Depends(_require_scraper_or_admin)):
+    """
+    Runtime metrics in Prometheus text format: request latency by route, DB query latency,
+    pool usage, cache hit ratios, outbound HTTP latency. Covers all workers sharing METRICS_DIR.
+    """
+    return Response(content=render_prometheus(aggregate_snapshot()), media_type=PROMETHEUS_CONTENT_TYPE)
+
 @router.get("/trending", response_model=dict)
 def get_trending(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: CurrentUser = Depends(require_admin),
     limit: int = Query(10, ge=1, le=50),
 ):
@@ -163,7 +193,7 @@ def get_trending(
 
 @router.get("/export")
 def export_metrics_endpoint(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: CurrentUser = Depends(require_admin),
     format: str = Query("json", description="json or csv"),
     metric_type: str = Query("all", description="users, engagement, growth, health, all"),
@@ -4,7 +4,7 @@ Poll endpoints: vote, get results.
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.middleware.auth import get_current_user, get_optional_user
 from app.schemas.poll import PollResultsResponse, VoteRequest, VoteResponse
 from app.services.auth_service import CurrentUser
@@ -53,7 +53,7 @@ def vote_poll_endpoint(
 @router.get("/{poll_id}/results", response_model=dict)
 def get_poll_results_endpoint(
     poll_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Optional[CurrentUser] = Depends(get_optional_user),
 ):
     """Get poll results. Optional auth for user_vote."""
@@ -1,11 +1,11 @@
 """
 Post endpoints: create, list, get by id, delete.
 """
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.middleware.auth import get_current_user, get_optional_user
 from app.schemas.post import (
     CreatePostRequest,
@@ -26,14 +26,18 @@ from app.services.post_service import (
     get_post_by_id,
     get_post_stats,
     get_post_tickers,
+    get_tickers_for_posts,
     list_posts,
     list_posts_for_user_profile,
+    list_ticker_posts,
     _get_stats_for_posts,
     _get_user_interactions,
 )
 from app.services.poll_service import get_poll_info_for_post, get_polls_for_posts
+from app.models.post import Post
 from app.models.user import User
-from app.utils.http import parse_uuid_or_404
+from app.utils.cursor import encode_cursor
+from app.utils.http import parse_cursor_or_422, parse_uuid_or_404
 from app.utils.responses import paginated_response
 
 router = APIRouter(prefix="/posts", tags=["posts"])
@@ -63,6 +67,35 @@ def _build_original_post_response(db: Session, original_post_id) -> Optional[Ori
         created_at=orig.created_at,
     )
 
+def _build_original_post_responses(db: Session, original_post_ids: list) -> Dict[UUID, OriginalPostInResponse]:
+    """Batch _build_original_post_response: one query for all originals of a page of quote posts."""
+    ids = {pid for pid in original_post_ids if pid}
+    if not ids:
+        return {}
+    rows = (
+        db.query(Post, User)
+        .join(User, Post.user_id == User.id)
+        .filter(Post.id.in_(ids), Post.deleted_at.is_(None))
+        .all()
+    )
+    return {
+        orig.id: OriginalPostInResponse(
+            id=str(orig.id),
+            author=PostAuthor(
+                id=str(author.id),
+                username=author.username,
+                display_name=author.display_name,
+                profile_picture_url=author.profile_picture_url,
+                badge=author.badge,
+            ),
+            content=orig.content or "",
+            media_urls=orig.media_urls,
+            gif_url=orig.gif_url,
+            created_at=orig.created_at,
+        )
+        for orig, author in rows
+    }
+
 def _poll_info_from_tuple(t: tuple):
     """Build PollInfo from (poll_id, options, results, total, user_vote, is_finished, expires_at)."""
     if not t:
@@ -172,18 +205,32 @@ def create_post_endpoint(
 
 @router.get("", response_model=dict)
 def list_posts_endpoint(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Optional[CurrentUser] = Depends(get_optional_user),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=50),
     user_id: Optional[str] = Query(None),
     ticker: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="Keyset cursor (ticker timelines only)"),
 ):
-    """List posts (paginated). Optional filter by user_id or ticker symbol. When user_id is set, includes normal reposts."""
+    """
+    List posts (paginated). Optional filter by user_id or ticker symbol. When user_id is set, includes normal reposts.
+    Ticker timelines (ticker without user_id) also return pagination.cursor; pass it back as cursor
+    for keyset paging (no total).
+    """
     user_id_uuid = UUID(user_id) if user_id else None
     current_id = UUID(current_user.auth_user_id) if current_user else None
+    after = parse_cursor_or_422(cursor)
+    next_cursor: Optional[str] = None
+    # Keyset paging covers the ticker timeline alone; ticker + user_id stays offset-paged.
+    keyset = bool(ticker) and user_id_uuid is None
 
-    if user_id_uuid is not None and ticker is None:
+    if keyset and after is not None:
+        rows, next_key = list_ticker_posts(db, ticker, per_page=per_page, cursor=after)
+        total = None
+        next_cursor = encode_cursor(*next_key) if next_key else None
+        triple = False
+    elif user_id_uuid is not None and ticker is None:
         rows, total = list_posts_for_user_profile(
             db,
             user_id=user_id_uuid,
@@ -203,15 +250,20 @@ def list_posts_endpoint(
             current_user_id=current_id,
         )
         triple = False
+        if keyset and rows and page * per_page < total:
+            last = rows[-1][0]
+            next_cursor = encode_cursor(last.created_at, last.id)
 
+    has_next = next_cursor is not None if total is None else None
     if not rows:
-        return paginated_response([], page, per_page, total)
+        return paginated_response([], page, per_page, total, has_next=has_next)
 
     post_ids = [p.id for p, *_ in rows]
     stats_map = _get_stats_for_posts(db, post_ids)
     interactions_map = _get_user_interactions(db, current_id, post_ids)
-    tickers_map = {p.id: get_post_tickers(db, p.id) for p, *_ in rows}
+    tickers_map = get_tickers_for_posts(db, post_ids)
     poll_map = get_polls_for_posts(db, post_ids, current_id)
+    originals = _build_original_post_responses(db, [p.original_post_id for p, *_ in rows])
 
     if triple:
         # Same as feed: use post.content (no content_override). Quote posts have content on the Post row. Include original_post for quote reposts.
@@ -226,7 +278,7 @@ def list_posts_endpoint(
                 poll_info=poll_map.get(p.id),
                 reposted_by_profile_user=is_repost,
                 content_override=None,
-                original_post=_build_original_post_response(db, getattr(p, "original_post_id", None)),
+                original_post=originals.get(p.original_post_id),
             )
             for p, u, is_repost in rows
         ]
@@ -240,16 +292,16 @@ def list_posts_endpoint(
                 include_author=True,
                 author=u,
                 poll_info=poll_map.get(p.id),
-                original_post=_build_original_post_response(db, getattr(p, "original_post_id", None)),
+                original_post=originals.get(p.original_post_id),
             )
             for p, u in rows
         ]
-    return paginated_response(data, page, per_page, total)
+    return paginated_response(data, page, per_page, total, has_next=has_next, cursor=next_cursor)
 
 @router.get("/{post_id}", response_model=PostInFeedResponse)
 def get_post_endpoint(
     post_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Optional[CurrentUser] = Depends(get_optional_user),
 ):
     """Get a single post by id. Public (no auth required); returns post with author for shared links."""
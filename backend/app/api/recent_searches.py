@@ -4,7 +4,7 @@ Recent searches: GET/POST/DELETE under /users/me/recent-searches. Auth required.
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.middleware.auth import get_current_user
 from app.schemas.recent_search import RecentSearchCreate, RecentSearchItem
 from app.services.auth_service import CurrentUser
@@ -19,7 +19,7 @@ router = APIRouter(prefix="/users/me", tags=["recent-searches"])
 
 @router.get("/recent-searches", response_model=dict)
 def list_recent_searches_endpoint(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: CurrentUser = Depends(get_current_user),
     limit: int = Query(20, ge=1, le=50),
 ):
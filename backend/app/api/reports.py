@@ -4,7 +4,7 @@ Report endpoints: create report and list current user's reports.
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.middleware.auth import get_current_user
 from app.models.comment import Comment
 from app.models.post import Post
@@ -63,7 +63,7 @@ def create_report_endpoint(
 
 @router.get("", response_model=dict)
 def list_my_reports_endpoint(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: CurrentUser = Depends(get_current_user),
 ):
     """
@@ -1,55 +1,150 @@
 """
-Search endpoint: GET /search (users and tickers only).
+Search endpoints: GET /search (users and tickers; posts with type=posts), GET /search/suggest (typeahead).
 """
+from typing import List, Optional
+from uuid import UUID
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_read_db
+from app.middleware.auth import get_optional_user
+from app.api.posts import _build_original_post_responses, _post_response
+from app.schemas.post import PostInFeedResponse
 from app.schemas.search import SearchResponseData, SearchTickerItem, SearchUserItem
-from app.services.search_service import search_tickers, search_users
+from app.services.auth_service import CurrentUser
+from app.services.feed_service import _muted_and_blocked_user_ids
+from app.services.poll_service import get_polls_for_posts
+from app.services.post_service import _get_stats_for_posts, _get_user_interactions, get_tickers_for_posts
+from app.services.search_service import federated_search, search_cache, search_cache_key, search_posts
+from app.services.suggest_service import suggest
+from app.utils.cursor import encode_score_cursor
+from app.utils.http import parse_score_cursor_or_422
 from app.utils.responses import paginated_response
 
 router = APIRouter(prefix="/search", tags=["search"])
 
+def _post_items(db: Session, rows: list, current_id: Optional[UUID]) -> List[PostInFeedResponse]:
+    """Hydrate (Post, User) rows with a fixed number of set-based queries (no per-row lookups)."""
+    post_ids = [p.id for p, _ in rows]
+    stats_map = _get_stats_for_posts(db, post_ids)
+    interactions_map = _get_user_interactions(db, current_id, post_ids)
+    tickers_map = get_tickers_for_posts(db, post_ids)
+    poll_map = get_polls_for_posts(db, post_ids, current_id)
+    originals = _build_original_post_responses(db, [p.original_post_id for p, _ in rows])
+    return [
+        _post_response(
+            p,
+            stats_map.get(p.id, (0, 0, 0)),
+            interactions_map.get(p.id, (False, False)),
+            tickers_map.get(p.id, []),
+            include_author=True,
+            author=u,
+            poll_info=poll_map.get(p.id),
+            original_post=originals.get(p.original_post_id),
+        )
+        for p, u in rows
+    ]
+
+def _federated_body(results: dict, page: int, per_page: int) -> dict:
+    """
+    Paginated body for users/tickers results. pagination.types has each type's own
+    total/has_next/next_page; the top-level total is the largest per-type total, so
+    has_next is true while any type has another page.
+    """
+    users, total_users = results.get("users", ([], 0))
+    tickers, total_tickers = results.get("tickers", ([], 0))
+    data = SearchResponseData(
+        users=[
+            SearchUserItem(
+                id=str(u.id),
+                username=u.username,
+                display_name=u.display_name,
+                profile_picture_url=u.profile_picture_url,
+            )
+            for u in users
+        ],
+        tickers=[SearchTickerItem(symbol=s, name=n) for s, n, _ in tickers],
+    )
+    body = paginated_response(data, page, per_page, max(total_users, total_tickers))
+    types = {}
+    for name, (_, total) in results.items():
+        has_next = page * per_page < total
+        types[name] = {"total": total, "has_next": has_next, "next_page": page + 1 if has_next else None}
+    body["pagination"]["types"] = types
+    return body
+
+def _search_posts_response(
+    db: Session,
+    q: str,
+    per_page: int,
+    cursor: Optional[str],
+    current_user: Optional[CurrentUser],
+) -> dict:
+    """type=posts: ranked full-text results, keyset paginated (total is null)."""
+    after = parse_score_cursor_or_422(cursor)
+    current_id = UUID(current_user.auth_user_id) if current_user else None
+    exclude = _muted_and_blocked_user_ids(db, current_id) if current_id else None
+    rows, next_key = search_posts(db, q, per_page=per_page, cursor=after, exclude_user_ids=exclude or None)
+    next_cursor = encode_score_cursor(*next_key) if next_key else None
+    return paginated_response(
+        SearchResponseData(posts=_post_items(db, rows, current_id) if rows else []),
+        1,
+        per_page,
+        None,
+        has_next=next_cursor is not None,
+        has_prev=after is not None,
+        cursor=next_cursor,
+    )
+
 @router.get("", response_model=dict)
 def search_endpoint(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    current_user: Optional[CurrentUser] = Depends(get_optional_user),
     q: str = Query(..., min_length=1),
-    type: str = Query("all", description="users, tickers, or all"),
+    type: str = Query("all", description="users, tickers, posts, or all (users + tickers)"),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=50),
+    cursor: Optional[str] = Query(None, description="Keyset cursor (type=posts only)"),
 ):
-    """Unified search: users and tickers only. type=users|tickers|all."""
+    """
+    Unified search. type=users|tickers|all (users and tickers, page-based) or
+    type=posts (full-text, ranked, cursor-based; muted/blocked authors hidden when signed in).
+    """
     type_lower = type.strip().lower() if type else "all"
+    if type_lower == "posts":
+        return _search_posts_response(db, q, per_page, cursor, current_user)
     if type_lower not in ("users", "tickers", "all"):
         type_lower = "all"
 
-    users: list = []
-    tickers: list = []
-    total_users = 0
-    total_tickers = 0
+    types = ("users", "tickers") if type_lower == "all" else (type_lower,)
 
-    if type_lower in ("users", "all"):
-        users_list, total_users = search_users(db, q, page=page, per_page=per_page)
-        users = [
-            SearchUserItem(
-                id=str(u.id),
-                username=u.username,
-                display_name=u.display_name,
-                profile_picture_url=u.profile_picture_url,
-            )
-            for u in users_list
-        ]
-    if type_lower in ("tickers", "all"):
-        tickers_list, total_tickers = search_tickers(db, q, page=page, per_page=per_page)
-        tickers = [
-            SearchTickerItem(symbol=s, name=n)
-            for s, n, _ in tickers_list
-        ]
-
-    total = total_users + total_tickers
-    return paginated_response(
-        SearchResponseData(users=users, tickers=tickers),
-        page,
-        per_page,
-        total,
-    )
+    def compute() -> dict:
+        results = federated_search(db, q, types, page=page, per_page={t: per_page for t in types})
+        return _federated_body(results, page, per_page)
+
+    return search_cache.get_or_compute(search_cache_key(q, type_lower, page, per_page), compute)
+
+@router.get("/suggest", response_model=dict)
+def suggest_endpoint(
+    db: Session = Depends(get_read_db),
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(8, ge=1, le=20),
+):
+    """
+    Typeahead: users and tickers whose username/display name or symbol/name starts with q,
+    ranked by follower count / mention count. Served from in-process indexes (no DB query).
+    """
+    users, tickers = suggest(db, q, limit=limit)
+    return {
+        "data": SearchResponseData(
+            users=[
+                SearchUserItem(
+                    id=s.id,
+                    username=s.label,
+                    display_name=s.detail or "",
+                    profile_picture_url=s.image,
+                )
+                for s in users
+            ],
+            tickers=[SearchTickerItem(symbol=s.label, name=s.detail) for s in tickers],
+        )
+    }
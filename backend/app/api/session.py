@@ -5,8 +5,8 @@ Stale sessions are closed by cron.
 import hashlib
 from uuid import UUID
 from fastapi import APIRouter, Depends, Request, status
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.middleware.auth import get_current_user
 from app.services.auth_service import CurrentUser
 from app.services.geolocation_service import extract_client_ip
@@ -17,7 +17,7 @@ router = APIRouter(prefix="/session", tags=["session"])
 @router.post("/start", status_code=status.HTTP_204_NO_CONTENT)
 async def session_start(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(get_current_user),
 ):
     """
@@ -30,8 +30,8 @@ async def session_start(
     ip_hash = hashlib.sha256(ip.encode("utf-8")).hexdigest() if ip else None
     user_agent = request.headers.get("user-agent")
 
-    create_session(
-        db,
+    await db.run_sync(
+        create_session,
         UUID(current_user.auth_user_id),
         user_agent=user_agent,
         ip_address_hash=ip_hash,
@@ -39,10 +39,10 @@ async def session_start(
 
 @router.post("/end", status_code=status.HTTP_204_NO_CONTENT)
 async def session_end(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(get_current_user),
 ):
     """
     End the current session. Call before logout.
     """
-    end_session(db, UUID(current_user.auth_user_id))
+    await db.run_sync(end_session, UUID(current_user.auth_user_id))
@@ -1,8 +1,8 @@
 """
-Ticker endpoints: GET /tickers/trending (from materialized view).
+Ticker endpoints: GET /tickers/trending (sliding windows over mention buckets).
 """
 from fastapi import APIRouter, Query
-from app.database import get_db
+from app.database import get_read_db
 from app.services.ticker_service import get_trending_tickers
 from fastapi import Depends
 from sqlalchemy.orm import Session
@@ -11,9 +11,10 @@ router = APIRouter(prefix="/tickers", tags=["tickers"])
 
 @router.get("/trending", response_model=dict)
 def get_trending(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     limit: int = Query(10, ge=1, le=50),
+    window: str = Query("24h", pattern="^(1h|24h|7d)$", description="1h, 24h or 7d"),
 ):
-    """Get trending tickers from materialized view (mentions_24h, mention_count)."""
-    rows = get_trending_tickers(db, limit=limit)
+    """Get trending tickers for a sliding window (mentions in window, growth vs previous window)."""
+    rows = get_trending_tickers(db, limit=limit, window=window)
     return {"data": rows}
@@ -2,8 +2,10 @@ import logging
 from uuid import UUID
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_async_db, get_async_read_db, get_db, get_read_db
 from app.middleware.auth import get_current_user, get_optional_user
 from app.schemas.user import (
     OnboardingRequest,
@@ -22,12 +24,12 @@ from app.services.geolocation_service import extract_client_ip, lookup_ip
 from app.services.storage_service import delete_profile_picture, upload_profile_picture
 from app.services.follow_service import is_following as follow_service_is_following
 from app.schemas.poll import PollInfo
-from app.api.posts import _build_original_post_response
+from app.api.posts import _build_original_post_responses
 from app.services.poll_service import get_polls_for_comments, get_polls_for_posts
 from app.services.post_service import (
     _get_stats_for_posts,
     _get_user_interactions,
-    get_post_tickers,
+    get_tickers_for_posts,
 )
 from app.services.reaction_service import list_posts_liked_by_user
 from app.services.user_service import (
@@ -40,6 +42,7 @@ from app.services.user_service import (
     get_user_interests,
     get_user_stats,
 )
+from app.services.suggest_service import index_user
 from app.services.supabase_admin import delete_auth_user
 from app.utils.media_validator import validate_image_file
 from app.api.deps import get_user_or_404
@@ -66,7 +69,7 @@ def _poll_info_from_tuple(t):
 @router.get("/{user_id}/replies", response_model=dict)
 def list_user_replies(
     user_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Optional[CurrentUser] = Depends(get_optional_user),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=50),
@@ -84,6 +87,7 @@ def list_user_replies(
     user_liked = get_user_liked_comments(db, current_id, comment_ids) if current_id else set()
     poll_map = get_polls_for_comments(db, comment_ids, current_id)
     post_poll_map = get_polls_for_posts(db, post_ids, current_id)
+    originals = _build_original_post_responses(db, [post.original_post_id for _, _, post, _ in rows])
     data = []
     for c, c_author, post, p_author in rows:
         post_poll = _poll_info_from_tuple(post_poll_map.get(post.id))
@@ -123,7 +127,7 @@ def list_user_replies(
                 "poll": post_poll,
                 "original_post_id": str(post.original_post_id) if getattr(post, "original_post_id", None) else None,
                 "repost_type": getattr(post, "repost_type", None),
-                "original_post": _build_original_post_response(db, getattr(post, "original_post_id", None)),
+                "original_post": originals.get(post.original_post_id),
             },
         })
     return paginated_response(data, page, per_page, total)
@@ -131,7 +135,7 @@ def list_user_replies(
 @router.get("/{user_id}/likes", response_model=dict)
 def list_user_likes(
     user_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Optional[CurrentUser] = Depends(get_optional_user),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=50),
@@ -147,28 +151,25 @@ def list_user_likes(
     post_ids = [p.id for p, _ in rows]
     stats_map = _get_stats_for_posts(db, post_ids)
     interactions_map = _get_user_interactions(db, current_id, post_ids)
-    tickers_map = {p.id: get_post_tickers(db, p.id) for p, _ in rows}
+    tickers_map = get_tickers_for_posts(db, post_ids)
     poll_map = get_polls_for_posts(db, post_ids, current_id)
+    originals = _build_original_post_responses(db, [p.original_post_id for p, _ in rows])
     data = [
         build_post_response(
-            db,
             p,
             u,
             stats_map.get(p.id, (0, 0, 0)),
             interactions_map.get(p.id, (False, False)),
             tickers_map.get(p.id, []),
             poll_map.get(p.id),
+            originals.get(p.original_post_id),
         )
         for p, u in rows
     ]
     return paginated_response(data, page, per_page, total)
 
-@router.get("/me", response_model=UserResponse)
-async def get_me(
-    db: Session = Depends(get_db),
-    current_user: CurrentUser = Depends(get_current_user),
-):
-    user = get_or_create_user_for_auth(db, current_user)
+def _user_response(db: Session, user) -> UserResponse:
+    """UserResponse for the signed-in user, with stats and interests."""
     user_id = str(user.id)
     follower_count, following_count, post_count = get_user_stats(db, user_id)
     interests = get_user_interests(db, user_id)
@@ -192,16 +193,8 @@ async def get_me(
         interests=interests,
     )
 
-@router.get("/by-username/{username}", response_model=PublicUserResponse)
-async def get_user_by_username_endpoint(
-    username: str,
-    db: Session = Depends(get_db),
-    current_user: Optional[CurrentUser] = Depends(get_optional_user),
-):
-    """Get public profile by username. No auth required; is_following present only when authenticated."""
-    user = get_user_by_username(db, username)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+def _public_user_response(db: Session, user, current_user: Optional[CurrentUser]) -> PublicUserResponse:
+    """PublicUserResponse; is_following only when there is a current user."""
     user_id = str(user.id)
     follower_count, following_count, post_count = get_user_stats(db, user_id)
     is_fol = (
@@ -225,175 +218,140 @@ async def get_user_by_username_endpoint(
         created_at=user.created_at,
     )
 
+# The async routes below use the async engine: service code runs through
+# AsyncSession.run_sync, so their queries never block the event loop.
+
+@router.get("/me", response_model=UserResponse)
+async def get_me(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    def load(sync_db: Session) -> UserResponse:
+        return _user_response(sync_db, get_or_create_user_for_auth(sync_db, current_user))
+
+    return await db.run_sync(load)
+
+@router.get("/by-username/{username}", response_model=PublicUserResponse)
+async def get_user_by_username_endpoint(
+    username: str,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Optional[CurrentUser] = Depends(get_optional_user),
+):
+    """Get public profile by username. No auth required; is_following present only when authenticated."""
+    def load(sync_db: Session) -> PublicUserResponse:
+        user = get_user_by_username(sync_db, username)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        return _public_user_response(sync_db, user, current_user)
+
+    return await db.run_sync(load)
+
 @router.get("/{user_id}", response_model=PublicUserResponse)
 async def get_user_profile(
     user_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: CurrentUser = Depends(get_current_user),
 ):
     parse_uuid_or_404(user_id, "User not found")
-    user = get_user_or_404(db, user_id)
 
-    follower_count, following_count, post_count = get_user_stats(db, user_id)
-    is_fol = follow_service_is_following(db, UUID(current_user.auth_user_id), user.id)
-    interests = get_user_interests(db, user_id)
+    def load(sync_db: Session) -> PublicUserResponse:
+        return _public_user_response(sync_db, get_user_or_404(sync_db, user_id), current_user)
 
-    return PublicUserResponse(
-        id=str(user.id),
-        username=user.username,
-        display_name=user.display_name,
-        bio=user.bio,
-        profile_picture_url=user.profile_picture_url,
-        badge=user.badge,
-        follower_count=follower_count,
-        following_count=following_count,
-        post_count=post_count,
-        is_following=is_fol,
-        interests=interests,
-        created_at=user.created_at,
-    )
+    return await db.run_sync(load)
 
 @router.patch("/me", response_model=UserResponse)
 async def update_me(
     payload: UpdateUserRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(get_current_user),
 ):
-    user = get_or_create_user_for_auth(db, current_user)
-    user = apply_user_update(db, user, payload)
-    user_id = str(user.id)
-    follower_count, following_count, post_count = get_user_stats(db, user_id)
-    interests = get_user_interests(db, user_id)
+    def update(sync_db: Session) -> UserResponse:
+        user = get_or_create_user_for_auth(sync_db, current_user)
+        return _user_response(sync_db, apply_user_update(sync_db, user, payload))
 
-    return UserResponse(
-        id=user_id,
-        username=user.username,
-        display_name=user.display_name,
-        bio=user.bio,
-        profile_picture_url=user.profile_picture_url,
-        badge=user.badge,
-        timezone=user.timezone,
-        country=user.country,
-        country_code=user.country_code,
-        created_at=user.created_at,
-        updated_at=user.updated_at,
-        stats=UserStats(
-            follower_count=follower_count,
-            following_count=following_count,
-            post_count=post_count,
-        ),
-        interests=interests,
-    )
+    return await db.run_sync(update)
 
 @router.post("/me/onboarding", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def onboarding(
     payload: OnboardingRequest,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(get_current_user),
 ):
     ip = extract_client_ip(request)
     geo = await lookup_ip(ip) if ip else None
-    user = apply_onboarding(
-        db=db,
-        current=current_user,
-        payload=payload,
-        country=geo.country if geo else None,
-        country_code=geo.country_code if geo else None,
-        ip_hash=geo.ip_hash if geo else None,
-    )
-    user_id = str(user.id)
-    follower_count, following_count, post_count = get_user_stats(db, user_id)
-    interests = get_user_interests(db, user_id)
 
-    return UserResponse(
-        id=user_id,
-        username=user.username,
-        display_name=user.display_name,
-        bio=user.bio,
-        profile_picture_url=user.profile_picture_url,
-        badge=user.badge,
-        timezone=user.timezone,
-        country=user.country,
-        country_code=user.country_code,
-        created_at=user.created_at,
-        updated_at=user.updated_at,
-        stats=UserStats(
-            follower_count=follower_count,
-            following_count=following_count,
-            post_count=post_count,
-        ),
-        interests=interests,
-    )
+    def onboard(sync_db: Session) -> UserResponse:
+        user = apply_onboarding(
+            db=sync_db,
+            current=current_user,
+            payload=payload,
+            country=geo.country if geo else None,
+            country_code=geo.country_code if geo else None,
+            ip_hash=geo.ip_hash if geo else None,
+        )
+        return _user_response(sync_db, user)
+
+    return await db.run_sync(onboard)
 
 @router.post("/me/profile-picture")
 async def upload_profile_picture_endpoint(
     file: UploadFile,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(get_current_user),
 ):
-    user = get_or_create_user_for_auth(db, current_user)
+    user = await db.run_sync(get_or_create_user_for_auth, current_user)
     file_bytes = await validate_image_file(file)
 
+    # Storage calls are blocking HTTP: keep them off the event loop.
     # delete old picture if exists
     if user.profile_picture_url:
-        delete_profile_picture(url=user.profile_picture_url)
+        await run_in_threadpool(delete_profile_picture, url=user.profile_picture_url)
 
-    url = upload_profile_picture(
+    url = await run_in_threadpool(
+        upload_profile_picture,
         user_id=str(user.id),
         file_bytes=file_bytes,
         filename=file.filename or "profile.jpg",
         content_type=file.content_type or "image/jpeg",
     )
-    user.profile_picture_url = url
-    db.add(user)
-    db.commit()
-    db.refresh(user)
 
-    user_id = str(user.id)
-    follower_count, following_count, post_count = get_user_stats(db, user_id)
-    interests = get_user_interests(db, user_id)
+    def save(sync_db: Session) -> UserResponse:
+        user.profile_picture_url = url
+        sync_db.add(user)
+        sync_db.commit()
+        sync_db.refresh(user)
+        index_user(user)
+        return _user_response(sync_db, user)
 
-    return {
-        "data": UserResponse(
-            id=user_id,
-            username=user.username,
-            display_name=user.display_name,
-            bio=user.bio,
-            profile_picture_url=user.profile_picture_url,
-            badge=user.badge,
-            timezone=user.timezone,
-            country=user.country,
-            country_code=user.country_code,
-            created_at=user.created_at,
-            updated_at=user.updated_at,
-            stats=UserStats(
-                follower_count=follower_count,
-                following_count=following_count,
-                post_count=post_count,
-            ),
-            interests=interests,
-        )
-    }
+    return {"data": await db.run_sync(save)}
 
 @router.delete("/me/profile-picture", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_profile_picture_endpoint(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(get_current_user),
 ):
-    user = get_or_create_user_for_auth(db, current_user)
+    user = await db.run_sync(get_or_create_user_for_auth, current_user)
     if user.profile_picture_url:
-        delete_profile_picture(url=user.profile_picture_url)
-        user.profile_picture_url = None
-        db.add(user)
-        db.commit()
+        await run_in_threadpool(delete_profile_picture, url=user.profile_picture_url)
+
+        def save(sync_db: Session) -> None:
+            user.profile_picture_url = None
+            sync_db.add(user)
+            sync_db.commit()
+            index_user(user)
+
+        await db.run_sync(save)
 
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_me(
+def delete_me(
     db: Session = Depends(get_db),
     current_user: CurrentUser = Depends(get_current_user),
 ):
-    """Permanently delete the current user's account and all associated data."""
+    """
+    Permanently delete the current user's account and all associated data.
+    Sync route (threadpool): storage and Supabase admin calls are blocking HTTP.
+    """
     auth_user_id = str(current_user.auth_user_id)
     delete_account(db, current_user)
     try:
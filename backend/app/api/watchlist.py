@@ -4,7 +4,7 @@ Watchlist endpoints: GET /watchlist, POST /watchlist, DELETE /watchlist/{symbol}
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.middleware.auth import get_current_user
 from app.schemas.watchlist import AddWatchlistRequest, AddWatchlistResponse, WatchlistItemResponse
 from app.services.auth_service import CurrentUser
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/watchlist", tags=["watchlist"])
 
 @router.get("", response_model=dict)
 def list_watchlist_endpoint(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: CurrentUser = Depends(get_current_user),
 ):
     """Get current user's watchlist. Price/change/image fetched by frontend from external APIs."""
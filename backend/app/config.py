@@ -12,6 +12,13 @@ env_filename = ".env" if raw_env == "dev" else "prod.env"
 ENV_PATH = BASE_DIR / env_filename
 load_dotenv(dotenv_path=ENV_PATH)
 
+def _env_bool(name: str, default: bool = False) -> bool:
+    """Read a boolean env var ("1", "true", "yes" are truthy)."""
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in ("1", "true", "yes")
+
 class Settings:
     """
     Central app configuration loaded from environment variables.
@@ -22,6 +29,25 @@ class Settings:
 
         # Database (Supabase – use transaction pooler URL for app traffic)
         self.database_url: str = os.getenv("DATABASE_URL", "")
+        # Optional read replica for GET endpoints (see app/utils/read_routing.py). After a
+        # write, a client reads from the primary for DB_READ_STICKY_SECONDS.
+        self.database_read_url: str = os.getenv("DATABASE_READ_URL", "")
+        self.read_sticky_seconds: float = float(os.getenv("DB_READ_STICKY_SECONDS", "5"))
+        # Connection pool, per engine and worker (see app/utils/db_pool.py).
+        self.db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+        self.db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+        self.db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+        self.db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+        self.db_connect_timeout: int = int(os.getenv("DB_CONNECT_TIMEOUT", "10"))
+        # Pooled connections idle at least this long are pinged before reuse.
+        self.db_ping_idle_seconds: float = float(os.getenv("DB_PING_IDLE_SECONDS", "30"))
+        # No pooling: a connection per checkout (serverless; index.py defaults it on).
+        self.db_null_pool: bool = _env_bool("DB_NULL_POOL")
+        # PgBouncer/Supavisor transaction mode: no reused server-side prepared statements.
+        # Defaults on for Supabase's transaction pooler port (6543).
+        self.db_transaction_pooler: bool = _env_bool(
+            "DB_TRANSACTION_POOLER", default=":6543/" in self.database_url
+        )
 
         # Supabase project settings
         self.supabase_url: str = os.getenv("SUPABASE_URL", "")
@@ -38,6 +64,16 @@ class Settings:
 
         # Auth
         self.supabase_jwt_secret: str = os.getenv("SUPABASE_JWT_SECRET", "")
+        # Asymmetric signing keys (RS256/ES256): JWKS URL, or a local JWKS JSON file
+        # (takes precedence; e.g. tests). Default URL is the project's well-known JWKS.
+        self.supabase_jwks_file: str = os.getenv("SUPABASE_JWKS_FILE", "")
+        self.supabase_jwks_url: str = os.getenv("SUPABASE_JWKS_URL", "") or (
+            f"{self.supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json"
+            if self.supabase_url
+            else ""
+        )
+        # Signs read-your-writes pin tokens; must be shared by all workers (checked below).
+        self.read_pin_secret: str = os.getenv("READ_PIN_SECRET", "") or self.supabase_jwt_secret
         # Sentry (optional – init only when DSN is set)
         self.sentry_dsn: str = os.getenv("SENTRY_DSN", "")
         self.sentry_environment: str = os.getenv("SENTRY_ENVIRONMENT", self.app_env)
@@ -45,6 +81,22 @@ class Settings:
         self.cron_secret: str = os.getenv("CRON_SECRET", "")
         # News (GNews API – optional, 100 req/day free tier)
         self.gnews_api_key: str = os.getenv("GNEWS_API_KEY", "")
+        # Ticker cache: LISTEN for cross-worker invalidation. Needs a session-mode or
+        # direct DATABASE_URL (the transaction pooler does not support LISTEN).
+        self.ticker_cache_listen: bool = _env_bool("TICKER_CACHE_LISTEN")
+        # Telemetry: statements slower than this are counted and sampled as slow queries.
+        self.slow_query_ms: float = float(os.getenv("SLOW_QUERY_MS", "200"))
+        # Shared directory where each worker writes its telemetry snapshot, so metrics
+        # aggregate across uvicorn/gunicorn workers. Unset: per-worker numbers only.
+        self.metrics_dir: str = os.getenv("METRICS_DIR", "")
+        # Dev: log requests over their SQL statement budget or repeating a statement (N+1).
+        self.query_audit: bool = _env_bool("QUERY_AUDIT")
+        # Buffer last_active_at writes and flush them from a background thread. Off on
+        # serverless (index.py): each request writes its user's activity after responding.
+        self.activity_write_behind: bool = _env_bool("ACTIVITY_WRITE_BEHIND", True)
+        # Admin dashboard: recompute the cached metrics snapshot in a background thread
+        # while it is being viewed. Off on serverless (index.py), where threads are frozen.
+        self.dashboard_refresh: bool = _env_bool("DASHBOARD_REFRESH", True)
         # Basic safety check for critical vars in non-dev environments
         if self.app_env != "dev":
             missing = []
@@ -57,6 +109,12 @@ class Settings:
                     f"Missing required environment variables in {self.app_env} "
                     f"environment: {', '.join(missing)}"
                 )
+        # A per-process secret would reject pins issued by other workers, silently
+        # sending just-written clients to a lagging replica.
+        if self.database_read_url and not self.read_pin_secret:
+            raise RuntimeError(
+                "DATABASE_READ_URL is set but READ_PIN_SECRET (or SUPABASE_JWT_SECRET) is not"
+            )
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
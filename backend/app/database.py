@@ -1,20 +1,62 @@
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 
 from sqlalchemy import text
 from sqlalchemy.engine import Engine, create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 from .config import get_settings
+from .services.telemetry import instrument_engine
+from .utils.db_pool import async_database_url, engine_options, install_idle_ping, pool_status
+from .utils.read_routing import async_read_session_dependency, read_session_dependency
 
 settings = get_settings()
 
 # Create a synchronous SQLAlchemy engine.
 engine: Engine = create_engine(
     settings.database_url,
-    pool_pre_ping=True,
+    **engine_options(settings, "psycopg2"),
 )
 
+install_idle_ping(engine, settings.db_ping_idle_seconds)
+instrument_engine(engine)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine (asyncpg) for async def routes: queries await the socket instead of
+# blocking the event loop. Existing sync service code runs on it through
+# AsyncSession.run_sync (greenlet-adapted, still non-blocking).
+async_engine: AsyncEngine = create_async_engine(
+    async_database_url(settings.database_url, settings.db_transaction_pooler),
+    **engine_options(settings, "asyncpg"),
+)
+
+install_idle_ping(async_engine.sync_engine, settings.db_ping_idle_seconds)
+instrument_engine(async_engine.sync_engine, name="async")
+
+# expire_on_commit=False: attributes stay readable after commit without a lazy (sync) reload.
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Read replica (DATABASE_READ_URL): same pool settings, own pools. Without it reads
+# go to the primary engines.
+if settings.database_read_url:
+    read_engine: Engine = create_engine(
+        settings.database_read_url,
+        **engine_options(settings, "psycopg2"),
+    )
+    install_idle_ping(read_engine, settings.db_ping_idle_seconds)
+    instrument_engine(read_engine, name="replica")
+    async_read_engine: AsyncEngine = create_async_engine(
+        async_database_url(settings.database_read_url, settings.db_transaction_pooler),
+        **engine_options(settings, "asyncpg"),
+    )
+    install_idle_ping(async_read_engine.sync_engine, settings.db_ping_idle_seconds)
+    instrument_engine(async_read_engine.sync_engine, name="async_replica")
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+    AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+else:
+    read_engine, async_read_engine = engine, async_engine
+    ReadSessionLocal, AsyncReadSessionLocal = SessionLocal, AsyncSessionLocal
+
 def get_db():
     """
     FastAPI dependency that provides a database session.
@@ -25,6 +67,22 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    """
+    FastAPI dependency that provides an AsyncSession, for async def routes.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# FastAPI dependencies for read-only (GET) endpoints: replica, or the primary while the
+# client is pinned after a write.
+get_read_db = read_session_dependency(
+    SessionLocal, ReadSessionLocal, settings.read_pin_secret, settings.read_sticky_seconds
+)
+get_async_read_db = async_read_session_dependency(
+    AsyncSessionLocal, AsyncReadSessionLocal, settings.read_pin_secret, settings.read_sticky_seconds
+)
+
 @contextmanager
 def db_session():
     """
@@ -36,6 +94,14 @@ def db_session():
     finally:
         db.close()
 
+@asynccontextmanager
+async def async_db_session():
+    """
+    Async context manager for background jobs running on the event loop (e.g. cron).
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def db_health_check() -> bool:
     """
     Simple health check that attempts a trivial query.
@@ -46,3 +112,25 @@ def db_health_check() -> bool:
         return True
     except Exception:
         return False
+
+async def async_db_health_check() -> bool:
+    """
+    db_health_check on the async engine.
+    """
+    try:
+        async with async_db_session() as db:
+            await db.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+def pool_statuses() -> dict:
+    """Pool usage per engine, for /health/db."""
+    statuses = {
+        "primary": pool_status(engine),
+        "async": pool_status(async_engine.sync_engine),
+    }
+    if read_engine is not engine:
+        statuses["replica"] = pool_status(read_engine)
+        statuses["async_replica"] = pool_status(async_read_engine.sync_engine)
+    return statuses
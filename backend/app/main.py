@@ -1,10 +1,12 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from .config import get_settings
-from .database import db_health_check
+from .database import async_db_health_check, async_engine, async_read_engine, pool_statuses
 from .middleware.cors import init_cors
 from .middleware.error_handler import init_error_handlers
 from .middleware.logging import init_request_logging
 from .middleware.activity import init_activity_tracking
+from .middleware.read_routing import init_read_routing
 from .api.auth import router as auth_router
 from .api.session import router as session_router
 from .api.users import router as users_router
@@ -27,6 +29,13 @@ from .api.cron import router as cron_router
 from .api.watchlist import router as watchlist_router
 from .api.news import router as news_router
 from .api.recent_searches import router as recent_searches_router
+from .services.activity_buffer import activity_buffer
+from .services.auth_service import close_auth_client
+from .services.jwks_cache import warm_jwks
+from .services.metrics_service import DashboardRefresher
+from .services.telemetry import SnapshotWriter
+from .services.suggest_service import warm_suggest_indexes
+from .services.ticker_cache import TickerCacheListener, warm_ticker_cache
 
 settings = get_settings()
 # Sentry: init only when DSN is set (optional)
@@ -41,13 +50,46 @@ if settings.sentry_dsn:
         traces_sample_rate=0.1,
     )
 
-app = FastAPI(title="PageShare Backend", version="0.1.0")
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    """
+    Startup: warm in-process caches. Shutdown: stop background listeners, flush buffered
+    activity, close pooled clients.
+    """
+    warm_ticker_cache()
+    warm_suggest_indexes()
+    await warm_jwks()
+    activity_buffer.start()
+    listener = TickerCacheListener() if settings.ticker_cache_listen else None
+    if listener:
+        listener.start()
+    snapshots = SnapshotWriter(settings.metrics_dir) if settings.metrics_dir else None
+    if snapshots:
+        snapshots.start()
+    dashboard = DashboardRefresher() if settings.dashboard_refresh else None
+    if dashboard:
+        dashboard.start()
+    yield
+    if dashboard:
+        dashboard.stop()
+    if snapshots:
+        snapshots.stop()
+    if listener:
+        listener.stop()
+    activity_buffer.stop()
+    await close_auth_client()
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
+
+app = FastAPI(title="PageShare Backend", version="0.1.0", lifespan=lifespan)
 
 # Global middleware / handlers
 init_cors(app)
 init_error_handlers(app)
 init_request_logging(app)
 init_activity_tracking(app)
+init_read_routing(app)
 
 @app.get("/health")
 async def health_check():
@@ -59,10 +101,10 @@ async def health_check():
 @app.get("/health/db")
 async def health_check_db():
     """
-    Database connectivity health check.
+    Database connectivity health check, with connection pool usage per engine.
     """
-    ok = db_health_check()
-    return {"database": "ok" if ok else "unreachable"}
+    ok = await async_db_health_check()
+    return {"database": "ok" if ok else "unreachable", "pools": pool_statuses()}
 
 @app.get("/")
 async def root():
@@ -1,46 +1,43 @@
 """
-Middleware: touch user activity (last_active_at + user_sessions) on each authenticated request.
-Parses Authorization Bearer and decodes JWT to get user_id; after request, updates DB.
+Middleware: record user activity (last_active_at) on each authenticated request.
+Resolves the bearer token once (resolve_request_auth, memoized on request.state for the
+auth dependencies); after request, queues the user in the activity write-behind buffer
+(or, with ACTIVITY_WRITE_BEHIND off, writes it once the response has been sent).
+Raw ASGI: the response is streamed straight through and no DB work happens on its path.
 """
 from uuid import UUID
-from fastapi import FastAPI, Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from app.database import SessionLocal
-from app.services.auth_service import decode_jwt_user_id_optional
-from app.services.session_service import touch_user_activity
+from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.middleware.auth import resolve_request_auth
+from app.services.activity_buffer import activity_buffer
+from app.services.auth_service import CurrentUser
 
-def _get_user_id_from_request(request: Request) -> str | None:
-    auth = request.headers.get("authorization") or request.headers.get("Authorization")
-    if not auth or not auth.startswith("Bearer "):
-        return None
-    token = auth[7:].strip()
-    return decode_jwt_user_id_optional(token)
-
-class ActivityTrackingMiddleware(BaseHTTPMiddleware):
+class ActivityTrackingMiddleware:
     """
-    After each request: if Authorization Bearer is valid, update users.last_active_at
-    and user_sessions (one row per user per day).
+    After each request: if Authorization Bearer is valid, record the user in the activity
+    buffer, which batches users.last_active_at updates off the request path.
     """
 
-    async def dispatch(self, request: Request, call_next):
-        user_id_str = _get_user_id_from_request(request)
-        response = await call_next(request)
-        if not user_id_str:
-            return response
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        auth = await resolve_request_auth(Request(scope))
+        await self.app(scope, receive, send)
+        if not isinstance(auth, CurrentUser):
+            return
         try:
-            user_id = UUID(user_id_str)
+            user_id = UUID(auth.auth_user_id)
         except (ValueError, TypeError):
-            return response
-        try:
-            db = SessionLocal()
-            try:
-                user_agent = request.headers.get("user-agent")
-                touch_user_activity(db, user_id, user_agent=user_agent)
-            finally:
-                db.close()
-        except Exception:
-            pass
-        return response
+            return
+        activity_buffer.record(user_id)
+        if not activity_buffer.write_behind:
+            await run_in_threadpool(activity_buffer.flush)
 
 def init_activity_tracking(app: FastAPI) -> None:
     """Attach activity tracking middleware."""
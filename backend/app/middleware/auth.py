@@ -1,10 +1,10 @@
-from typing import Optional
+from typing import Optional, Union
 from uuid import UUID
-from fastapi import Depends, Header, HTTPException, status
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models.user import User
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.services.auth_service import AuthErrorCode, AuthException, CurrentUser, verify_jwt
+from app.services.user_service import is_admin
 
 def _parse_authorization_header(authorization: Optional[str]) -> str:
     """
@@ -22,45 +22,63 @@ def _parse_authorization_header(authorization: Optional[str]) -> str:
 
     return parts[1]
 
-async def get_current_user(authorization: Optional[str] = Header(default=None)) -> CurrentUser:
+async def resolve_request_auth(request: Request) -> Union[CurrentUser, AuthException, None]:
+    """
+    Verify the request's bearer token once and memoize the outcome on request.state.auth
+    (shared by middleware and dependencies through the ASGI scope).
+
+    Returns:
+        - CurrentUser when a valid token is provided
+        - AuthException when the header is malformed or the token is invalid
+        - None when there is no Authorization header
+    """
+    state = request.state
+    if hasattr(state, "auth"):
+        return state.auth
+    authorization = request.headers.get("authorization")
+    outcome: Union[CurrentUser, AuthException, None] = None
+    if authorization:
+        try:
+            outcome = await verify_jwt(_parse_authorization_header(authorization))
+        except AuthException as exc:
+            outcome = exc
+    state.auth = outcome
+    return outcome
+
+async def get_current_user(request: Request) -> CurrentUser:
     """
     Dependency for endpoints that require authentication.
     """
-    token = _parse_authorization_header(authorization)
-    return verify_jwt(token)
+    outcome = await resolve_request_auth(request)
+    if outcome is None:
+        raise AuthException(AuthErrorCode.AUTH_REQUIRED, "Authorization header is required")
+    if isinstance(outcome, AuthException):
+        raise AuthException(outcome.code, outcome.message)
+    return outcome
 
 async def require_admin(
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> CurrentUser:
     """
     Dependency for endpoints that require admin (user.badge == 'admin').
-    Use only for metrics and errors admin APIs.
+    Use only for metrics and errors admin APIs. The role is cached per user; a miss is
+    read on the async engine.
     """
-    user = db.get(User, UUID(current_user.auth_user_id))
-    if not user or user.badge != "admin":
+    if not await db.run_sync(is_admin, UUID(current_user.auth_user_id)):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required",
         )
     return current_user
 
-async def get_optional_user(
-    authorization: Optional[str] = Header(default=None),
-) -> Optional[CurrentUser]:
+async def get_optional_user(request: Request) -> Optional[CurrentUser]:
     """
     Dependency for endpoints where authentication is optional.
 
     Returns:
         - CurrentUser when a valid token is provided
-        - None when no/invalid token is provided
+        - None when no/invalid token is provided (caller can treat as anonymous)
     """
-    if not authorization:
-        return None
-
-    try:
-        token = _parse_authorization_header(authorization)
-        return verify_jwt(token)
-    except AuthException:
-        # Swallow auth errors for optional auth; caller can treat as anonymous.
-        return None
+    outcome = await resolve_request_auth(request)
+    return outcome if isinstance(outcome, CurrentUser) else None
@@ -2,6 +2,7 @@ import os
 from typing import List
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.utils.read_routing import PRIMARY_HEADER
 
 def _get_origins() -> List[str]:
     """
@@ -32,4 +33,6 @@ def init_cors(app: FastAPI) -> None:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Read-your-writes pin for clients that cannot rely on the cookie (read_routing.py)
+        expose_headers=[PRIMARY_HEADER],
     )
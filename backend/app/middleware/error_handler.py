@@ -84,11 +84,11 @@ def init_error_handlers(app: FastAPI) -> None:
             pass
 
         try:
-            from app.database import db_session
+            from app.database import async_db_session
             from app.services.error_service import create_error_log
-            with db_session() as db:
-                create_error_log(
-                    db,
+            async with async_db_session() as db:
+                await db.run_sync(
+                    create_error_log,
                     error_type="backend",
                     error_code="UNHANDLED_EXCEPTION",
                     error_message=msg,
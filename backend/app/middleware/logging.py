@@ -1,48 +1,70 @@
 import logging
 import time
 import uuid
-from fastapi import FastAPI, Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from typing import Optional
+from fastapi import FastAPI
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import get_settings
+from app.services.query_audit import QueryLog, audit_request
+from app.services.telemetry import route_label, telemetry
 
 logger = logging.getLogger("pageshare.request")
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """
-    Simple request/response logging with request ID and slow-request detection.
+    Request/response logging with request ID and slow-request detection, and the
+    telemetry hook: per-route latency and the SQL statements each request ran.
+    Raw ASGI (no BaseHTTPMiddleware task/stream wrapping); streaming responses pass through,
+    and the duration covers the full response body.
     """
 
-    def __init__(self, app: FastAPI, slow_threshold_ms: int = 500) -> None:
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, slow_threshold_ms: int = 500, query_audit: Optional[bool] = None) -> None:
+        self.app = app
         self.slow_threshold_ms = slow_threshold_ms
+        self.query_audit = get_settings().query_audit if query_audit is None else query_audit
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next):
         request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
+        # request.state is backed by scope["state"]
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        status_code = 500  # unless a response starts
 
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Expose request ID to clients if useful
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
+
+        method, path = scope["method"], scope["path"]
+        token, queries = telemetry.begin_request(path)
+        if self.query_audit:
+            queries.log = QueryLog()
         start = time.perf_counter()
-        response = await call_next(request)
-        duration_ms = (time.perf_counter() - start) * 1000
-
-        logger.info(
-            "%s %s %s %0.2fms",
-            request.method,
-            request.url.path,
-            request_id,
-            duration_ms,
-        )
-
-        if duration_ms > self.slow_threshold_ms:
-            logger.warning(
-                "SLOW REQUEST %s %s %s %0.2fms",
-                request.method,
-                request.url.path,
-                request_id,
-                duration_ms,
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            telemetry.end_request(token)
+            route = route_label(scope)
+            telemetry.observe_request(route, status_code, duration_ms, queries)
+            logger.info(
+                "%s %s %s %d %0.2fms queries=%d db=%0.2fms",
+                method, path, request_id, status_code, duration_ms, queries.count, queries.ms,
             )
-
-        # Expose request ID to clients if useful
-        response.headers["X-Request-ID"] = request_id
-        return response
+            if duration_ms > self.slow_threshold_ms:
+                logger.warning(
+                    "SLOW REQUEST %s %s %s %0.2fms queries=%d db=%0.2fms",
+                    method, path, request_id, duration_ms, queries.count, queries.ms,
+                )
+            audit_request(route, queries.log)
 
 
 def init_request_logging(app: FastAPI) -> None:
@@ -0,0 +1,50 @@
+"""
+Middleware: pin clients to the primary database briefly after they write (read-your-writes
+with a read replica; see app/utils/read_routing.py). Raw ASGI: only adds response headers.
+"""
+import time
+from fastapi import FastAPI
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import get_settings
+from app.utils.read_routing import PRIMARY_COOKIE, PRIMARY_HEADER, SAFE_METHODS, sign_pin
+
+class ReadYourWritesMiddleware:
+    """
+    On a successful (status < 400) non-GET/HEAD/OPTIONS request, return a pin token valid for
+    sticky_seconds in the pageshare_primary cookie and the X-Primary-Until header.
+    """
+
+    def __init__(self, app: ASGIApp, secret: str, sticky_seconds: float) -> None:
+        self.app = app
+        self.secret = secret
+        self.sticky_seconds = sticky_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_pin(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                token = sign_pin(int(time.time() + self.sticky_seconds), self.secret)
+                headers = MutableHeaders(scope=message)
+                headers.append(PRIMARY_HEADER, token)
+                headers.append(
+                    "Set-Cookie",
+                    f"{PRIMARY_COOKIE}={token}; Max-Age={int(self.sticky_seconds)}; Path=/; "
+                    "HttpOnly; Secure; SameSite=None",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin)
+
+def init_read_routing(app: FastAPI) -> None:
+    """Attach the read-your-writes middleware when a read replica is configured."""
+    settings = get_settings()
+    if settings.database_read_url:
+        app.add_middleware(
+            ReadYourWritesMiddleware,
+            secret=settings.read_pin_secret,
+            sticky_seconds=settings.read_sticky_seconds,
+        )
@@ -13,6 +13,7 @@ from . import (  # noqa: E402,F401
     comment,
     ticker,
     post_ticker,
+    ticker_mention_bucket,
     reaction,
     repost,
     follow,
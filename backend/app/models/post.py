@@ -2,12 +2,15 @@ from sqlalchemy import (
     ARRAY,
     CheckConstraint,
     Column,
+    Computed,
     DateTime,
     ForeignKey,
+    Index,
     String,
     Text,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from . import Base
 
@@ -41,6 +44,10 @@ class Post(Base):
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
     deleted_at = Column(DateTime(timezone=True))
+    # Full-text search document, maintained by Postgres. Deferred: only search reads it.
+    content_tsv = deferred(
+        Column(TSVECTOR, Computed("to_tsvector('english', content)", persisted=True))
+    )
 
     # Content length: DB allows up to 10K. Enforce 280 (normal) vs 10K (premium)
     # in API/service layer based on user tier; see post schemas & post_service.
@@ -57,4 +64,10 @@ class Post(Base):
             "repost_type IN ('normal', 'quote') OR repost_type IS NULL",
             name="posts_repost_type_check",
         ),
+        Index(
+            "ix_posts_content_tsv",
+            content_tsv.columns[0],
+            postgresql_using="gin",
+            postgresql_where=deleted_at.is_(None),
+        ),
     )
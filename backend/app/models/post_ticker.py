@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey
+from sqlalchemy import Column, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from . import Base
@@ -21,3 +21,17 @@ class PostTicker(Base):
     created_at = Column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+    # Denormalized from posts so a ticker timeline is one index range scan
+    # (no join to posts to order or to skip soft-deleted rows).
+    post_created_at = Column(DateTime(timezone=True), nullable=False)
+    post_deleted_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index(
+            "ix_post_tickers_ticker_timeline",
+            ticker_id,
+            post_created_at.desc(),
+            post_id,
+            postgresql_where=post_deleted_at.is_(None),
+        ),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from . import Base
@@ -8,6 +8,10 @@ class RecentSearch(Base):
     """User's recent search entries (accounts and tickers). Backend source of truth."""
 
     __tablename__ = "recent_searches"
+    __table_args__ = (
+        # One row per (user, result): re-adding upserts and bumps created_at (migration 0009).
+        Index("uq_recent_searches_user_type_result", "user_id", "type", "result_id", unique=True),
+    )
 
     id = Column(
         UUID(as_uuid=True),
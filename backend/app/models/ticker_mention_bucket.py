@@ -0,0 +1,25 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from . import Base
+
+class TickerMentionBucket(Base):
+    """
+    Mention counter per ticker per 5-minute bucket. Feeds trending windows (1h/24h/7d)
+    without re-aggregating post history. Incremented when post_tickers are linked,
+    decremented when a post is soft-deleted; old buckets are pruned by the daily cron.
+    """
+
+    __tablename__ = "ticker_mention_buckets"
+
+    ticker_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("tickers.id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    )
+    bucket_start = Column(DateTime(timezone=True), primary_key=True, nullable=False)
+    mention_count = Column(Integer, nullable=False, server_default="0")
+
+    __table_args__ = (
+        Index("ix_ticker_mention_buckets_bucket_start", "bucket_start"),
+    )
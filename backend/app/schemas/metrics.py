@@ -48,6 +48,7 @@ class HealthMetrics(BaseModel):
     database: Dict[str, Any] = Field(default_factory=lambda: {"query_time_avg_ms": None, "slow_queries_count": None})
     storage: Dict[str, Any] = Field(default_factory=lambda: {"usage_mb": None, "files_count": None})
     errors: Dict[str, int] = Field(default_factory=lambda: {"total_today": 0, "critical_today": 0, "resolved_today": 0})
+    caches: Dict[str, Any] = Field(default_factory=dict)
 
 class TrendingTickerItem(BaseModel):
     """Single trending ticker."""
@@ -1,8 +1,9 @@
 """
-Search response schemas (users and tickers only).
+Search response schemas (users, tickers, and posts for type=posts).
 """
 from typing import List, Optional
 from pydantic import BaseModel
+from app.schemas.post import PostInFeedResponse
 
 class SearchUserItem(BaseModel):
     """One user in search results."""
@@ -19,7 +20,8 @@ class SearchTickerItem(BaseModel):
     name: Optional[str] = None
 
 class SearchResponseData(BaseModel):
-    """Search result data: users and tickers only."""
+    """Search result data: users and tickers, or posts for type=posts."""
 
     users: List[SearchUserItem] = []
     tickers: List[SearchTickerItem] = []
+    posts: List[PostInFeedResponse] = []
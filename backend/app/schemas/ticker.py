@@ -11,6 +11,10 @@ class TrendingTickerResponse(BaseModel):
     ticker_id: str
     symbol: str
     name: Optional[str] = None
-    mention_count: int = 0
+    window: str = "24h"
+    mention_count: int = 0  # mentions within window
+    mentions_1h: int = 0
     mentions_24h: int = 0
-    last_mentioned_at: Optional[datetime] = None
+    mentions_7d: int = 0
+    growth: Optional[float] = None  # vs the preceding window; None when it had no mentions
+    last_mentioned_at: Optional[datetime] = None  # start of the latest 5-minute bucket
@@ -0,0 +1,3 @@
+"""
+Operational commands, run as `python -m app.scripts.<name>` from the backend directory.
+"""
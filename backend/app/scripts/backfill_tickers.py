@@ -0,0 +1,266 @@
+"""
+Re-extract tickers from every live post and rebuild post_tickers to match.
+
+Run after changing extract_tickers or detect_ticker_type rules:
+
+    python -m app.scripts.backfill_tickers --workers 4 --rate 500
+    python -m app.scripts.backfill_tickers --retype --dry-run
+
+Posts are streamed in id order with a server-side cursor (yield_per). Extraction runs in a
+process pool. Each batch is diffed against its existing links and applied in one short
+transaction (multi-row insert + delete, mention buckets adjusted). The last committed post id
+is written to a checkpoint file, so an interrupted run resumes where it stopped. --rate and
+--pause throttle the run; it holds at most two DB connections.
+"""
+from __future__ import annotations
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from uuid import UUID
+from sqlalchemy import delete, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from app.models.post import Post
+from app.models.post_ticker import PostTicker
+from app.models.ticker import Ticker
+from app.utils.ticker_extractor import extract_tickers_batch
+from app.utils.ticker_type import detect_ticker_type
+
+logger = logging.getLogger("pageshare.backfill_tickers")
+
+DEFAULT_CHECKPOINT = ".backfill_tickers.checkpoint.json"
+# Re-open the streaming cursor after this many batches so no snapshot is held for hours.
+BATCHES_PER_CURSOR = 20
+MAX_ATTEMPTS = 3
+
+Link = Tuple[UUID, str]
+
+@dataclass
+class Progress:
+    """Checkpointed state: last committed post id and running totals."""
+
+    last_post_id: Optional[str] = None
+    scanned: int = 0
+    added: int = 0
+    removed: int = 0
+
+def load_checkpoint(path: str) -> Progress:
+    """Read progress from path; a missing file means start from the beginning."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return Progress(**json.load(f))
+    except FileNotFoundError:
+        return Progress()
+
+def save_checkpoint(path: str, progress: Progress) -> None:
+    """Write progress atomically (temp file + rename) so a crash never leaves a torn file."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(asdict(progress), f)
+    os.replace(tmp, path)
+
+def diff_links(
+    desired: Dict[UUID, Set[str]],
+    existing: Dict[UUID, Set[str]],
+) -> Tuple[List[Link], List[Link]]:
+    """
+    Compare extracted symbols with current links for the same posts.
+    Returns (links to add, links to remove) as sorted (post_id, symbol) pairs.
+    """
+    adds: List[Link] = []
+    removes: List[Link] = []
+    for post_id in desired.keys() | existing.keys():
+        want = desired.get(post_id, set())
+        have = existing.get(post_id, set())
+        adds.extend((post_id, s) for s in want - have)
+        removes.extend((post_id, s) for s in have - want)
+    return sorted(adds), sorted(removes)
+
+def _extract_chunk(contents: List[Optional[str]]) -> List[List[str]]:
+    """Process-pool worker: extract tickers for a chunk of post contents."""
+    return extract_tickers_batch(contents)
+
+def _extract(executor: Optional[Executor], contents: List[Optional[str]], workers: int) -> List[List[str]]:
+    if executor is None:
+        return _extract_chunk(contents)
+    size = max(1, -(-len(contents) // workers))
+    chunks = [contents[i:i + size] for i in range(0, len(contents), size)]
+    return [symbols for part in executor.map(_extract_chunk, chunks) for symbols in part]
+
+def stream_posts(reader: Session, after: Optional[UUID], batch_size: int) -> Iterator[list]:
+    """
+    Yield batches of (id, content, created_at) for live original posts with id > after.
+    Quote/normal reposts are skipped: only create_post links tickers.
+    """
+    while True:
+        stmt = (
+            select(Post.id, Post.content, Post.created_at)
+            .where(Post.deleted_at.is_(None), Post.original_post_id.is_(None))
+            .order_by(Post.id)
+            .limit(batch_size * BATCHES_PER_CURSOR)
+            .execution_options(yield_per=batch_size)
+        )
+        if after is not None:
+            stmt = stmt.where(Post.id > after)
+        got = 0
+        for batch in reader.execute(stmt).partitions():
+            got += len(batch)
+            after = batch[-1].id
+            yield batch
+        reader.rollback()
+        if got < batch_size * BATCHES_PER_CURSOR:
+            return
+
+def _existing_links(db: Session, post_ids: List[UUID]) -> Tuple[Dict[UUID, Set[str]], Dict[str, UUID]]:
+    """Return (post_id -> linked symbols, symbol -> ticker id) for the given posts."""
+    from app.services.ticker_service import get_tickers_by_ids
+
+    rows = db.execute(
+        select(PostTicker.post_id, PostTicker.ticker_id).where(PostTicker.post_id.in_(post_ids))
+    ).all()
+    tickers = get_tickers_by_ids(db, [r.ticker_id for r in rows])
+    existing: Dict[UUID, Set[str]] = {}
+    for r in rows:
+        existing.setdefault(r.post_id, set()).add(tickers[r.ticker_id].symbol)
+    return existing, {t.symbol: t.id for t in tickers.values()}
+
+def apply_batch(db: Session, batch: list, symbols: List[List[str]], dry_run: bool) -> Tuple[int, int]:
+    """
+    Diff one batch against post_tickers and apply it in a single transaction.
+    Returns (links added, links removed). Commits unless dry_run.
+    """
+    from app.services.ticker_service import resolve_or_create_ticker_ids
+    from app.services.trending_service import count_linked_mentions, uncount_unlinked_mentions
+
+    desired = {row.id: set(s) for row, s in zip(batch, symbols) if s}
+    existing, linked_ids = _existing_links(db, [row.id for row in batch])
+    adds, removes = diff_links(desired, existing)
+    if dry_run or not (adds or removes):
+        db.rollback()
+        return len(adds), len(removes)
+    # Never queue behind user traffic for long; the batch is retried instead.
+    db.execute(text("SET LOCAL lock_timeout = '2s'"))
+    if adds:
+        ids = resolve_or_create_ticker_ids(db, sorted({s for _, s in adds}))
+        created_at = {row.id: row.created_at for row in batch}
+        linked = (
+            pg_insert(PostTicker)
+            .values(
+                [
+                    {"post_id": pid, "ticker_id": ids[s], "post_created_at": created_at[pid]}
+                    for pid, s in adds
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=[PostTicker.post_id, PostTicker.ticker_id])
+            .returning(PostTicker.ticker_id, PostTicker.post_created_at)
+            .cte("linked")
+        )
+        db.execute(count_linked_mentions(linked))
+    if removes:
+        pairs = [(pid, linked_ids[s]) for pid, s in removes]
+        unlinked = (
+            delete(PostTicker)
+            .where(tuple_(PostTicker.post_id, PostTicker.ticker_id).in_(pairs))
+            .returning(PostTicker.ticker_id, PostTicker.post_created_at)
+            .cte("unlinked")
+        )
+        db.execute(uncount_unlinked_mentions(unlinked))
+    db.commit()
+    return len(adds), len(removes)
+
+def retype_tickers(db: Session, dry_run: bool) -> int:
+    """
+    Recompute tickers.type with detect_ticker_type; one UPDATE per changed type.
+    Other workers drop the changed symbols from their ticker cache via NOTIFY.
+    Returns number of tickers whose type changed.
+    """
+    from app.services.ticker_cache import notify_ticker_changes
+
+    changed: Dict[str, List[str]] = {}
+    for symbol, kind in db.execute(select(Ticker.symbol, Ticker.type)):
+        new_kind = detect_ticker_type(symbol)
+        if new_kind != kind:
+            changed.setdefault(new_kind, []).append(symbol)
+    total = sum(len(v) for v in changed.values())
+    if dry_run or not total:
+        db.rollback()
+        return total
+    for kind, symbols in changed.items():
+        db.execute(update(Ticker).where(Ticker.symbol.in_(symbols)).values(type=kind))
+    notify_ticker_changes(db, sorted(s for v in changed.values() for s in v))
+    db.commit()
+    return total
+
+def _apply_with_retry(db: Session, batch: list, symbols: List[List[str]], dry_run: bool) -> Tuple[int, int]:
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            return apply_batch(db, batch, symbols, dry_run)
+        except OperationalError as exc:
+            db.rollback()
+            if attempt == MAX_ATTEMPTS:
+                raise
+            logger.warning("Batch failed (attempt %d/%d), retrying: %s", attempt, MAX_ATTEMPTS, exc)
+            time.sleep(2 ** attempt)
+    raise AssertionError("unreachable")
+
+def run(args: argparse.Namespace) -> Progress:
+    """Stream, extract, diff and apply all posts after the checkpoint. Returns final progress."""
+    from app.database import SessionLocal
+
+    progress = Progress() if args.restart else load_checkpoint(args.checkpoint)
+    after = UUID(progress.last_post_id) if progress.last_post_id else None
+    if after is not None:
+        logger.info("Resuming after post %s (%d scanned so far)", after, progress.scanned)
+    executor = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+    try:
+        with SessionLocal() as reader, SessionLocal() as writer:
+            if args.retype:
+                logger.info("Retyped %d tickers", retype_tickers(writer, args.dry_run))
+            for batch in stream_posts(reader, after, args.batch_size):
+                started = time.monotonic()
+                symbols = _extract(executor, [row.content for row in batch], args.workers)
+                added, removed = _apply_with_retry(writer, batch, symbols, args.dry_run)
+                progress.last_post_id = str(batch[-1].id)
+                progress.scanned += len(batch)
+                progress.added += added
+                progress.removed += removed
+                if not args.dry_run:
+                    save_checkpoint(args.checkpoint, progress)
+                logger.info(
+                    "scanned=%d added=%d removed=%d last=%s",
+                    progress.scanned, progress.added, progress.removed, progress.last_post_id,
+                )
+                if args.limit and progress.scanned >= args.limit:
+                    break
+                # Throttle: at most --rate posts/s, and always --pause between batches.
+                budget = len(batch) / args.rate if args.rate > 0 else 0.0
+                time.sleep(max(budget - (time.monotonic() - started), 0.0) + args.pause)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return progress
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Rebuild post_tickers from post content.")
+    parser.add_argument("--batch-size", type=int, default=500, help="posts per batch/transaction")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="extraction processes (1 = in-process)")
+    parser.add_argument("--rate", type=float, default=1000.0, help="max posts per second (0 = unthrottled)")
+    parser.add_argument("--pause", type=float, default=0.05, help="seconds to sleep between batches")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT, help="progress file for resuming")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start over")
+    parser.add_argument("--limit", type=int, default=0, help="stop after about this many posts (0 = all)")
+    parser.add_argument("--retype", action="store_true", help="also recompute tickers.type")
+    parser.add_argument("--dry-run", action="store_true", help="report changes without writing")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    progress = run(args)
+    logger.info("Done: %s", asdict(progress))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark database access from request handlers under many concurrent clients, in-process
+(ASGI transport): requests/sec and latency percentiles for the same query run
+
+- "blocking":   sync Session inside an async def route (the previous pattern: every query
+                stalls the event loop, so concurrent requests run one at a time),
+- "threadpool": sync Session in a def route (FastAPI's threadpool, 40 threads),
+- "async":      AsyncSession on the asyncpg engine inside an async def route.
+
+    python -m app.scripts.bench_async_db --concurrency 200 --query-ms 5
+
+Needs DATABASE_URL pointing at a reachable database. Both engines use their configured
+pools, so with more clients than connections the numbers include pool waits.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List, Optional
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import text
+from app.database import AsyncSessionLocal, SessionLocal, async_engine
+
+_QUERY = text("SELECT pg_sleep(:seconds)")
+
+def build_app(query_seconds: float) -> FastAPI:
+    app = FastAPI()
+    params = {"seconds": query_seconds}
+
+    @app.get("/blocking")
+    async def blocking():
+        with SessionLocal() as db:
+            db.execute(_QUERY, params)
+        return {}
+
+    @app.get("/threadpool")
+    def threadpool():
+        with SessionLocal() as db:
+            db.execute(_QUERY, params)
+        return {}
+
+    @app.get("/async")
+    async def non_blocking():
+        async with AsyncSessionLocal() as db:
+            await db.execute(_QUERY, params)
+        return {}
+
+    return app
+
+async def _run(app: FastAPI, path: str, requests: int, concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(None)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await asyncio.gather(*(client.get(path) for _ in range(min(20, requests))))  # warm pools
+
+        async def worker() -> None:
+            while not queue.empty():
+                queue.get_nowait()
+                started = time.perf_counter()
+                r = await client.get(path)
+                latencies.append(time.perf_counter() - started)
+                if r.status_code >= 500:
+                    raise RuntimeError(f"{path} returned {r.status_code}")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    cuts = statistics.quantiles(latencies, n=100)
+    return {"rps": len(latencies) / elapsed, "p50_ms": cuts[49] * 1000, "p99_ms": cuts[98] * 1000}
+
+async def _main(args: argparse.Namespace) -> None:
+    app = build_app(args.query_ms / 1000)
+    try:
+        for mode in args.modes:
+            r = await _run(app, f"/{mode}", args.requests, args.concurrency)
+            print(
+                f"{mode:10} c={args.concurrency:<4} {r['rps']:8.0f} req/s  "
+                f"p50 {r['p50_ms']:7.2f}ms  p99 {r['p99_ms']:7.2f}ms"
+            )
+    finally:
+        await async_engine.dispose()
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async database access per request.")
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--query-ms", type=float, default=5.0, help="Server-side time per query (pg_sleep)")
+    parser.add_argument(
+        "--modes", nargs="+", default=["blocking", "threadpool", "async"],
+        choices=["blocking", "threadpool", "async"],
+    )
+    asyncio.run(_main(parser.parse_args(argv)))
+
+if __name__ == "__main__":
+    main()
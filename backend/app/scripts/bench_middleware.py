@@ -0,0 +1,121 @@
+"""
+Benchmark the request middleware stack in-process (ASGI transport, no network): requests/sec
+and latency percentiles per path, for the raw ASGI middlewares ("asgi") and for the same
+logic wrapped in Starlette's BaseHTTPMiddleware ("legacy", the previous implementation).
+
+    python -m app.scripts.bench_middleware --paths /health
+    python -m app.scripts.bench_middleware --paths /health /api/v1/feed --token "$JWT"
+
+Needs DATABASE_URL (app import); /api/v1/feed also needs a reachable database and a token.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+import uuid
+from typing import Dict, List, Optional
+from uuid import UUID
+import httpx
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.middleware.activity import ActivityTrackingMiddleware
+from app.middleware.auth import resolve_request_auth
+from app.middleware.logging import RequestLoggingMiddleware, logger as request_logger
+from app.services.activity_buffer import activity_buffer
+from app.services.auth_service import CurrentUser
+
+class LegacyRequestLogging(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware request logger."""
+
+    async def dispatch(self, request, call_next):
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        start = time.perf_counter()
+        response = await call_next(request)
+        request_logger.info(
+            "%s %s %s %0.2fms", request.method, request.url.path, request_id,
+            (time.perf_counter() - start) * 1000,
+        )
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+class LegacyActivityTracking(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware activity tracker (with the buffered write)."""
+
+    async def dispatch(self, request, call_next):
+        auth = await resolve_request_auth(request)
+        response = await call_next(request)
+        if isinstance(auth, CurrentUser):
+            activity_buffer.record(UUID(auth.auth_user_id))
+        return response
+
+_REPLACEMENTS = {
+    RequestLoggingMiddleware: LegacyRequestLogging,
+    ActivityTrackingMiddleware: LegacyActivityTracking,
+}
+
+_original_middleware: Optional[list] = None
+
+def build_app(stack: str):
+    """app.main.app with its own middleware list ("asgi") or with the legacy classes swapped in."""
+    global _original_middleware
+    from app.main import app
+
+    if _original_middleware is None:
+        _original_middleware = list(app.user_middleware)
+    app.user_middleware = list(_original_middleware)
+    if stack == "legacy":
+        app.user_middleware = [
+            Middleware(_REPLACEMENTS.get(m.cls, m.cls), *m.args, **m.kwargs) for m in _original_middleware
+        ]
+    app.middleware_stack = None  # rebuilt on next request
+    return app
+
+async def _run(app, path: str, headers: Dict[str, str], requests: int, concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(None)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(min(50, requests)):  # warm-up
+            await client.get(path, headers=headers)
+
+        async def worker() -> None:
+            while not queue.empty():
+                queue.get_nowait()
+                started = time.perf_counter()
+                r = await client.get(path, headers=headers)
+                latencies.append(time.perf_counter() - started)
+                if r.status_code >= 500:
+                    raise RuntimeError(f"{path} returned {r.status_code}")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    cuts = statistics.quantiles(latencies, n=100)
+    return {"rps": len(latencies) / elapsed, "p50_ms": cuts[49] * 1000, "p99_ms": cuts[98] * 1000}
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the request middleware stack.")
+    parser.add_argument("--paths", nargs="+", default=["/health"])
+    parser.add_argument("--token", default="", help="Bearer token for authenticated paths")
+    parser.add_argument("--requests", type=int, default=5000)
+    # The ASGI transport runs a request inline until it awaits I/O, so concurrency > 1 only
+    # interleaves requests that touch the database; latencies then include queueing.
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--stacks", nargs="+", default=["legacy", "asgi"], choices=["legacy", "asgi"])
+    args = parser.parse_args(argv)
+
+    logging.getLogger("pageshare.request").setLevel(logging.WARNING)
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    for stack in args.stacks:
+        app = build_app(stack)
+        for path in args.paths:
+            r = asyncio.run(_run(app, path, headers, args.requests, args.concurrency))
+            print(f"{stack:6} {path:20} {r['rps']:8.0f} req/s  p50 {r['p50_ms']:6.2f}ms  p99 {r['p99_ms']:6.2f}ms")
+
+if __name__ == "__main__":
+    main()
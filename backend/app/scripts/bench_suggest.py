@@ -0,0 +1,52 @@
+"""
+Benchmark the typeahead prefix index on synthetic users: rebuild time, memory and lookup latency.
+
+    python -m app.scripts.bench_suggest --users 1000000
+"""
+from __future__ import annotations
+import argparse
+import random
+import string
+import time
+import timeit
+import tracemalloc
+from typing import List, Optional
+from app.services.suggest_service import PrefixIndex, user_suggestion
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the suggest prefix index.")
+    parser.add_argument("--users", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    entries = [
+        user_suggestion(i, _word(rng), f"{_word(rng).title()} {_word(rng).title()}", None, rng.randint(0, 5000))
+        for i in range(args.users)
+    ]
+    index = PrefixIndex()
+    started = time.perf_counter()
+    index.rebuild(iter(entries))
+    rebuild_s = time.perf_counter() - started
+    # Second build under tracemalloc (slow) just to measure the index's own allocations.
+    tracemalloc.start()
+    traced = PrefixIndex()
+    traced.rebuild(iter(entries))
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"users={args.users} keys={index.stats()['keys']}")
+    print(f"rebuild: {rebuild_s:.2f}s, index memory: {current / 2**20:.1f} MiB (peak {peak / 2**20:.1f} MiB)")
+    for prefix in ("a", "ma", "mar", "mark", "markz"):
+        first = timeit.timeit(lambda: index.search(prefix), number=1)
+        per_call = min(timeit.repeat(lambda: index.search(prefix), number=1000, repeat=3)) / 1000
+        print(f"search({prefix!r}): first {first * 1e6:.0f}us, then {per_call * 1e6:.1f}us")
+    started = time.perf_counter()
+    index.upsert(*user_suggestion(args.users + 1, "markzuck", "Mark Z", None))
+    print(f"incremental upsert: {(time.perf_counter() - started) * 1e6:.0f}us")
+
+if __name__ == "__main__":
+    main()
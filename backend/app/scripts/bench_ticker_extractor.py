@@ -0,0 +1,47 @@
+"""
+Benchmark ticker extraction per call, against loose regression budgets (several times the
+measured cost, so only algorithmic regressions such as catastrophic backtracking trip them).
+
+    python -m app.scripts.bench_ticker_extractor   # exits 1 when a case is over budget
+"""
+from __future__ import annotations
+import sys
+import timeit
+from typing import Callable, List, Optional
+from app.utils.ticker_extractor import extract_tickers, extract_tickers_batch
+
+SHORT_POST = "Loading up on $BTC and $eth before the halving #crypto $btc"
+PLAIN_POST = "Just had a great coffee this morning, markets look calm today."
+LONG_POST = ("Some text about markets $AAPL.US and #tsla, nothing else. " * 200)[:10000]
+# Worst cases for the pattern: every position starts a match attempt that backtracks.
+ADVERSARIAL = [
+    ("$" + "A" * 11) * 833,
+    "$" * 10000,
+    "#." * 5000,
+    ("$" + "A." * 5) * 909,
+]
+
+# (label, function, argument, calls per repeat, budget in microseconds per call)
+CASES = [
+    ("short post", extract_tickers, SHORT_POST, 2000, 50),
+    ("plain post (fast path)", extract_tickers, PLAIN_POST, 5000, 5),
+    ("10K-char post", extract_tickers, LONG_POST, 50, 3000),
+    *[(f"adversarial #{i}", extract_tickers, text, 20, 5000) for i, text in enumerate(ADVERSARIAL, 1)],
+    ("batch of 1000", extract_tickers_batch, [SHORT_POST, PLAIN_POST] * 500, 5, 20000),
+]
+
+def per_call_us(fn: Callable, arg, number: int) -> float:
+    """Best-of-5 mean time per call in microseconds."""
+    return min(timeit.repeat(lambda: fn(arg), number=number, repeat=5)) / number * 1e6
+
+def main(argv: Optional[List[str]] = None) -> None:
+    over = 0
+    for label, fn, arg, number, budget in CASES:
+        us = per_call_us(fn, arg, number)
+        flag = "" if us < budget else "  OVER BUDGET"
+        over += bool(flag)
+        print(f"{label}: {us:.1f}us per call (budget {budget}us){flag}")
+    sys.exit(1 if over else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Write-behind buffer for users.last_active_at.
+
+Requests only record (user_id, time) in memory; a background thread flushes the latest
+time per user every FLUSH_SECONDS with one UPDATE ... FROM (VALUES ...) per chunk
+(session_service.touch_users_activity). Users written by this process within
+ACTIVITY_RESOLUTION are not re-queued, and the UPDATE itself skips rows whose value is
+that fresh (other workers). The app lifespan starts the flusher and flushes on shutdown;
+without a lifespan the first record starts it.
+
+With ACTIVITY_WRITE_BEHIND off (serverless, where a frozen instance never runs its
+flusher and may be recycled with times still pending) there is no thread: the activity
+middleware flushes after each response instead.
+"""
+from __future__ import annotations
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+from uuid import UUID
+from app.config import get_settings
+from app.services.session_service import ACTIVITY_RESOLUTION, touch_users_activity
+
+logger = logging.getLogger("pageshare.activity")
+
+FLUSH_SECONDS = 5.0
+CHUNK_SIZE = 1000
+
+class ActivityBuffer:
+    """Latest activity time per user, coalesced until the next flush. Thread-safe."""
+
+    def __init__(
+        self,
+        flush_seconds: float = FLUSH_SECONDS,
+        session_factory: Optional[Callable] = None,
+        write_behind: bool = True,
+    ) -> None:
+        self._flush_seconds = flush_seconds
+        self.write_behind = write_behind
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[UUID, datetime] = {}
+        self._written: Dict[UUID, float] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.recorded = 0
+        self.skipped = 0
+        self.flushed_rows = 0
+        self.flushes = 0
+        self.failures = 0
+
+    def record(self, user_id: UUID, at: Optional[datetime] = None) -> None:
+        """Note that user_id was active at `at` (default now). Never touches the DB. No-op once stopped."""
+        now = time.monotonic()
+        at = at or datetime.now(timezone.utc)
+        with self._lock:
+            if self._closed:
+                return
+            written = self._written.get(user_id)
+            if written is not None and now - written < ACTIVITY_RESOLUTION.total_seconds():
+                self.skipped += 1
+                return
+            self.recorded += 1
+            current = self._pending.get(user_id)
+            if current is None or at > current:
+                self._pending[user_id] = at
+        if self._thread is None and self.write_behind:
+            self.start()
+
+    def flush(self) -> int:
+        """Write all pending times now. Failed batches are re-queued. Returns rows updated."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+            items = list(pending.items())
+            updated = 0
+            for i in range(0, len(items), CHUNK_SIZE):
+                chunk = dict(items[i:i + CHUNK_SIZE])
+                try:
+                    with self._open_session() as db:
+                        updated += touch_users_activity(db, chunk)
+                except Exception as exc:
+                    self.failures += 1
+                    logger.warning("Activity flush failed for %d users, re-queued: %s", len(chunk), exc)
+                    self._requeue(chunk)
+                    continue
+                self._mark_written(chunk)
+            self.flushes += 1
+            self.flushed_rows += updated
+            return updated
+
+    def start(self) -> None:
+        """Accept records again and, when writing behind, start the flusher thread."""
+        with self._lock:
+            self._closed = False
+            if self._thread is not None or not self.write_behind:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="activity-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flusher and write what is still pending (app shutdown). Later records are dropped."""
+        with self._lock:
+            self._closed = True
+        thread = self._thread
+        self._stop.set()
+        if thread is not None:
+            thread.join(timeout=self._flush_seconds + 1)
+        self._thread = None
+        self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "recorded": self.recorded,
+            "skipped": self.skipped,
+            "flushes": self.flushes,
+            "flushed_rows": self.flushed_rows,
+            "failures": self.failures,
+        }
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._flush_seconds):
+            try:
+                self.flush()
+            except Exception as exc:
+                logger.warning("Activity flusher error: %s", exc)
+
+    def _open_session(self):
+        if self._session_factory is not None:
+            return self._session_factory()
+        from app.database import db_session
+
+        return db_session()
+
+    def _requeue(self, chunk: Dict[UUID, datetime]) -> None:
+        with self._lock:
+            for user_id, at in chunk.items():
+                current = self._pending.get(user_id)
+                if current is None or at > current:
+                    self._pending[user_id] = at
+
+    def _mark_written(self, chunk: Dict[UUID, datetime]) -> None:
+        now = time.monotonic()
+        horizon = now - ACTIVITY_RESOLUTION.total_seconds()
+        with self._lock:
+            for user_id in chunk:
+                self._written[user_id] = now
+            if len(self._written) > 4 * CHUNK_SIZE:
+                self._written = {u: t for u, t in self._written.items() if t >= horizon}
+
+activity_buffer = ActivityBuffer(write_behind=get_settings().activity_write_behind)
@@ -1,12 +1,23 @@
 from dataclasses import dataclass
 from typing import Any, Dict
-from datetime import datetime, timezone
+import hashlib
+import time
 import jwt
 import httpx
 from app.config import get_settings
+from app.services.jwks_cache import ASYMMETRIC_ALGORITHMS, jwks_cache
+from app.services.telemetry import outbound_call
+from app.utils.cache import TTLCache
 
 settings = get_settings()
 
+# Verified tokens -> CurrentUser (until exp) and rejected tokens -> AuthException (briefly),
+# keyed by token SHA-256. Clients resend the same token on every request until it expires.
+VALID_TOKEN_MAX_TTL = 3600.0
+INVALID_TOKEN_TTL = 30.0
+token_cache = TTLCache(maxsize=10000, ttl=VALID_TOKEN_MAX_TTL)
+_api_client: httpx.AsyncClient | None = None
+
 class AuthErrorCode:
     AUTH_REQUIRED = "AUTH_REQUIRED"
     AUTH_INVALID = "AUTH_INVALID"
@@ -22,6 +33,9 @@ class AuthException(Exception):
         self.message = message
         super().__init__(message)
 
+class _AuthUnavailable(Exception):
+    """Supabase Auth API could not give an answer (transient; not cached)."""
+
 @dataclass
 class CurrentUser:
     """
@@ -34,17 +48,29 @@ class CurrentUser:
     auth_user_id: str
     claims: Dict[str, Any]
 
-def _get_jwt_secret() -> str:
-    secret = settings.supabase_jwt_secret
-    if not secret:
-        raise RuntimeError("SUPABASE_JWT_SECRET is not configured")
-    return secret
+def _get_api_client() -> httpx.AsyncClient:
+    """Shared pooled client for the Supabase Auth API (keep-alive across requests)."""
+    global _api_client
+    if _api_client is None:
+        _api_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(5.0, connect=2.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+    return _api_client
 
+async def close_auth_client() -> None:
+    """Close the pooled Supabase Auth client (app shutdown)."""
+    global _api_client
+    if _api_client is not None:
+        client, _api_client = _api_client, None
+        await client.aclose()
 
-def _verify_via_supabase_api(token: str) -> CurrentUser | None:
+async def _verify_via_supabase_api(token: str) -> CurrentUser | None:
     """
     Fallback: verify JWT by calling Supabase Auth API.
     Use when local JWT decode fails (e.g. project uses JWKS/RS256 instead of legacy secret).
+    Returns None when Supabase rejects the token; raises _AuthUnavailable when the API
+    cannot answer (network error, 5xx), which must not be cached as an invalid token.
     """
     url = settings.supabase_url
     anon_key = settings.supabase_anon_key
@@ -53,80 +79,154 @@ def _verify_via_supabase_api(token: str) -> CurrentUser | None:
     base = url.rstrip("/")
     auth_url = f"{base}/auth/v1/user"
     try:
-        with httpx.Client(timeout=10.0) as client:
-            r = client.get(
+        with outbound_call("supabase"):
+            r = await _get_api_client().get(
                 auth_url,
                 headers={
                     "Authorization": f"Bearer {token}",
                     "apikey": anon_key,
                 },
             )
-        if r.status_code != 200:
-            return None
+    except httpx.HTTPError as exc:
+        raise _AuthUnavailable(str(exc)) from exc
+    if r.status_code >= 500 or r.status_code == 429:
+        raise _AuthUnavailable(f"Supabase Auth API returned {r.status_code}")
+    if r.status_code != 200:
+        return None
+    try:
         data = r.json()
-        user_id = data.get("id")
-        if not user_id:
-            return None
-        return CurrentUser(
-            auth_user_id=str(user_id),
-            claims={
-                "sub": user_id,
-                "email": data.get("email"),
-                "name": data.get("user_metadata", {}).get("full_name") or data.get("user_metadata", {}).get("name"),
-                **data.get("user_metadata", {}),
-            },
-        )
-    except Exception:
+    except ValueError:
+        return None
+    user_id = data.get("id")
+    if not user_id:
         return None
+    metadata = data.get("user_metadata") or {}
+    return CurrentUser(
+        auth_user_id=str(user_id),
+        claims={
+            "sub": user_id,
+            "email": data.get("email"),
+            "name": metadata.get("full_name") or metadata.get("name"),
+            **metadata,
+        },
+    )
 
-def decode_jwt_user_id_optional(token: str) -> str | None:
+def _token_key(token: str) -> bytes:
+    """Cache key: the token's SHA-256, so raw bearer tokens are never held as keys."""
+    return hashlib.sha256(token.encode()).digest()
+
+def _unverified_exp(token: str) -> float | None:
+    """exp claim of a token that has already been verified (by the Auth API)."""
+    try:
+        exp = jwt.decode(token, options={"verify_signature": False}).get("exp")
+        return float(exp) if exp is not None else None
+    except (jwt.InvalidTokenError, TypeError, ValueError):
+        return None
+
+def _cache_valid(key: bytes, current: CurrentUser, exp: float | None) -> None:
+    """Cache a verified user until the token's exp (at most VALID_TOKEN_MAX_TTL)."""
+    ttl = VALID_TOKEN_MAX_TTL
+    if exp is not None:
+        ttl = min(ttl, exp - time.time())
+    if ttl > 0:
+        token_cache.set(key, current, ttl=ttl)
+
+def _cache_invalid(key: bytes, error: AuthException) -> AuthException:
+    token_cache.set(key, error, ttl=INVALID_TOKEN_TTL)
+    return error
+
+def _verify_locally(token: str) -> CurrentUser | None:
     """
-    Decode JWT and return sub (user_id) or None if invalid/expired.
-    For middleware use only; does not raise.
+    HS256 decode with the legacy secret. Returns None when the secret is not set or the
+    token is not verifiable with it; raises AuthException for an expired token.
     """
-    if not token or not token.strip():
+    secret = settings.supabase_jwt_secret
+    if not secret:
         return None
     try:
         payload = jwt.decode(
-            token.strip(),
-            _get_jwt_secret(),
+            token,
+            secret,
             algorithms=["HS256"],
             options={"verify_aud": False},
         )
-        return payload.get("sub") or None
-    except Exception:
+    except jwt.ExpiredSignatureError:
+        raise AuthException(AuthErrorCode.AUTH_INVALID, "Token has expired")
+    except jwt.InvalidTokenError:
+        return None  # Fall through to API verification
+    sub = payload.get("sub")
+    if not sub:
         return None
+    return CurrentUser(auth_user_id=str(sub), claims=payload)
 
-def verify_jwt(token: str) -> CurrentUser:
+async def _verify_with_jwks(token: str, alg: str, kid: str | None) -> CurrentUser | None:
+    """
+    Verify an RS256/ES256 token against the cached JWKS. Returns None when no key is
+    known for kid (JWKS not configured or unreachable); raises AuthException when the
+    key is known and the token fails verification.
+    """
+    signing_key = await jwks_cache.get_key(kid)
+    if signing_key is None:
+        return None
+    try:
+        payload = jwt.decode(
+            token,
+            signing_key.key,
+            algorithms=[alg],
+            options={"verify_aud": False},
+        )
+    except jwt.ExpiredSignatureError:
+        raise AuthException(AuthErrorCode.AUTH_INVALID, "Token has expired")
+    except jwt.InvalidTokenError:
+        raise AuthException(AuthErrorCode.AUTH_INVALID, "Invalid authentication token")
+    sub = payload.get("sub")
+    if not sub:
+        raise AuthException(AuthErrorCode.AUTH_INVALID, "Invalid authentication token")
+    return CurrentUser(auth_user_id=str(sub), claims=payload)
+
+async def verify_jwt(token: str) -> CurrentUser:
     """
     Verify a Supabase-issued JWT and return a CurrentUser.
-    Tries local decode with JWT secret first; falls back to Supabase Auth API
-    when that fails (e.g. project uses JWKS/RS256 instead of legacy HS256 secret).
+    Verifies locally: RS256/ES256 tokens against the cached JWKS, others with the
+    legacy HS256 secret. Falls back to the Supabase Auth API only when neither can
+    decide (no secret, kid not in the JWKS). Results are cached by token hash: valid
+    tokens until exp, invalid ones for INVALID_TOKEN_TTL seconds.
     """
     if not token:
         raise AuthException(AuthErrorCode.AUTH_REQUIRED, "Authorization token is required")
 
-    # 1. Try local JWT decode with legacy secret (HS256)
-    secret = settings.supabase_jwt_secret
-    if secret:
-        try:
-            payload = jwt.decode(
-                token,
-                secret,
-                algorithms=["HS256"],
-                options={"verify_aud": False},
-            )
-            sub = payload.get("sub")
-            if sub:
-                return CurrentUser(auth_user_id=str(sub), claims=payload)
-        except jwt.ExpiredSignatureError:
-            raise AuthException(AuthErrorCode.AUTH_INVALID, "Token has expired")
-        except jwt.InvalidTokenError:
-            pass  # Fall through to API verification
-
-    # 2. Fallback: verify via Supabase Auth API (works for JWKS/RS256 and legacy)
-    current = _verify_via_supabase_api(token)
+    key = _token_key(token)
+    cached = token_cache.get(key)
+    if isinstance(cached, AuthException):
+        raise AuthException(cached.code, cached.message)
+    if cached is not None:
+        return cached
+
+    try:
+        header = jwt.get_unverified_header(token)
+    except jwt.InvalidTokenError:
+        raise _cache_invalid(key, AuthException(AuthErrorCode.AUTH_INVALID, "Invalid authentication token"))
+
+    # 1. Local verification: asymmetric keys (JWKS) or legacy secret (HS256)
+    alg = header.get("alg")
+    try:
+        if alg in ASYMMETRIC_ALGORITHMS:
+            current = await _verify_with_jwks(token, alg, header.get("kid"))
+        else:
+            current = _verify_locally(token)
+    except AuthException as exc:
+        raise _cache_invalid(key, exc)
+    if current:
+        _cache_valid(key, current, current.claims.get("exp"))
+        return current
+
+    # 2. Fallback: verify via Supabase Auth API (unknown kid, no secret configured)
+    try:
+        current = await _verify_via_supabase_api(token)
+    except _AuthUnavailable:
+        raise AuthException(AuthErrorCode.AUTH_INVALID, "Invalid authentication token")
     if current:
+        _cache_valid(key, current, _unverified_exp(token))
         return current
 
-    raise AuthException(AuthErrorCode.AUTH_INVALID, "Invalid authentication token")
+    raise _cache_invalid(key, AuthException(AuthErrorCode.AUTH_INVALID, "Invalid authentication token"))
@@ -1,12 +1,19 @@
 """
 Feed: all posts, excluding posts from users the current user has muted or blocked.
-No follow-based algo; content filters only.
+No follow-based algo; content filters only. Watchlist mode: posts mentioning any watched ticker.
 """
 from __future__ import annotations
-from typing import List, Optional, Tuple
+import heapq
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from uuid import UUID
+from sqlalchemy import or_, select, true
 from sqlalchemy.orm import Session
 from app.models.content_filter import ContentFilter
+from app.models.post import Post
+from app.models.post_ticker import PostTicker
+from app.models.user import User
+from app.models.watchlist_item import WatchlistItem
 from app.services.post_service import list_posts
 
 def _muted_and_blocked_user_ids(db: Session, user_id: UUID) -> List[UUID]:
@@ -38,3 +45,95 @@ def get_feed(
         current_user_id=current_user_id,
         exclude_user_ids=exclude if exclude else None,
     )
+
+def merge_timelines(
+    timelines: Iterable[List[Tuple[datetime, UUID]]],
+    limit: int,
+) -> List[Tuple[datetime, UUID]]:
+    """
+    k-way merge of per-ticker timelines, each already ordered (created_at DESC, id ASC).
+    Posts mentioning several tickers appear once. Returns at most limit keys in feed order.
+    """
+    merged = heapq.merge(*timelines, key=lambda k: (-k[0].timestamp(), k[1]))
+    keys: List[Tuple[datetime, UUID]] = []
+    seen: Set[UUID] = set()
+    for created_at, post_id in merged:
+        if post_id in seen:
+            continue
+        seen.add(post_id)
+        keys.append((created_at, post_id))
+        if len(keys) >= limit:
+            break
+    return keys
+
+def _watchlist_timelines(
+    db: Session,
+    user_id: UUID,
+    limit: int,
+    cursor: Optional[Tuple[datetime, UUID]],
+    exclude_user_ids: List[UUID],
+) -> List[List[Tuple[datetime, UUID]]]:
+    """
+    Head (up to limit keys past cursor) of each watched ticker's timeline, in one round trip:
+    a LATERAL subquery per watchlist row, each an index range scan on ix_post_tickers_ticker_timeline.
+    """
+    watched = (
+        select(WatchlistItem.ticker_id)
+        .where(WatchlistItem.user_id == user_id)
+        .subquery("watched")
+    )
+    head = (
+        select(PostTicker.post_created_at, PostTicker.post_id)
+        .where(PostTicker.ticker_id == watched.c.ticker_id, PostTicker.post_deleted_at.is_(None))
+        .order_by(PostTicker.post_created_at.desc(), PostTicker.post_id)
+        .limit(limit)
+    )
+    if cursor is not None:
+        created_at, post_id = cursor
+        head = head.where(
+            PostTicker.post_created_at <= created_at,
+            or_(PostTicker.post_created_at < created_at, PostTicker.post_id > post_id),
+        )
+    if exclude_user_ids:
+        head = head.join(Post, Post.id == PostTicker.post_id).where(
+            Post.user_id.notin_(exclude_user_ids)
+        )
+    head = head.lateral("head")
+    stmt = (
+        select(watched.c.ticker_id, head.c.post_created_at, head.c.post_id)
+        .select_from(watched.join(head, true()))
+        .order_by(watched.c.ticker_id, head.c.post_created_at.desc(), head.c.post_id)
+    )
+    timelines: Dict[UUID, List[Tuple[datetime, UUID]]] = {}
+    for ticker_id, created_at, post_id in db.execute(stmt):
+        timelines.setdefault(ticker_id, []).append((created_at, post_id))
+    return list(timelines.values())
+
+def get_watchlist_feed(
+    db: Session,
+    current_user_id: UUID,
+    per_page: int = 20,
+    cursor: Optional[Tuple[datetime, UUID]] = None,
+) -> Tuple[list, Optional[Tuple[datetime, UUID]]]:
+    """
+    Keyset page of posts mentioning any ticker on the user's watchlist, newest first,
+    excluding muted/blocked authors. cursor: (created_at, post_id) of the last post served.
+    Returns (list of (Post, User), next cursor or None when there are no more posts).
+    """
+    per_page = min(max(1, per_page), 50)
+    exclude = _muted_and_blocked_user_ids(db, current_user_id)
+    # per_page + 1 from every ticker is enough: the merged page can never need more from one.
+    timelines = _watchlist_timelines(db, current_user_id, per_page + 1, cursor, exclude)
+    keys = merge_timelines(timelines, per_page + 1)
+    next_key = keys[per_page - 1] if len(keys) > per_page else None
+    keys = keys[:per_page]
+    if not keys:
+        return [], None
+    post_ids = [post_id for _, post_id in keys]
+    found = {
+        p.id: (p, u)
+        for p, u in db.query(Post, User)
+        .join(User, Post.user_id == User.id)
+        .filter(Post.id.in_(post_ids))
+    }
+    return [found[pid] for pid in post_ids if pid in found], next_key
@@ -5,6 +5,7 @@ from dataclasses import dataclass
 from typing import Optional
 import httpx
 from fastapi import Request
+from app.services.telemetry import outbound_call
 
 logger = logging.getLogger("pageshare.geolocation")
 
@@ -50,10 +51,11 @@ async def lookup_ip(ip: str) -> Optional[GeoInfo]:
     headers = {"User-Agent": "PageShareBackend/1.0"}
 
     try:
-        async with httpx.AsyncClient(timeout=3.0) as client:
-            resp = await client.get(url, params=params, headers=headers)
-            resp.raise_for_status()
-            data = resp.json()
+        with outbound_call("ip-api"):
+            async with httpx.AsyncClient(timeout=3.0) as client:
+                resp = await client.get(url, params=params, headers=headers)
+                resp.raise_for_status()
+                data = resp.json()
     except Exception as exc:
         logger.warning("Geolocation lookup failed for %s: %s", ip, exc)
         return GeoInfo(ip=ip, ip_hash=ip_hash)
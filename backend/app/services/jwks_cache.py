@@ -0,0 +1,142 @@
+"""
+Supabase JWT signing keys (JWKS) for local RS256/ES256 verification.
+
+Keys come from SUPABASE_JWKS_URL (default: the project's /auth/v1/.well-known/jwks.json)
+or, for tests and air-gapped setups, from the JSON file SUPABASE_JWKS_FILE. They are
+fetched once and held in memory. A token whose kid is unknown triggers a re-fetch (key
+rotation), at most once per MIN_REFETCH_SECONDS. Keys older than REFRESH_SECONDS are
+refreshed in the background while the cached ones keep serving.
+"""
+from __future__ import annotations
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+import jwt
+from jwt import PyJWK
+from app.config import get_settings
+
+logger = logging.getLogger("pageshare.jwks")
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256")
+REFRESH_SECONDS = 600.0
+MIN_REFETCH_SECONDS = 60.0
+
+def _key_algorithm(jwk: Dict[str, Any]) -> Optional[str]:
+    """Signing algorithm of a JWK, or None for keys we do not verify with."""
+    alg = jwk.get("alg")
+    if alg is None:
+        if jwk.get("kty") == "RSA":
+            alg = "RS256"
+        elif jwk.get("kty") == "EC" and jwk.get("crv") == "P-256":
+            alg = "ES256"
+    return alg if alg in ASYMMETRIC_ALGORITHMS else None
+
+class JWKSCache:
+    """
+    kid -> public key map for one JWKS source. Lookups are dict reads; refreshes are
+    coalesced so concurrent requests with a new kid cause one fetch.
+    """
+
+    def __init__(
+        self,
+        url: str = "",
+        path: str = "",
+        fetch: Optional[Callable[[], Awaitable[Dict[str, Any]]]] = None,
+    ) -> None:
+        self.url = url
+        self.path = path
+        self._fetch_override = fetch
+        self._keys: Dict[str, PyJWK] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.loaded_at: Optional[float] = None
+        self.last_attempt: Optional[float] = None
+        self.fetches = 0
+        self.failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.url or self.path or self._fetch_override)
+
+    def load(self, document: Dict[str, Any]) -> None:
+        """Replace the keys with the usable RS256/ES256 keys of a JWKS document."""
+        keys: Dict[str, PyJWK] = {}
+        for jwk in document.get("keys") or []:
+            kid, alg = jwk.get("kid"), _key_algorithm(jwk)
+            if not kid or not alg or jwk.get("use", "sig") != "sig":
+                continue
+            try:
+                keys[kid] = PyJWK(jwk, algorithm=alg)
+            except jwt.PyJWKError as exc:
+                logger.warning("Skipping JWKS key %s: %s", kid, exc)
+        self._keys = keys
+        self.loaded_at = time.monotonic()
+
+    async def _fetch(self) -> Dict[str, Any]:
+        if self._fetch_override is not None:
+            return await self._fetch_override()
+        if self.path:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        from app.services.auth_service import _get_api_client
+        from app.services.telemetry import outbound_call
+
+        with outbound_call("supabase"):
+            r = await _get_api_client().get(self.url)
+            r.raise_for_status()
+        return r.json()
+
+    async def _refresh(self) -> None:
+        self.last_attempt = time.monotonic()
+        self.fetches += 1
+        try:
+            self.load(await self._fetch())
+            logger.info("JWKS loaded: %d signing keys", len(self._keys))
+        except Exception as exc:
+            self.failures += 1
+            logger.warning("JWKS refresh failed (keeping %d cached keys): %s", len(self._keys), exc)
+
+    def _start_refresh(self) -> asyncio.Task:
+        """Return the in-flight refresh on this event loop, starting one if needed."""
+        task = self._refresh_task
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = self._refresh_task = asyncio.ensure_future(self._refresh())
+        return task
+
+    async def refresh(self) -> None:
+        """Fetch the JWKS now (joining a refresh already in flight). Never raises."""
+        if self.enabled:
+            await asyncio.shield(self._start_refresh())
+
+    async def get_key(self, kid: Optional[str]) -> Optional[PyJWK]:
+        """Public key for kid, fetching the JWKS on first use or when kid is new."""
+        if not kid or not self.enabled:
+            return None
+        now = time.monotonic()
+        if self.loaded_at is None:
+            if self.last_attempt is None or now - self.last_attempt >= MIN_REFETCH_SECONDS:
+                await self.refresh()
+        elif now - self.loaded_at > REFRESH_SECONDS:
+            self._start_refresh()
+        key = self._keys.get(kid)
+        if key is None and self.last_attempt is not None and now - self.last_attempt >= MIN_REFETCH_SECONDS:
+            await self.refresh()
+            key = self._keys.get(kid)
+        return key
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "source": "file" if self.path else ("url" if self.enabled else None),
+            "keys": len(self._keys),
+            "age_seconds": round(time.monotonic() - self.loaded_at, 1) if self.loaded_at else None,
+            "fetches": self.fetches,
+            "failures": self.failures,
+        }
+
+_settings = get_settings()
+jwks_cache = JWKSCache(url=_settings.supabase_jwks_url, path=_settings.supabase_jwks_file)
+
+async def warm_jwks() -> None:
+    """Load the signing keys at startup; failures are logged and retried on first use."""
+    await jwks_cache.refresh()
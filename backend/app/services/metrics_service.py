@@ -1,16 +1,33 @@
 """
 Metrics service: DAU, MAU, engagement, growth, health, trending from materialized views and DB.
 """
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta, timezone
 from io import StringIO
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import csv
+import logging
+import threading
+import time
 from sqlalchemy import text, func
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.models.post import Post
 from app.models.error_log import ErrorLog
+from app.services.telemetry import aggregate_snapshot, summarize
 from app.services.ticker_service import get_trending_tickers
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger("pageshare.metrics")
+
+# Dashboard snapshot: kept warm by DashboardRefresher while admins are looking at it.
+DASHBOARD_CACHE_KEY = "dashboard"
+DASHBOARD_TTL_SECONDS = 120.0
+DASHBOARD_REFRESH_SECONDS = 60.0
+DASHBOARD_IDLE_SECONDS = 3600.0
+dashboard_cache = TTLCache(maxsize=1, ttl=DASHBOARD_TTL_SECONDS)
+_dashboard_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="dashboard")
+_dashboard_viewed_at: Optional[float] = None
 
 def get_daily_metrics(db: Session) -> Optional[Dict[str, Any]]:
     """Return latest row from daily_metrics materialized view (dau, mau, posts, new users)."""
@@ -74,8 +91,9 @@ def get_total_users(db: Session) -> int:
 
 def get_user_metrics(db: Session) -> Dict[str, Any]:
     """User metrics: DAU, MAU, total_users, new signups, active users from daily_metrics + users."""
-    total_users = get_total_users(db)
-    dm = get_daily_metrics(db)
+    return _user_metrics(get_total_users(db), get_daily_metrics(db))
+
+def _user_metrics(total_users: int, dm: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     if dm:
         return {
             "dau": dm["dau"],
@@ -106,8 +124,9 @@ def get_user_metrics(db: Session) -> Dict[str, Any]:
 
 def get_engagement_metrics_full(db: Session) -> Dict[str, Any]:
     """Engagement metrics from view + optional period breakdown from daily_metrics."""
-    em = get_engagement_metrics(db)
-    dm = get_daily_metrics(db)
+    return _engagement_metrics_full(get_engagement_metrics(db), get_daily_metrics(db))
+
+def _engagement_metrics_full(em: Optional[Dict[str, Any]], dm: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     out = {
         "total_posts": 0,
         "total_comments": 0,
@@ -133,87 +152,102 @@ def get_engagement_metrics_full(db: Session) -> Dict[str, Any]:
         }
     return out
 
+def get_growth_counts(db: Session) -> Dict[str, int]:
+    """
+    Users and posts created in the last 7/14/30/60 days: one query per table, each window a
+    FILTERed count over rows of the last 60 days.
+    """
+    today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    windows = {days: today_start - timedelta(days=days) for days in (7, 14, 30, 60)}
+
+    def counts_since(model) -> Tuple[int, ...]:
+        row = db.query(
+            *[func.count(model.id).filter(model.created_at >= since) for since in windows.values()]
+        ).filter(
+            model.deleted_at.is_(None),
+            model.created_at >= windows[60],
+        ).one()
+        return tuple(n or 0 for n in row)
+
+    counts: Dict[str, int] = {}
+    for prefix, model in (("users", User), ("posts", Post)):
+        for days, n in zip(windows, counts_since(model)):
+            counts[f"{prefix}_{days}d"] = n
+    return counts
+
 def get_growth_metrics(db: Session) -> Dict[str, Any]:
     """Growth: week-over-week and month-over-month from direct counts."""
-    now = datetime.now(timezone.utc)
-    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    week_ago = today_start - timedelta(days=7)
-    two_weeks_ago = today_start - timedelta(days=14)
-    month_ago = today_start - timedelta(days=30)
-    two_months_ago = today_start - timedelta(days=60)
-
-    def count_users_since(model_created_at_col, since: datetime) -> int:
-        return db.query(func.count(User.id)).filter(
-            User.deleted_at.is_(None),
-            model_created_at_col >= since,
-        ).scalar() or 0
-
-    def count_posts_since(since: datetime) -> int:
-        return db.query(func.count(Post.id)).filter(
-            Post.deleted_at.is_(None),
-            Post.created_at >= since,
-        ).scalar() or 0
-
-    users_this_week = count_users_since(User.created_at, week_ago)
-    users_last_week = count_users_since(User.created_at, two_weeks_ago) - users_this_week
-    users_this_month = count_users_since(User.created_at, month_ago)
-    users_last_month = count_users_since(User.created_at, two_months_ago) - users_this_month
-
-    posts_this_week = count_posts_since(week_ago)
-    posts_last_week = count_posts_since(two_weeks_ago) - posts_this_week
-    posts_this_month = count_posts_since(month_ago)
-    posts_last_month = count_posts_since(two_months_ago) - posts_this_month
-
-    def wow(current: int, previous: int) -> float:
-        if previous == 0:
-            return float(current) if current else 0.0
-        return round((current - previous) / previous, 4)
+    return _growth_metrics(get_growth_counts(db))
 
-    def mom(current: int, previous: int) -> float:
+def _growth_metrics(counts: Dict[str, int]) -> Dict[str, Any]:
+    def change(prefix: str, period: int) -> float:
+        current = counts[f"{prefix}_{period}d"]
+        previous = counts[f"{prefix}_{2 * period}d"] - current
         if previous == 0:
             return float(current) if current else 0.0
         return round((current - previous) / previous, 4)
 
     return {
         "user_growth": {
-            "week_over_week": wow(users_this_week, users_last_week),
-            "month_over_month": mom(users_this_month, users_last_month),
+            "week_over_week": change("users", 7),
+            "month_over_month": change("users", 30),
         },
         "content_growth": {
-            "week_over_week": wow(posts_this_week, posts_last_week),
-            "month_over_month": mom(posts_this_month, posts_last_month),
+            "week_over_week": change("posts", 7),
+            "month_over_month": change("posts", 30),
         },
         "engagement_growth": {"week_over_week": 0.0, "month_over_month": 0.0},
         "viral_coefficient": None,
     }
 
-def get_health_metrics(db: Session) -> Dict[str, Any]:
-    """Platform health: errors from error_logs, total_users; API/DB/storage placeholders."""
+def get_error_counts(db: Session) -> Dict[str, int]:
+    """Errors logged today: total, critical and resolved (one query)."""
     today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-    total_errors_today = db.query(func.count(ErrorLog.id)).filter(ErrorLog.created_at >= today_start).scalar() or 0
-    critical_today = db.query(func.count(ErrorLog.id)).filter(
-        ErrorLog.created_at >= today_start,
-        ErrorLog.severity == "critical",
-    ).scalar() or 0
-    resolved_today = db.query(func.count(ErrorLog.id)).filter(
-        ErrorLog.created_at >= today_start,
-        ErrorLog.resolved.is_(True),
-    ).scalar() or 0
-    total_users = get_total_users(db)
+    row = db.query(
+        func.count(ErrorLog.id),
+        func.count(ErrorLog.id).filter(ErrorLog.severity == "critical"),
+        func.count(ErrorLog.id).filter(ErrorLog.resolved.is_(True)),
+    ).filter(ErrorLog.created_at >= today_start).one()
     return {
-        "api": {
-            "response_time_avg_ms": None,
-            "error_rate": None,
-            "requests_today": None,
-        },
-        "database": {"query_time_avg_ms": None, "slow_queries_count": None},
+        "total_today": row[0] or 0,
+        "critical_today": row[1] or 0,
+        "resolved_today": row[2] or 0,
+    }
+
+def get_health_metrics(db: Session) -> Dict[str, Any]:
+    """
+    Platform health: request/query telemetry (all workers sharing METRICS_DIR, else this
+    worker), errors from error_logs, total_users; storage placeholders.
+    """
+    return {**_runtime_health(), "errors": get_error_counts(db), "total_users": get_total_users(db)}
+
+def _runtime_health() -> Dict[str, Any]:
+    """The in-process part of platform health (no DB): telemetry and cache stats."""
+    runtime = summarize(aggregate_snapshot())
+    return {
+        "api": runtime["api"],
+        "database": runtime["database"],
         "storage": {"usage_mb": None, "files_count": None},
-        "errors": {
-            "total_today": total_errors_today,
-            "critical_today": critical_today,
-            "resolved_today": resolved_today,
-        },
-        "total_users": total_users,
+        "caches": get_cache_metrics(),
+    }
+
+def get_cache_metrics() -> Dict[str, Any]:
+    """Hit rates and sizes of the in-process caches (this worker only)."""
+    from app.services.auth_service import token_cache
+    from app.services.jwks_cache import jwks_cache
+    from app.services.search_service import search_cache
+    from app.services.suggest_service import ticker_index, user_index
+    from app.services.ticker_cache import ticker_cache
+    from app.services.user_service import admin_role_cache
+
+    return {
+        "search_results": search_cache.stats(),
+        "auth_tokens": token_cache.stats(),
+        "admin_roles": admin_role_cache.stats(),
+        "jwks": jwks_cache.stats(),
+        "tickers": ticker_cache.stats(),
+        "suggest": {"users": user_index.stats(), "tickers": ticker_index.stats()},
+        "dashboard": dashboard_cache.stats(),
     }
 
 def get_most_active_users(db: Session, limit: int = 10) -> List[Dict[str, Any]]:
@@ -238,14 +272,14 @@ def get_most_active_users(db: Session, limit: int = 10) -> List[Dict[str, Any]]:
     return [{"username": r[0], "posts_count": r[1], "engagement_score": None} for r in rows]
 
 def get_trending_metrics(db: Session, limit: int = 10) -> Dict[str, Any]:
-    """Trending tickers (from view) + most active users."""
-    tickers = get_trending_tickers(db, limit=limit)
+    """Trending tickers (24h window from mention buckets) + most active users."""
+    tickers = get_trending_tickers(db, limit=limit, window="24h")
     trending_tickers = [
         {
             "symbol": t["symbol"],
-            "mentions": t["mention_count"],
+            "mentions": t["mentions_7d"],
             "mentions_24h": t["mentions_24h"],
-            "growth": None,
+            "growth": t["growth"],
         }
         for t in tickers
     ]
@@ -256,23 +290,93 @@ def get_trending_metrics(db: Session, limit: int = 10) -> Dict[str, Any]:
         "most_active_users": most_active,
     }
 
-def get_dashboard_metrics(db: Session) -> Dict[str, Any]:
-    """Combined dashboard: user, engagement, growth, health, trending."""
-    user_metrics = get_user_metrics(db)
-    engagement = get_engagement_metrics_full(db)
-    growth = get_growth_metrics(db)
-    health = get_health_metrics(db)
-    trending = get_trending_metrics(db, limit=10)
+def _dashboard_queries(limit: int) -> Dict[str, Callable[[Session], Any]]:
+    """Every DB read behind the dashboard, each once; they are independent of each other."""
+    return {
+        "daily": get_daily_metrics,
+        "engagement": get_engagement_metrics,
+        "total_users": get_total_users,
+        "growth": get_growth_counts,
+        "errors": get_error_counts,
+        "trending": lambda db: get_trending_metrics(db, limit=limit),
+    }
+
+def _query_in_own_session(session_factory: Callable[[], Session], query: Callable[[Session], Any]) -> Any:
+    with session_factory() as db:
+        return query(db)
+
+def compute_dashboard_metrics(
+    session_factory: Optional[Callable[[], Session]] = None,
+    limit: int = 10,
+) -> Dict[str, Any]:
+    """
+    Build the DB part of the dashboard: the queries of _dashboard_queries run concurrently,
+    each on its own (read replica) session. platform_health lacks the runtime telemetry,
+    which get_dashboard_metrics adds per request.
+    """
+    if session_factory is None:
+        from app.database import ReadSessionLocal
+
+        session_factory = ReadSessionLocal
+    futures = {
+        name: _dashboard_executor.submit(_query_in_own_session, session_factory, query)
+        for name, query in _dashboard_queries(limit).items()
+    }
+    results = {name: f.result() for name, f in futures.items()}
     return {
-        "user_metrics": user_metrics,
-        "engagement_metrics": engagement,
-        "growth_metrics": growth,
-        "platform_health": health,
-        "trending": trending,
+        "user_metrics": _user_metrics(results["total_users"], results["daily"]),
+        "engagement_metrics": _engagement_metrics_full(results["engagement"], results["daily"]),
+        "growth_metrics": _growth_metrics(results["growth"]),
+        "platform_health": {"errors": results["errors"], "total_users": results["total_users"]},
+        "trending": results["trending"],
         "geographic_distribution": [],
         "timestamp": datetime.now(timezone.utc),
     }
 
+def get_dashboard_metrics() -> Dict[str, Any]:
+    """
+    Combined dashboard: user, engagement, growth, health, trending. DB metrics come from the
+    cached snapshot (timestamp = when it was computed); runtime health is always current.
+    """
+    global _dashboard_viewed_at
+    _dashboard_viewed_at = time.monotonic()
+    snapshot = dashboard_cache.get_or_compute(DASHBOARD_CACHE_KEY, compute_dashboard_metrics)
+    return {**snapshot, "platform_health": {**_runtime_health(), **snapshot["platform_health"]}}
+
+class DashboardRefresher:
+    """
+    Background thread recomputing the dashboard snapshot every interval (under its TTL), so
+    page loads hit the cache. Idles while nobody has viewed the dashboard for idle_seconds.
+    """
+
+    def __init__(
+        self,
+        interval: float = DASHBOARD_REFRESH_SECONDS,
+        idle_seconds: float = DASHBOARD_IDLE_SECONDS,
+    ) -> None:
+        self._interval = interval
+        self._idle_seconds = idle_seconds
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="dashboard-refresh", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            if _dashboard_viewed_at is not None and time.monotonic() - _dashboard_viewed_at < self._idle_seconds:
+                self.refresh()
+
+    def refresh(self) -> None:
+        try:
+            dashboard_cache.set(DASHBOARD_CACHE_KEY, compute_dashboard_metrics())
+        except Exception:
+            logger.exception("Dashboard metrics refresh failed")
+
 def export_metrics(
     db: Session,
     format: str,
@@ -4,6 +4,7 @@ Page 1: 20 articles, page 2+: 10 articles.
 """
 from __future__ import annotations
 from typing import Any, List
+from app.services.telemetry import outbound_call
 
 VALID_CATEGORIES: tuple[str, ...] = (
     "all", "finance", "crypto", "politics", "business", "technology"
@@ -87,7 +88,7 @@ def fetch_news(
     )
 
     try:
-        with urllib.request.urlopen(url, timeout=15) as resp:
+        with outbound_call("gnews"), urllib.request.urlopen(url, timeout=15) as resp:
             data = json.loads(resp.read().decode())
     except Exception:
         return [], 0
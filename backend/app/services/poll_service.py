@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple
 from uuid import UUID
-from sqlalchemy import func
+from sqlalchemy import func, literal_column
 from sqlalchemy.orm import Session
 from app.models.poll import Poll
 from app.models.poll_vote import PollVote
@@ -72,6 +72,40 @@ def vote(
     results, total, _, _, _ = get_results(db, poll_id, user_id=None)
     return results, total
 
+def _results_for_polls(
+    db: Session,
+    polls: List[Poll],
+    user_id: Optional[UUID] = None,
+) -> Dict[UUID, Tuple[Dict[int, int], int, Optional[int], bool, datetime]]:
+    """
+    Batch get_results for already-loaded polls: one grouped query over all their votes
+    (per-option counts, plus whether user_id cast each option).
+    Returns map poll_id -> (results, total_votes, user_vote, is_finished, expires_at).
+    """
+    if not polls:
+        return {}
+    voted = func.bool_or(PollVote.user_id == user_id) if user_id else literal_column("false")
+    rows = (
+        db.query(PollVote.poll_id, PollVote.option_index, func.count(PollVote.id), voted)
+        .filter(PollVote.poll_id.in_([poll.id for poll in polls]))
+        .group_by(PollVote.poll_id, PollVote.option_index)
+    )
+    results: Dict[UUID, Dict[int, int]] = {poll.id: {} for poll in polls}
+    user_votes: Dict[UUID, int] = {}
+    for poll_id, option_index, n, by_user in rows:
+        results[poll_id][option_index] = n
+        if by_user:
+            user_votes[poll_id] = option_index
+    now = datetime.now(timezone.utc)
+    out = {}
+    for poll in polls:
+        counts = results[poll.id]
+        for i in range(len(poll.options) if poll.options else 0):
+            counts.setdefault(i, 0)
+        expires_at = _poll_expires_at(poll)
+        out[poll.id] = (counts, sum(counts.values()), user_votes.get(poll.id), now >= expires_at, expires_at)
+    return out
+
 def get_results(
     db: Session,
     poll_id: UUID,
@@ -83,31 +117,7 @@ def get_results(
     poll = get_poll_by_id(db, poll_id)
     if not poll:
         raise ValueError("Poll not found")
-    expires_at = _poll_expires_at(poll)
-    is_finished = datetime.now(timezone.utc) >= expires_at
-
-    rows = (
-        db.query(PollVote.option_index, func.count(PollVote.id))
-        .filter(PollVote.poll_id == poll_id)
-        .group_by(PollVote.option_index)
-    )
-    results = {r[0]: r[1] for r in rows}
-    n = len(poll.options) if poll.options else 0
-    for i in range(n):
-        results.setdefault(i, 0)
-    total = sum(results.values())
-
-    user_vote = None
-    if user_id:
-        v = (
-            db.query(PollVote.option_index)
-            .filter(PollVote.poll_id == poll_id, PollVote.user_id == user_id)
-            .first()
-        )
-        if v:
-            user_vote = v[0]
-
-    return results, total, user_vote, is_finished, expires_at
+    return _results_for_polls(db, [poll], user_id)[poll.id]
 
 def get_poll_info_for_post(
     db: Session,
@@ -121,7 +131,7 @@ def get_poll_info_for_post(
     poll = get_poll_by_post_id(db, post_id)
     if not poll:
         return None
-    results, total, user_vote, is_finished, expires_at = get_results(db, poll.id, user_id)
+    results, total, user_vote, is_finished, expires_at = _results_for_polls(db, [poll], user_id)[poll.id]
     return (str(poll.id), poll.options or [], results, total, user_vote, is_finished, expires_at)
 
 def get_poll_info_for_comment(
@@ -136,7 +146,7 @@ def get_poll_info_for_comment(
     poll = get_poll_by_comment_id(db, comment_id)
     if not poll:
         return None
-    results, total, user_vote, is_finished, expires_at = get_results(db, poll.id, user_id)
+    results, total, user_vote, is_finished, expires_at = _results_for_polls(db, [poll], user_id)[poll.id]
     return (str(poll.id), poll.options or [], results, total, user_vote, is_finished, expires_at)
 
 def get_polls_for_posts(
@@ -152,12 +162,11 @@ def get_polls_for_posts(
         .filter(Poll.post_id.in_(post_ids))
         .all()
     )
+    results_map = _results_for_polls(db, polls, user_id)
     out = {}
     for poll in polls:
         if poll.post_id:
-            results, total, user_vote, is_finished, expires_at = get_results(
-                db, poll.id, user_id
-            )
+            results, total, user_vote, is_finished, expires_at = results_map[poll.id]
             out[poll.post_id] = (
                 str(poll.id),
                 poll.options or [],
@@ -182,12 +191,11 @@ def get_polls_for_comments(
         .filter(Poll.comment_id.in_(comment_ids))
         .all()
     )
+    results_map = _results_for_polls(db, polls, user_id)
     out: Dict[UUID, tuple] = {}
     for poll in polls:
         if poll.comment_id:
-            results, total, user_vote, is_finished, expires_at = get_results(
-                db, poll.id, user_id
-            )
+            results, total, user_vote, is_finished, expires_at = results_map[poll.id]
             out[poll.comment_id] = (
                 str(poll.id),
                 poll.options or [],
@@ -2,79 +2,69 @@
 Post CRUD, ticker extraction, stats, soft delete.
 """
 from __future__ import annotations
+from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple
 from uuid import UUID
-from sqlalchemy import func, select
+from sqlalchemy import func, literal_column, or_, select, union_all
 from sqlalchemy.orm import Session
 from app.models.comment import Comment
 from app.models.poll import Poll
 from app.models.post import Post
+from app.models.post_ticker import PostTicker
 from app.models.reaction import Reaction
 from app.models.repost import Repost
 from app.models.user import User
-from app.services.ticker_service import link_post_tickers
+from app.services.ticker_service import get_tickers_by_ids, link_post_tickers, resolve_ticker_id
+from app.services.trending_service import uncount_post_mentions
 from app.utils.ticker_extractor import extract_tickers
 
 def _get_stats_for_posts(
     db: Session, post_ids: List[UUID]
 ) -> Dict[UUID, Tuple[int, int, int]]:
-    """Return map post_id -> (reaction_count, comment_count, repost_count)."""
+    """
+    Return map post_id -> (reaction_count, comment_count, repost_count).
+    One round trip: the three per-post counts are UNION ALLed, tagged by column.
+    """
     if not post_ids:
         return {}
-    out: Dict[UUID, Tuple[int, int, int]] = {pid: (0, 0, 0) for pid in post_ids}
-
-    # Reactions per post
-    r = (
-        db.query(Reaction.post_id, func.count(Reaction.id))
-        .filter(Reaction.post_id.in_(post_ids))
+    counts: Dict[UUID, List[int]] = {pid: [0, 0, 0] for pid in post_ids}
+    reactions = (
+        select(Reaction.post_id, literal_column("0"), func.count(Reaction.id))
+        .where(Reaction.post_id.in_(post_ids))
         .group_by(Reaction.post_id)
     )
-    for row in r:
-        out[row[0]] = (row[1], out[row[0]][1], out[row[0]][2])
-
-    # Comments per post (non-deleted)
-    c = (
-        db.query(Comment.post_id, func.count(Comment.id))
-        .filter(Comment.post_id.in_(post_ids), Comment.deleted_at.is_(None))
+    comments = (
+        select(Comment.post_id, literal_column("1"), func.count(Comment.id))
+        .where(Comment.post_id.in_(post_ids), Comment.deleted_at.is_(None))
         .group_by(Comment.post_id)
     )
-    for row in c:
-        out[row[0]] = (out[row[0]][0], row[1], out[row[0]][2])
-
-    # Reposts per post
-    rp = (
-        db.query(Repost.post_id, func.count(Repost.id))
-        .filter(Repost.post_id.in_(post_ids))
+    reposts = (
+        select(Repost.post_id, literal_column("2"), func.count(Repost.id))
+        .where(Repost.post_id.in_(post_ids))
         .group_by(Repost.post_id)
     )
-    for row in rp:
-        out[row[0]] = (out[row[0]][0], out[row[0]][1], row[1])
-
-    return out
+    for post_id, column, n in db.execute(union_all(reactions, comments, reposts)):
+        counts[post_id][column] = n
+    return {pid: tuple(c) for pid, c in counts.items()}
 
 def _get_user_interactions(
     db: Session, user_id: Optional[UUID], post_ids: List[UUID]
 ) -> Dict[UUID, Tuple[bool, bool]]:
-    """Return map post_id -> (liked, reposted)."""
+    """Return map post_id -> (liked, reposted), in one round trip."""
     if not user_id or not post_ids:
         return {pid: (False, False) for pid in post_ids}
 
-    liked = set(
-        r[0]
-        for r in db.query(Reaction.post_id).filter(
-            Reaction.user_id == user_id,
-            Reaction.post_id.in_(post_ids),
-        )
+    liked = select(Reaction.post_id, literal_column("0")).where(
+        Reaction.user_id == user_id,
+        Reaction.post_id.in_(post_ids),
     )
-    reposted = set(
-        r[0]
-        for r in db.query(Repost.post_id).filter(
-            Repost.user_id == user_id,
-            Repost.post_id.in_(post_ids),
-        )
+    reposted = select(Repost.post_id, literal_column("1")).where(
+        Repost.user_id == user_id,
+        Repost.post_id.in_(post_ids),
     )
+    found = {(pid, kind) for pid, kind in db.execute(union_all(liked, reposted))}
     return {
-        pid: (pid in liked, pid in reposted)
+        pid: ((pid, 0) in found, (pid, 1) in found)
         for pid in post_ids
     }
 
@@ -89,6 +79,7 @@ def create_post(
 ) -> Post:
     """
     Create a post, extract tickers from content, link post_tickers.
+    Post, poll and ticker links are committed together in one transaction.
     Optional poll: pass poll_options (2-4 items) and poll_duration_days (1-7) to attach a poll to the post.
     Content must be non-empty or media_urls/gif_url provided (caller/validator enforces).
     """
@@ -126,6 +117,84 @@ def get_post_by_id(db: Session, post_id: UUID) -> Optional[Post]:
         .first()
     )
 
+def _ticker_timeline_query(
+    db: Session,
+    ticker_id: UUID,
+    exclude_user_ids: Optional[List[UUID]] = None,
+):
+    """
+    (Post, User) rows for one ticker, driven by the post_tickers timeline index
+    (ticker_id, post_created_at DESC, post_id) WHERE post_deleted_at IS NULL.
+    """
+    q = (
+        db.query(Post, User)
+        .select_from(PostTicker)
+        .join(Post, Post.id == PostTicker.post_id)
+        .join(User, Post.user_id == User.id)
+        .filter(PostTicker.ticker_id == ticker_id, PostTicker.post_deleted_at.is_(None))
+    )
+    if exclude_user_ids:
+        q = q.filter(Post.user_id.notin_(exclude_user_ids))
+    return q.order_by(PostTicker.post_created_at.desc(), PostTicker.post_id)
+
+def list_ticker_posts(
+    db: Session,
+    ticker_symbol: str,
+    per_page: int = 20,
+    cursor: Optional[Tuple[datetime, UUID]] = None,
+    exclude_user_ids: Optional[List[UUID]] = None,
+) -> Tuple[List[Tuple[Post, User]], Optional[Tuple[datetime, UUID]]]:
+    """
+    Keyset page of posts mentioning a ticker, newest first.
+    cursor: (post_created_at, post_id) of the last post already served.
+    Returns (list of (post, author), next cursor or None when there are no more posts).
+    """
+    per_page = min(max(1, per_page), 50)
+    ticker_id = resolve_ticker_id(db, ticker_symbol)
+    if ticker_id is None:
+        return [], None
+    q = _ticker_timeline_query(db, ticker_id, exclude_user_ids)
+    if cursor is not None:
+        created_at, post_id = cursor
+        # Order is (post_created_at DESC, post_id ASC); the first bound keeps it an index range.
+        q = q.filter(
+            PostTicker.post_created_at <= created_at,
+            or_(PostTicker.post_created_at < created_at, PostTicker.post_id > post_id),
+        )
+    rows = q.limit(per_page + 1).all()
+    if len(rows) <= per_page:
+        return rows, None
+    rows = rows[:per_page]
+    last = rows[-1][0]
+    return rows, (last.created_at, last.id)
+
+def _list_ticker_posts_page(
+    db: Session,
+    ticker_symbol: str,
+    offset: int,
+    per_page: int,
+    user_id_filter: Optional[UUID],
+    exclude_user_ids: Optional[List[UUID]],
+) -> Tuple[List[Tuple[Post, User]], int]:
+    """Offset page of a ticker timeline (legacy page/per_page clients)."""
+    ticker_id = resolve_ticker_id(db, ticker_symbol)
+    if ticker_id is None:
+        return [], 0
+    q = _ticker_timeline_query(db, ticker_id, exclude_user_ids)
+    if user_id_filter is not None:
+        q = q.filter(Post.user_id == user_id_filter)
+    if user_id_filter is None and not exclude_user_ids:
+        # Index-only count over the partial timeline index; no join to posts.
+        total = (
+            db.query(func.count())
+            .select_from(PostTicker)
+            .filter(PostTicker.ticker_id == ticker_id, PostTicker.post_deleted_at.is_(None))
+            .scalar()
+        )
+    else:
+        total = q.order_by(None).count()
+    return q.offset(offset).limit(per_page).all(), total
+
 def list_posts(
     db: Session,
     page: int = 1,
@@ -143,6 +212,11 @@ def list_posts(
     per_page = min(max(1, per_page), 50)
     offset = (page - 1) * per_page
 
+    if ticker_symbol:
+        return _list_ticker_posts_page(
+            db, ticker_symbol, offset, per_page, user_id_filter, exclude_user_ids
+        )
+
     q = (
         db.query(Post, User)
         .join(User, Post.user_id == User.id)
@@ -152,15 +226,6 @@ def list_posts(
         q = q.filter(Post.user_id == user_id_filter)
     if exclude_user_ids:
         q = q.filter(Post.user_id.notin_(exclude_user_ids))
-    if ticker_symbol:
-        from app.models.post_ticker import PostTicker
-        from app.models.ticker import Ticker
-        subq = (
-            select(PostTicker.post_id)
-            .join(Ticker, PostTicker.ticker_id == Ticker.id)
-            .where(Ticker.symbol == ticker_symbol.strip().upper())
-        )
-        q = q.filter(Post.id.in_(subq))
 
     total = q.count()
     rows = q.order_by(Post.created_at.desc()).offset(offset).limit(per_page).all()
@@ -240,23 +305,35 @@ def delete_post(db: Session, post_id: UUID, owner_user_id: UUID) -> bool:
     post = db.query(Post).filter(Post.id == post_id, Post.deleted_at.is_(None)).first()
     if not post or post.user_id != owner_user_id:
         return False
-    from datetime import datetime, timezone
     post.deleted_at = datetime.now(timezone.utc)
     db.add(post)
+    uncount_post_mentions(db, post.id, post.created_at)
+    # Drop the post from ticker timelines (partial index excludes deleted rows).
+    db.query(PostTicker).filter(PostTicker.post_id == post.id).update(
+        {PostTicker.post_deleted_at: post.deleted_at}, synchronize_session=False
+    )
     db.commit()
     return True
 
-def get_post_tickers(db: Session, post_id: UUID) -> List[Tuple[str, Optional[str]]]:
-    """Return list of (symbol, name) for tickers linked to this post."""
-    from app.models.post_ticker import PostTicker
-    from app.models.ticker import Ticker
+def get_tickers_for_posts(db: Session, post_ids: List[UUID]) -> Dict[UUID, List[Tuple[str, Optional[str]]]]:
+    """Return map post_id -> list of (symbol, name) in one query. Symbol/name come from the ticker cache."""
+    if not post_ids:
+        return {}
     rows = (
-        db.query(Ticker.symbol, Ticker.name)
-        .join(PostTicker, PostTicker.ticker_id == Ticker.id)
-        .filter(PostTicker.post_id == post_id)
+        db.query(PostTicker.post_id, PostTicker.ticker_id)
+        .filter(PostTicker.post_id.in_(post_ids))
         .all()
     )
-    return [(r[0], r[1]) for r in rows]
+    tickers = get_tickers_by_ids(db, [tid for _, tid in rows])
+    out: Dict[UUID, List[Tuple[str, Optional[str]]]] = {pid: [] for pid in post_ids}
+    for pid, tid in rows:
+        if tid in tickers:
+            out[pid].append((tickers[tid].symbol, tickers[tid].name))
+    return out
+
+def get_post_tickers(db: Session, post_id: UUID) -> List[Tuple[str, Optional[str]]]:
+    """Return list of (symbol, name) for tickers linked to this post. Symbol/name come from the ticker cache."""
+    return get_tickers_for_posts(db, [post_id])[post_id]
 
 def get_post_stats(db: Session, post_id: UUID) -> Tuple[int, int, int]:
     """Return (reaction_count, comment_count, repost_count) for one post."""
@@ -0,0 +1,109 @@
+"""
+Prometheus text exposition (format 0.0.4) of a telemetry snapshot, for GET /metrics/prometheus.
+
+Rendered from telemetry.aggregate_snapshot(), so with METRICS_DIR set one scrape covers
+every worker; latencies are exported in seconds as cumulative histograms.
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+from app.services.telemetry import LATENCY_BUCKETS_MS, UNMATCHED_ROUTE
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+_PREFIX = "pageshare"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(labels: Dict[str, str], extra: Optional[Dict[str, str]] = None) -> str:
+    items = {**labels, **(extra or {})}
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in items.items()) + "}"
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Writer:
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+        self._declared: set = set()
+
+    def declare(self, name: str, kind: str, help_text: str) -> None:
+        if name not in self._declared:
+            self._declared.add(name)
+            self.lines.append(f"# HELP {name} {help_text}")
+            self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, labels: Dict[str, str], value: float) -> None:
+        self.lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+    def histogram_ms(self, name: str, help_text: str, labels: Dict[str, str], hist: Dict[str, Any]) -> None:
+        """Write a millisecond histogram dict as a seconds histogram with cumulative buckets."""
+        self.declare(name, "histogram", help_text)
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, hist["counts"]):
+            cumulative += count
+            self.lines.append(f"{name}_bucket{_labels(labels, {'le': repr(bound / 1000)})} {cumulative}")
+        self.lines.append(f"{name}_bucket{_labels(labels, {'le': '+Inf'})} {hist['count']}")
+        self.lines.append(f"{name}_sum{_labels(labels)} {_number(hist['sum'] / 1000)}")
+        self.lines.append(f"{name}_count{_labels(labels)} {hist['count']}")
+
+def render_prometheus(snapshot: Dict[str, Any]) -> str:
+    """Prometheus text for a (merged) telemetry snapshot."""
+    w = _Writer()
+    w.declare(f"{_PREFIX}_workers", "gauge", "Worker snapshots included in this scrape.")
+    w.sample(f"{_PREFIX}_workers", {}, snapshot.get("workers", 1))
+
+    for label, s in sorted(snapshot["routes"].items()):
+        method, _, route = label.partition(" ")
+        labels = {"method": method, "route": route or UNMATCHED_ROUTE}
+        w.histogram_ms(f"{_PREFIX}_http_request_duration_seconds", "HTTP request latency by route template.", labels, s["latency"])
+    for key, name, help_text in (
+        ("errors", "http_request_errors_total", "HTTP responses with status >= 500."),
+        ("queries", "http_request_db_queries_total", "SQL statements run by requests."),
+    ):
+        for label, s in sorted(snapshot["routes"].items()):
+            method, _, route = label.partition(" ")
+            w.declare(f"{_PREFIX}_{name}", "counter", help_text)
+            w.sample(f"{_PREFIX}_{name}", {"method": method, "route": route or UNMATCHED_ROUTE}, s[key])
+
+    w.histogram_ms(f"{_PREFIX}_db_query_duration_seconds", "SQL statement latency.", {}, snapshot["queries"])
+    w.declare(f"{_PREFIX}_db_slow_queries_total", "counter", "SQL statements slower than SLOW_QUERY_MS.")
+    w.sample(f"{_PREFIX}_db_slow_queries_total", {}, snapshot["slow_queries"]["count"])
+
+    for key, help_text in (
+        ("size", "Configured pool size."),
+        ("checked_out", "Connections currently checked out."),
+        ("checked_in", "Idle connections in the pool."),
+        ("overflow", "Connections open beyond the pool size."),
+    ):
+        for engine, pool in sorted(snapshot.get("pools", {}).items()):
+            w.declare(f"{_PREFIX}_db_pool_{key}", "gauge", help_text)
+            w.sample(f"{_PREFIX}_db_pool_{key}", {"engine": engine}, pool[key])
+
+    caches = sorted(snapshot.get("caches", {}).items())
+    for key, kind, help_text in (
+        ("hits", "counter", "Cache lookups served from memory."),
+        ("misses", "counter", "Cache lookups that had to compute or load."),
+        ("size", "gauge", "Entries currently cached."),
+    ):
+        name = f"{_PREFIX}_cache_{key}_total" if kind == "counter" else f"{_PREFIX}_cache_{key}"
+        for cache, c in caches:
+            w.declare(name, kind, help_text)
+            w.sample(name, {"cache": cache}, c[key])
+    for cache, c in caches:
+        lookups = c["hits"] + c["misses"]
+        w.declare(f"{_PREFIX}_cache_hit_ratio", "gauge", "Hits over lookups since worker start.")
+        w.sample(f"{_PREFIX}_cache_hit_ratio", {"cache": cache}, round(c["hits"] / lookups, 4) if lookups else 0.0)
+
+    for service, o in sorted(snapshot.get("outbound", {}).items()):
+        w.histogram_ms(
+            f"{_PREFIX}_outbound_request_duration_seconds",
+            "Outbound HTTP call latency by service.",
+            {"service": service},
+            o["latency"],
+        )
+    for service, o in sorted(snapshot.get("outbound", {}).items()):
+        w.declare(f"{_PREFIX}_outbound_request_errors_total", "counter", "Outbound HTTP calls that failed.")
+        w.sample(f"{_PREFIX}_outbound_request_errors_total", {"service": service}, o["errors"])
+    return "\n".join(w.lines) + "\n"
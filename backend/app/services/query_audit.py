@@ -0,0 +1,137 @@
+"""
+N+1 detection and per-endpoint SQL statement budgets.
+
+Each statement is reduced to its shape (literals, bind parameters and IN lists collapsed)
+and attributed to the innermost app/ or tests/ frame that ran it, so a loop issuing one
+query per row shows up as one shape with a high count and the line responsible.
+
+- Tests: the count_queries fixture (tests/conftest.py) records a block and fails it when
+  it runs more statements than its budget.
+- Dev mode (QUERY_AUDIT=1): the request middleware keeps a QueryLog per request and logs
+  a warning with the report when the route exceeds QUERY_BUDGETS or repeats a shape
+  REPEAT_THRESHOLD times.
+"""
+from __future__ import annotations
+import logging
+import os
+import re
+import sys
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import BASE_DIR
+
+logger = logging.getLogger("pageshare.query_audit")
+
+# Max statements per request, by route label (telemetry.route_label). Hydrating a page is
+# a fixed number of set-based queries, so these hold at any per_page.
+QUERY_BUDGETS: Dict[str, int] = {
+    "GET /api/v1/feed": 10,
+    "GET /api/v1/posts": 12,
+    "GET /api/v1/search": 12,
+    "GET /api/v1/users/{user_id}/likes": 11,
+    "GET /api/v1/users/{user_id}/replies": 11,
+}
+# A shape run this many times in one request is reported as a likely N+1.
+REPEAT_THRESHOLD = 3
+
+_SOURCE_ROOTS = tuple(str(BASE_DIR / d) + os.sep for d in ("app", "tests"))
+_SKIP_FILES = frozenset({__file__, str(BASE_DIR / "app" / "services" / "telemetry.py")})
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PARAM = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+|\?")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+
+
+def statement_shape(statement: str) -> str:
+    """Statement with whitespace collapsed and every literal, parameter and value list as ?."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _STRING.sub("?", shape)
+    shape = _PARAM.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    return _LIST.sub("?", shape)
+
+
+def _call_site() -> str:
+    """Innermost frame in app/ or tests/ (outside this module and telemetry): "path:line in func"."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_SOURCE_ROOTS) and filename not in _SKIP_FILES:
+            return f"{os.path.relpath(filename, BASE_DIR)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "<unknown>"
+
+
+class QueryLog:
+    """Statements run during one request or test block, grouped by shape and call site."""
+
+    def __init__(self) -> None:
+        self._shapes: Dict[str, Counter] = {}
+        self.count = 0
+
+    def record(self, statement: str) -> None:
+        shape = statement_shape(statement)
+        sites = self._shapes.get(shape)
+        if sites is None:
+            sites = self._shapes[shape] = Counter()
+        sites[_call_site()] += 1
+        self.count += 1
+
+    def by_shape(self) -> List[Tuple[str, int, Counter]]:
+        """(shape, count, call sites) most repeated first."""
+        grouped = [(shape, sum(sites.values()), sites) for shape, sites in self._shapes.items()]
+        return sorted(grouped, key=lambda g: -g[1])
+
+    def repeated(self, threshold: int = REPEAT_THRESHOLD) -> List[Tuple[str, int, Counter]]:
+        return [g for g in self.by_shape() if g[1] >= threshold]
+
+    def report(self, shape_chars: int = 160) -> str:
+        lines = [f"{self.count} statements, {len(self._shapes)} distinct:"]
+        for shape, n, sites in self.by_shape():
+            text = shape if len(shape) <= shape_chars else shape[:shape_chars] + "..."
+            lines.append(f"  {n}x {text}")
+            lines.extend(f"      {k}x at {site}" for site, k in sites.most_common())
+        return "\n".join(lines)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request or test block ran more statements than its budget."""
+
+
+def check_budget(log: QueryLog, budget: int, label: str = "block") -> None:
+    """Raise QueryBudgetExceeded, with the grouped report, if log has more than budget statements."""
+    if log.count > budget:
+        raise QueryBudgetExceeded(f"{label} ran {log.count} SQL statements (budget {budget}); {log.report()}")
+
+
+@contextmanager
+def record_queries(target=Engine) -> Iterator[QueryLog]:
+    """Record every statement run on target (an Engine, or the Engine class for all engines)."""
+    log = QueryLog()
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        log.record(statement)
+
+    event.listen(target, "before_cursor_execute", _record)
+    try:
+        yield log
+    finally:
+        event.remove(target, "before_cursor_execute", _record)
+
+
+def audit_request(route: str, log: Optional[QueryLog]) -> None:
+    """Dev mode: log requests over their route's budget or with repeated statement shapes."""
+    if log is None:
+        return
+    budget = QUERY_BUDGETS.get(route)
+    over = budget is not None and log.count > budget
+    if over or log.repeated():
+        logger.warning(
+            "QUERY AUDIT %s: %d statements (budget %s)\n%s",
+            route, log.count, budget if budget is not None else "-", log.report(),
+        )
@@ -1,30 +1,129 @@
 """
 Recent searches: list, add, remove. Per-user, backend source of truth.
+
+Adding is one statement: an upsert on (user_id, type, result_id) that bumps created_at,
+with a CTE that trims the user's older rows beyond MAX_RECENT. Lists are one read of the
+(user_id, created_at) index, so they are not cached: a cache would go stale in every other
+worker after a write.
 """
 from __future__ import annotations
-from typing import List, Tuple
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Tuple
 from uuid import UUID
+from sqlalchemy import and_, delete, func, not_, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from app.models.recent_search import RecentSearch
 
 VALID_TYPES = ("account", "ticker")
 MAX_RECENT = 20
+MAX_LIST_LIMIT = 50
+
+
+@dataclass(frozen=True)
+class RecentSearchEntry:
+    """Immutable snapshot of one recent_searches row (safe to share across requests)."""
+
+    id: UUID
+    type: str
+    result_id: str
+    query: str
+    result_display_name: Optional[str]
+    result_image_url: Optional[str]
+    created_at: datetime
+
+
+def _entry(row: RecentSearch) -> RecentSearchEntry:
+    return RecentSearchEntry(
+        row.id,
+        row.type,
+        row.result_id,
+        row.query,
+        row.result_display_name,
+        row.result_image_url,
+        row.created_at,
+    )
+
+
+def _load_recent_searches(db: Session, user_id: UUID, limit: int) -> Tuple[RecentSearchEntry, ...]:
+    rows = db.execute(
+        select(
+            RecentSearch.id,
+            RecentSearch.type,
+            RecentSearch.result_id,
+            RecentSearch.query,
+            RecentSearch.result_display_name,
+            RecentSearch.result_image_url,
+            RecentSearch.created_at,
+        )
+        .where(RecentSearch.user_id == user_id)
+        .order_by(RecentSearch.created_at.desc(), RecentSearch.id.desc())
+        .limit(limit)
+    )
+    return tuple(RecentSearchEntry(*r) for r in rows)
 
 
 def list_recent_searches(
     db: Session,
     user_id: UUID,
     limit: int = MAX_RECENT,
-) -> List[RecentSearch]:
+) -> List[RecentSearchEntry]:
     """Return user's recent searches, newest first. Capped at limit."""
-    limit = min(max(1, limit), 50)
-    return (
-        db.query(RecentSearch)
-        .filter(RecentSearch.user_id == user_id)
-        .order_by(RecentSearch.created_at.desc())
-        .limit(limit)
-        .all()
+    limit = min(max(1, limit), MAX_LIST_LIMIT)
+    return list(_load_recent_searches(db, user_id, limit))
+
+
+def upsert_recent_search_statement(
+    user_id: UUID,
+    type: str,
+    result_id: str,
+    query: str,
+    result_display_name: Optional[str],
+    result_image_url: Optional[str],
+):
+    """
+    INSERT ... ON CONFLICT (user_id, type, result_id) DO UPDATE ... RETURNING, with a
+    DELETE CTE keeping the user's newest MAX_RECENT - 1 other rows. CTEs share one
+    snapshot, so the trim ranks the rows that existed before this statement, excluding
+    the one being upserted; together with it the user ends up with MAX_RECENT rows.
+    """
+    ranked = (
+        select(
+            RecentSearch.id,
+            func.row_number()
+            .over(order_by=(RecentSearch.created_at.desc(), RecentSearch.id.desc()))
+            .label("rn"),
+        )
+        .where(
+            RecentSearch.user_id == user_id,
+            not_(and_(RecentSearch.type == type, RecentSearch.result_id == result_id)),
+        )
+        .subquery("ranked")
+    )
+    trim = (
+        delete(RecentSearch)
+        .where(RecentSearch.id.in_(select(ranked.c.id).where(ranked.c.rn >= MAX_RECENT)))
+        .cte("trimmed")
     )
+    stmt = insert(RecentSearch).values(
+        user_id=user_id,
+        type=type,
+        result_id=result_id,
+        query=query,
+        result_display_name=result_display_name,
+        result_image_url=result_image_url,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[RecentSearch.user_id, RecentSearch.type, RecentSearch.result_id],
+        set_={
+            "query": stmt.excluded.query,
+            "result_display_name": stmt.excluded.result_display_name,
+            "result_image_url": stmt.excluded.result_image_url,
+            "created_at": func.now(),
+        },
+    )
+    return stmt.add_cte(trim).returning(RecentSearch)
 
 
 def add_recent_search(
@@ -35,10 +134,11 @@ def add_recent_search(
     query: str,
     result_display_name: str | None = None,
     result_image_url: str | None = None,
-) -> RecentSearch:
+) -> RecentSearchEntry:
     """
-    Add or refresh a recent search. If same user_id + type + result_id exists,
-    remove the old one and add new (so it moves to top). Then trim to MAX_RECENT.
+    Add or refresh a recent search. If same user_id + type + result_id exists, it is
+    updated and moved to the top. Older rows beyond MAX_RECENT are trimmed in the
+    same statement.
     """
     type_lower = (type or "").strip().lower()
     if type_lower not in VALID_TYPES:
@@ -46,40 +146,18 @@ def add_recent_search(
     result_id = (result_id or "").strip()
     query = (query or "").strip() or result_id
 
-    # Remove existing same (user, type, result_id)
-    db.query(RecentSearch).filter(
-        RecentSearch.user_id == user_id,
-        RecentSearch.type == type_lower,
-        RecentSearch.result_id == result_id,
-    ).delete(synchronize_session=False)
-
-    row = RecentSearch(
-        user_id=user_id,
-        type=type_lower,
-        result_id=result_id,
-        query=query,
-        result_display_name=result_display_name or None,
-        result_image_url=result_image_url or None,
+    stmt = upsert_recent_search_statement(
+        user_id,
+        type_lower,
+        result_id,
+        query,
+        result_display_name or None,
+        result_image_url or None,
     )
-    db.add(row)
-    db.flush()
-
-    # Trim: keep only MAX_RECENT per user (by created_at desc)
-    all_ids = [
-        r.id
-        for r in db.query(RecentSearch)
-        .filter(RecentSearch.user_id == user_id)
-        .order_by(RecentSearch.created_at.desc())
-        .all()
-    ]
-    if len(all_ids) > MAX_RECENT:
-        to_delete = all_ids[MAX_RECENT:]
-        db.query(RecentSearch).filter(RecentSearch.id.in_(to_delete)).delete(
-            synchronize_session=False
-        )
+    row = db.scalars(stmt, execution_options={"populate_existing": True}).one()
+    entry = _entry(row)
     db.commit()
-    db.refresh(row)
-    return row
+    return entry
 
 
 def remove_recent_search(db: Session, user_id: UUID, search_id: UUID) -> bool:
@@ -1,12 +1,60 @@
 """
-Unified search: users and tickers only (no posts). ILIKE on username/display_name, symbol/name.
+Unified search. Users and tickers: exact match, then prefix match, then pg_trgm similarity
+on username/display_name, symbol/name (indexes: migration 0007); totals are capped at
+TOTAL_CAP so no query scans every match. Posts: full-text match on the generated
+content_tsv column (GIN index, migration 0008), ordered by ts_rank, keyset paginated.
 """
 from __future__ import annotations
-from typing import List, Optional, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
+from sqlalchemy import Float, and_, case, cast, func, literal, or_, select, union
 from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.models.post import Post
 from app.models.ticker import Ticker
 from app.models.user import User
+from app.utils.cache import TTLCache
+
+# Trigrams need at least 3 characters; shorter queries are prefix-only (btree).
+TRGM_MIN_LEN = 3
+# Max candidates ranked per query, and the largest total reported.
+TOTAL_CAP = 1000
+# Extra sub-searches of a federated search run in parallel, each on its own connection. At
+# most half the DB pool is used that way, so request handlers keep theirs; a sub-search that
+# finds no free slot runs on the request's own session instead of waiting for one.
+FEDERATED_WORKERS = max(1, (get_settings().db_pool_size + get_settings().db_max_overflow) // 2)
+_federated_executor = ThreadPoolExecutor(max_workers=FEDERATED_WORKERS, thread_name_prefix="search")
+_federated_slots = threading.BoundedSemaphore(FEDERATED_WORKERS)
+# Users/tickers results do not depend on the caller; a few hot queries ("btc", "nvda")
+# dominate traffic, so results are shared briefly and concurrent misses run once.
+search_cache = TTLCache(maxsize=1024, ttl=30.0)
+
+def search_cache_key(q: str, type_: str, page: int, per_page: int) -> tuple:
+    """Cache key: query lowercased with whitespace collapsed (searches are case-insensitive)."""
+    return (" ".join(q.lower().split()), type_, page, per_page)
+
+def _like_escape(term: str) -> str:
+    """Escape LIKE wildcards so user input matches literally (ESCAPE '\\')."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _ranked_page(db: Session, model, candidates, tier, similarity, tiebreak, page: int, per_page: int):
+    """
+    Page of model rows whose ids are in candidates (a union of capped id selects),
+    ordered by tier, similarity DESC, tiebreak. Returns (rows, capped total).
+    """
+    cand = candidates.subquery("candidates")
+    total = db.execute(select(func.count()).select_from(cand)).scalar_one()
+    rows = (
+        db.query(model)
+        .join(cand, cand.c.id == model.id)
+        .order_by(tier, similarity.desc(), tiebreak)
+        .offset((page - 1) * per_page)
+        .limit(per_page)
+        .all()
+    )
+    return rows, min(total, TOTAL_CAP)
 
 def search_users(
     db: Session,
@@ -15,24 +63,50 @@ def search_users(
     per_page: int = 20,
 ) -> Tuple[List[User], int]:
     """
-    Search users by username or display_name (ILIKE). Exclude soft-deleted.
-    Returns (list of User, total_count).
+    Search users by username or display_name. Exclude soft-deleted.
+    Exact matches first, then prefix matches, then by trigram similarity.
+    Returns (list of User, total_count capped at TOTAL_CAP).
     """
     if not q or not q.strip():
         return [], 0
     per_page = min(max(1, per_page), 50)
-    offset = (page - 1) * per_page
-    term = f"%{q.strip()}%"
-    query = (
-        db.query(User)
-        .filter(User.deleted_at.is_(None))
-        .filter(
-            (User.username.ilike(term)) | (User.display_name.ilike(term))
-        )
+    term = q.strip().lower()
+    prefix = f"{_like_escape(term)}%"
+    display_lower = func.lower(User.display_name)
+    live = User.deleted_at.is_(None)
+
+    # Exact matches always make it in; a busy prefix keeps its TOTAL_CAP shortest names.
+    exact = select(User.id).where(live, or_(User.username == term, display_lower == term))
+    prefixed = (
+        select(User.id)
+        .where(live, or_(User.username.like(prefix, escape="\\"), display_lower.like(prefix, escape="\\")))
+        .order_by(func.length(User.username), User.username)
+        .limit(TOTAL_CAP)
     )
-    total = query.count()
-    rows = query.order_by(User.username).offset(offset).limit(per_page).all()
-    return rows, total
+    candidates = union(exact, prefixed)
+    if len(term) >= TRGM_MIN_LEN:
+        contains = f"%{_like_escape(term)}%"
+        fuzzy = select(User.id).where(
+            live,
+            or_(
+                User.username.ilike(contains, escape="\\"),
+                User.display_name.ilike(contains, escape="\\"),
+                User.username.op("%")(term),
+                User.display_name.op("%")(term),
+            ),
+        ).limit(TOTAL_CAP)
+        candidates = union(exact, prefixed, fuzzy)
+
+    tier = case(
+        (or_(User.username == term, display_lower == term), 0),
+        (or_(User.username.like(prefix, escape="\\"), display_lower.like(prefix, escape="\\")), 1),
+        else_=2,
+    )
+    similarity = func.greatest(
+        func.similarity(User.username, literal(term)),
+        func.similarity(User.display_name, literal(term)),
+    )
+    return _ranked_page(db, User, candidates, tier, similarity, User.username, page, per_page)
 
 def search_tickers(
     db: Session,
@@ -41,17 +115,119 @@ def search_tickers(
     per_page: int = 20,
 ) -> Tuple[List[Tuple[str, Optional[str], Optional[str]]], int]:
     """
-    Search tickers by symbol or name (ILIKE). Returns (list of (symbol, name, type), total_count).
+    Search tickers by symbol or name. Exact symbol first, then symbol prefix, then by
+    trigram similarity. Returns (list of (symbol, name, type), total_count capped at TOTAL_CAP).
     """
     if not q or not q.strip():
         return [], 0
-    from sqlalchemy import or_
     per_page = min(max(1, per_page), 50)
-    offset = (page - 1) * per_page
-    term = f"%{q.strip()}%"
-    query = db.query(Ticker).filter(
-        or_(Ticker.symbol.ilike(term), Ticker.name.ilike(term))
+    term = q.strip()
+    symbol = term.upper()
+    prefix = f"{_like_escape(symbol)}%"
+
+    exact = select(Ticker.id).where(Ticker.symbol == symbol)
+    prefixed = (
+        select(Ticker.id)
+        .where(Ticker.symbol.like(prefix, escape="\\"))
+        .order_by(func.length(Ticker.symbol), Ticker.symbol)
+        .limit(TOTAL_CAP)
     )
-    total = query.count()
-    rows = query.order_by(Ticker.symbol).offset(offset).limit(per_page).all()
+    candidates = union(exact, prefixed)
+    if len(term) >= TRGM_MIN_LEN:
+        contains = f"%{_like_escape(term)}%"
+        fuzzy = select(Ticker.id).where(
+            or_(
+                Ticker.symbol.ilike(contains, escape="\\"),
+                Ticker.name.ilike(contains, escape="\\"),
+                Ticker.name.op("%")(term),
+            ),
+        ).limit(TOTAL_CAP)
+        candidates = union(exact, prefixed, fuzzy)
+
+    tier = case(
+        (Ticker.symbol == symbol, 0),
+        (Ticker.symbol.like(prefix, escape="\\"), 1),
+        else_=2,
+    )
+    similarity = func.greatest(
+        func.similarity(Ticker.symbol, literal(symbol)),
+        func.coalesce(func.similarity(Ticker.name, literal(term)), 0),
+    )
+    rows, total = _ranked_page(db, Ticker, candidates, tier, similarity, Ticker.symbol, page, per_page)
     return [(r.symbol, r.name, r.type) for r in rows], total
+
+def search_posts(
+    db: Session,
+    q: str,
+    per_page: int = 20,
+    cursor: Optional[Tuple[float, UUID]] = None,
+    exclude_user_ids: Optional[List[UUID]] = None,
+) -> Tuple[List[Tuple[Post, User]], Optional[Tuple[float, UUID]]]:
+    """
+    Full-text search over live posts (websearch syntax: quotes, OR, -word), best ts_rank first.
+    cursor: (rank, post_id) of the last post already served.
+    exclude_user_ids: exclude posts from these user ids (e.g. muted/blocked).
+    Returns (list of (post, author), next cursor or None when there are no more posts).
+    """
+    if not q or not q.strip():
+        return [], None
+    per_page = min(max(1, per_page), 50)
+    tsquery = func.websearch_to_tsquery("english", q.strip())
+    # ts_rank is real (float4); the cursor's rank is a Python float (float8). Compare both as
+    # float8, or float4 values would never equal their widened cursor copy at page boundaries.
+    rank = cast(func.ts_rank(Post.content_tsv, tsquery), Float(precision=53))
+    query = (
+        db.query(Post, User, rank.label("rank"))
+        .join(User, Post.user_id == User.id)
+        .filter(Post.deleted_at.is_(None), Post.content_tsv.op("@@")(tsquery))
+    )
+    if exclude_user_ids:
+        query = query.filter(Post.user_id.notin_(exclude_user_ids))
+    if cursor is not None:
+        last_rank, last_id = cursor
+        last_rank = cast(literal(last_rank), Float(precision=53))
+        query = query.filter(or_(rank < last_rank, and_(rank == last_rank, Post.id > last_id)))
+    rows = query.order_by(rank.desc(), Post.id).limit(per_page + 1).all()
+    next_key = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        next_key = (rows[-1].rank, rows[-1][0].id)
+    return [(p, u) for p, u, _ in rows], next_key
+
+def _search_in_own_session(search, q: str, page: int, per_page: int):
+    from app.database import ReadSessionLocal
+
+    with ReadSessionLocal() as db:
+        return search(db, q, page=page, per_page=per_page)
+
+def federated_search(
+    db: Session,
+    q: str,
+    types: Sequence[str],
+    page: int = 1,
+    per_page: Optional[Dict[str, int]] = None,
+) -> Dict[str, Tuple[list, int]]:
+    """
+    Run the user and/or ticker searches for q. per_page: limit per type (default 20).
+    The first type runs on db in the calling thread; each further type runs concurrently on
+    its own (read replica) connection when a federated slot is free, else after it on db. So
+    type=all costs the slower search instead of the sum of both, and under load it degrades
+    to the sequential cost instead of queueing behind other searches.
+    Returns map type -> (rows, capped total) as returned by search_users / search_tickers.
+    """
+    searches = {"users": search_users, "tickers": search_tickers}
+    limits = {t: (per_page or {}).get(t, 20) for t in types}
+    first, *rest = types
+    futures = {}
+    for t in rest:
+        if _federated_slots.acquire(blocking=False):
+            future = _federated_executor.submit(_search_in_own_session, searches[t], q, page, limits[t])
+            future.add_done_callback(lambda _: _federated_slots.release())
+            futures[t] = future
+    results = {first: searches[first](db, q, page=page, per_page=limits[first])}
+    for t in rest:
+        if t in futures:
+            results[t] = futures[t].result()
+        else:
+            results[t] = searches[t](db, q, page=page, per_page=limits[t])
+    return results
@@ -3,16 +3,21 @@ User session and activity tracking.
 - create_session: one row per login (session_end = NULL until logout or stale cleanup).
 - end_session: set session_end when user logs out.
 - close_stale_sessions: mark sessions older than inactivity threshold as ended.
-- touch_user_activity: update users.last_active_at only (no user_sessions).
+- touch_users_activity: batch-update users.last_active_at only (no user_sessions); fed by
+  the write-behind buffer in activity_buffer.
 """
 from datetime import datetime, timezone, timedelta
-from typing import Optional
+from typing import Mapping, Optional
 from uuid import UUID
+from sqlalchemy import DateTime, column, or_, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.models.user_session import UserSession
 
 INACTIVITY_MINUTES = 30
+# last_active_at is not rewritten when the stored value is at most this old.
+ACTIVITY_RESOLUTION = timedelta(minutes=1)
 
 def create_session(
     db: Session,
@@ -90,18 +95,33 @@ def close_stale_sessions(db: Session) -> int:
     db.commit()
     return result
 
-def touch_user_activity(
-    db: Session,
-    user_id: UUID,
-    *,
-    user_agent: Optional[str] = None,
-    ip_address_hash: Optional[str] = None,
-    country_code: Optional[str] = None,
-) -> None:
+def touch_users_activity_statement(activity: Mapping[UUID, datetime]):
     """
-    Update users.last_active_at only. Call after each authenticated request.
+    UPDATE users SET last_active_at = v.ts FROM (VALUES ...) AS v(id, ts), skipping users
+    whose stored value is already within ACTIVITY_RESOLUTION of v.ts.
     """
-    user = db.get(User, user_id)
-    if user:
-        user.last_active_at = datetime.now(timezone.utc)
-        db.commit()
+    v = values(
+        column("id", PG_UUID(as_uuid=True)),
+        column("ts", DateTime(timezone=True)),
+        name="v",
+    ).data(list(activity.items()))
+    return (
+        update(User)
+        .where(
+            User.id == v.c.id,
+            or_(User.last_active_at.is_(None), User.last_active_at < v.c.ts - ACTIVITY_RESOLUTION),
+        )
+        .values(last_active_at=v.c.ts)
+        .execution_options(synchronize_session=False)
+    )
+
+def touch_users_activity(db: Session, activity: Mapping[UUID, datetime]) -> int:
+    """
+    Set users.last_active_at for many users in one statement (activity: user_id -> time).
+    Returns number of rows updated.
+    """
+    if not activity:
+        return 0
+    result = db.execute(touch_users_activity_statement(activity))
+    db.commit()
+    return result.rowcount
@@ -6,6 +6,7 @@ from functools import lru_cache
 from typing import Optional
 from supabase import Client, create_client
 from app.config import get_settings
+from app.services.telemetry import outbound_call
 
 logger = logging.getLogger("pageshare.storage")
 settings = get_settings()
@@ -47,7 +48,8 @@ def upload_profile_picture(
 
     # supabase-py v2: storage.from_("bucket").upload(path, file)
     storage_bucket = client.storage.from_(bucket_name)
-    storage_bucket.upload(path, file_bytes, {"content-type": content_type})
+    with outbound_call("supabase"):
+        storage_bucket.upload(path, file_bytes, {"content-type": content_type})
 
     public_url = storage_bucket.get_public_url(path)
     return public_url
@@ -76,7 +78,8 @@ def delete_profile_picture(
 
     object_path = url[path_index + len(prefix) :]
     try:
-        storage_bucket.remove([object_path])
+        with outbound_call("supabase"):
+            storage_bucket.remove([object_path])
     except Exception as exc:
         logger.warning("Failed to delete profile picture %s from bucket %s: %s", object_path, bucket_name, exc)
 
@@ -97,5 +100,6 @@ def upload_media(
 
     logger.info("Uploading media for user %s to %s/%s", user_id, bucket_name, path)
     storage_bucket = client.storage.from_(bucket_name)
-    storage_bucket.upload(path, file_bytes, {"content-type": content_type})
+    with outbound_call("supabase"):
+        storage_bucket.upload(path, file_bytes, {"content-type": content_type})
     return storage_bucket.get_public_url(path)
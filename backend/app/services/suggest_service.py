@@ -0,0 +1,281 @@
+"""
+Typeahead for the search box (GET /search/suggest): in-process prefix indexes over
+usernames/display names and ticker symbols/names, ranked by follower / mention count.
+
+Each index is a sorted array of lowercase keys (bisect for the prefix range). Top results
+for prefixes with huge ranges (mostly 1-2 characters) are memoized per prefix and kept
+current on writes. Loaded in the app lifespan (or lazily), updated in-process on
+onboarding/profile edits and ticker creation, and fully rebuilt every REBUILD_SECONDS to
+pick up other workers' changes and fresh counts.
+"""
+from __future__ import annotations
+import bisect
+import heapq
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.models.follow import Follow
+from app.models.post_ticker import PostTicker
+from app.models.ticker import Ticker
+from app.models.user import User
+
+logger = logging.getLogger("pageshare.suggest")
+
+# Index entries a lookup ranks directly; longer prefix ranges are served from a memoized top list.
+MAX_SCAN = 2000
+MAX_LIMIT = 20
+REBUILD_SECONDS = 900.0
+_KEY_END = "\U0010ffff"
+
+@dataclass(frozen=True)
+class Suggestion:
+    """One suggestable item. For users id/label/detail/image = id/username/display_name/picture."""
+
+    id: str
+    label: str
+    detail: Optional[str]
+    image: Optional[str]
+    score: int
+
+def _rank(item: Suggestion) -> Tuple[int, int]:
+    return item.score, -len(item.label)
+
+def _keys(*texts: Optional[str]) -> List[str]:
+    """Lowercase full texts plus each later word, so 'Apple Inc.' matches 'app' and 'inc'."""
+    keys = set()
+    for text in texts:
+        if not text:
+            continue
+        lowered = text.strip().lower()
+        keys.add(lowered)
+        keys.update(lowered.split()[1:])
+    keys.discard("")
+    return sorted(keys)
+
+def user_suggestion(
+    user_id,
+    username: str,
+    display_name: Optional[str],
+    image: Optional[str],
+    score: int = 0,
+) -> Tuple[Suggestion, List[str]]:
+    return Suggestion(str(user_id), username, display_name, image, score), _keys(username, display_name)
+
+def ticker_suggestion(symbol: str, name: Optional[str], score: int = 0) -> Tuple[Suggestion, List[str]]:
+    return Suggestion(symbol, symbol, name, None, score), _keys(symbol, name)
+
+class PrefixIndex:
+    """
+    Sorted-array prefix index. Keys and item ids are parallel lists; a lookup is two
+    bisects plus a top-N over the prefix range. Ranges longer than MAX_SCAN entries are
+    ranked once and memoized, then kept current by upsert/remove. Reads and writes share
+    one lock.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._keys: List[str] = []
+        self._ids: List[str] = []
+        self._items: Dict[str, Suggestion] = {}
+        self._item_keys: Dict[str, List[str]] = {}
+        self._tops: Dict[str, List[Suggestion]] = {}
+        self.loaded_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._items
+
+    def rebuild(self, entries: Iterable[Tuple[Suggestion, List[str]]]) -> None:
+        """Replace the whole index (built outside the lock, swapped in)."""
+        items: Dict[str, Suggestion] = {}
+        item_keys: Dict[str, List[str]] = {}
+        pairs: List[Tuple[str, str]] = []
+        for item, keys in entries:
+            items[item.id] = item
+            item_keys[item.id] = keys
+            pairs.extend((k, item.id) for k in keys)
+        pairs.sort()
+        keys_arr = [k for k, _ in pairs]
+        ids_arr = [i for _, i in pairs]
+        with self._lock:
+            self._keys, self._ids = keys_arr, ids_arr
+            self._items, self._item_keys = items, item_keys
+            self._tops = {}
+            self.loaded_at = time.monotonic()
+
+    def upsert(self, item: Suggestion, keys: List[str], keep_score: bool = True) -> None:
+        """Insert or replace one item. keep_score: retain the indexed score (e.g. on rename)."""
+        with self._lock:
+            old = self._items.get(item.id)
+            if old is not None and keep_score:
+                item = Suggestion(item.id, item.label, item.detail, item.image, old.score)
+            old_keys = self._remove_keys(item.id)
+            self._items[item.id] = item
+            self._item_keys[item.id] = keys
+            for k in keys:
+                at = bisect.bisect_left(self._keys, k)
+                self._keys.insert(at, k)
+                self._ids.insert(at, item.id)
+            self._update_tops(item, old_keys, keys)
+
+    def remove(self, item_id: str) -> None:
+        with self._lock:
+            old = self._items.pop(item_id, None)
+            old_keys = self._remove_keys(item_id)
+            if old is not None:
+                self._update_tops(old, old_keys, [])
+
+    def search(self, prefix: str, limit: int = 8) -> List[Suggestion]:
+        """Top items by score with any key starting with prefix (lowercase)."""
+        if not prefix:
+            return []
+        with self._lock:
+            top = self._tops.get(prefix)
+            if top is None:
+                lo = bisect.bisect_left(self._keys, prefix)
+                hi = bisect.bisect_left(self._keys, prefix + _KEY_END, lo)
+                if hi - lo <= MAX_SCAN:
+                    return self._top(lo, hi, limit)
+                top = self._tops[prefix] = self._top(lo, hi, MAX_LIMIT)
+            return top[:limit]
+
+    def stats(self) -> Dict[str, int]:
+        return {"items": len(self._items), "keys": len(self._keys)}
+
+    def _top(self, lo: int, hi: int, limit: int) -> List[Suggestion]:
+        items = self._items
+        candidates = {items[i] for i in self._ids[lo:hi]}
+        return heapq.nlargest(limit, candidates, key=_rank)
+
+    def _remove_keys(self, item_id: str) -> List[str]:
+        keys = self._item_keys.pop(item_id, [])
+        for k in keys:
+            at = bisect.bisect_left(self._keys, k)
+            while at < len(self._keys) and self._keys[at] == k:
+                if self._ids[at] == item_id:
+                    del self._keys[at]
+                    del self._ids[at]
+                    break
+                at += 1
+        return keys
+
+    def _memoized(self, keys: List[str]) -> Set[str]:
+        return {k[:n] for k in keys for n in range(1, len(k) + 1) if k[:n] in self._tops}
+
+    def _update_tops(self, item: Suggestion, old_keys: List[str], new_keys: List[str]) -> None:
+        """
+        Apply one item's change to the memoized top lists it touches. An entrant is merged
+        in; a listed item that drops out or ranks lower leaves a gap only a rescan can fill,
+        so that one prefix is forgotten and re-ranked on its next lookup.
+        """
+        new_in = self._memoized(new_keys)
+        for prefix in self._memoized(old_keys) | new_in:
+            top = self._tops[prefix]
+            listed = next((s for s in top if s.id == item.id), None)
+            if listed is not None:
+                if prefix not in new_in or _rank(item) < _rank(listed):
+                    del self._tops[prefix]
+                    continue
+                top.remove(listed)
+            if prefix in new_in:
+                top.append(item)
+                top.sort(key=_rank, reverse=True)
+                del top[MAX_LIMIT:]
+
+user_index = PrefixIndex()
+ticker_index = PrefixIndex()
+_rebuild_lock = threading.Lock()
+
+def load_suggest_indexes(db: Session) -> None:
+    """Rebuild both indexes from the DB: live users by followers, tickers by live mentions."""
+    followers = (
+        select(Follow.following_id.label("user_id"), func.count().label("n"))
+        .group_by(Follow.following_id)
+        .subquery()
+    )
+    users = db.execute(
+        select(User.id, User.username, User.display_name, User.profile_picture_url, followers.c.n)
+        .outerjoin(followers, followers.c.user_id == User.id)
+        .where(User.deleted_at.is_(None))
+    )
+    user_index.rebuild(
+        user_suggestion(r.id, r.username, r.display_name, r.profile_picture_url, r.n or 0) for r in users
+    )
+    mentions = (
+        select(PostTicker.ticker_id, func.count().label("n"))
+        .where(PostTicker.post_deleted_at.is_(None))
+        .group_by(PostTicker.ticker_id)
+        .subquery()
+    )
+    tickers = db.execute(
+        select(Ticker.symbol, Ticker.name, mentions.c.n).outerjoin(
+            mentions, mentions.c.ticker_id == Ticker.id
+        )
+    )
+    ticker_index.rebuild(ticker_suggestion(r.symbol, r.name, r.n or 0) for r in tickers)
+
+def warm_suggest_indexes() -> None:
+    """Load at startup. Failures are logged; the first suggest request loads lazily."""
+    from app.database import db_session
+
+    started = time.monotonic()
+    try:
+        with db_session() as db:
+            load_suggest_indexes(db)
+        logger.info(
+            "Suggest indexes loaded: %d users, %d tickers in %.2fs",
+            len(user_index), len(ticker_index), time.monotonic() - started,
+        )
+    except Exception as exc:
+        logger.warning("Suggest index warm-up failed: %s", exc)
+
+def _rebuild_in_background() -> None:
+    if not _rebuild_lock.acquire(blocking=False):
+        return
+    def run() -> None:
+        try:
+            warm_suggest_indexes()
+        finally:
+            _rebuild_lock.release()
+    threading.Thread(target=run, name="suggest-rebuild", daemon=True).start()
+
+def ensure_suggest_loaded(db: Session) -> None:
+    """Load synchronously on first use (serverless); refresh in the background once stale."""
+    loaded_at = user_index.loaded_at
+    if loaded_at is None:
+        with _rebuild_lock:
+            if user_index.loaded_at is None:
+                load_suggest_indexes(db)
+    elif time.monotonic() - loaded_at > REBUILD_SECONDS:
+        _rebuild_in_background()
+
+def suggest(db: Session, q: str, limit: int = 8) -> Tuple[List[Suggestion], List[Suggestion]]:
+    """Return (users, tickers) whose username/display name or symbol/name starts with q."""
+    prefix = q.strip().lower()
+    if not prefix:
+        return [], []
+    limit = min(max(1, limit), MAX_LIMIT)
+    ensure_suggest_loaded(db)
+    return user_index.search(prefix, limit), ticker_index.search(prefix, limit)
+
+def index_user(user: User) -> None:
+    """Add or refresh a user after onboarding or a profile edit (keeps follower score)."""
+    if user.deleted_at is not None:
+        user_index.remove(str(user.id))
+        return
+    user_index.upsert(*user_suggestion(user.id, user.username, user.display_name, user.profile_picture_url))
+
+def unindex_user(user_id) -> None:
+    user_index.remove(str(user_id))
+
+def index_tickers(tickers: Iterable) -> None:
+    """Add newly committed tickers (objects with symbol and name); known symbols are skipped."""
+    for t in tickers:
+        if t.symbol not in ticker_index:
+            ticker_index.upsert(*ticker_suggestion(t.symbol, t.name))
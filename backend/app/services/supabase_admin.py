@@ -7,6 +7,7 @@ from __future__ import annotations
 import logging
 import httpx
 from app.config import get_settings
+from app.services.telemetry import outbound_call
 
 logger = logging.getLogger("pageshare.supabase_admin")
 
@@ -20,7 +21,7 @@ def delete_auth_user(user_id: str) -> None:
     settings = get_settings()
     url = f"{settings.supabase_url.rstrip('/')}/auth/v1/admin/users/{user_id}"
 
-    with httpx.Client(timeout=10.0) as http:
+    with outbound_call("supabase"), httpx.Client(timeout=10.0) as http:
         resp = http.delete(
             url,
             headers={
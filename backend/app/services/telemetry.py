@@ -0,0 +1,458 @@
+"""
+In-process request and database telemetry (feeds GET /metrics/health).
+
+- Per-route latency histograms over fixed buckets, so memory is bounded by the number of
+  route templates; request, 5xx and per-UTC-day request counters.
+- Per-request SQL accounting: SQLAlchemy before/after_cursor_execute events add each
+  statement's time to the current request (a contextvar set by the request middleware;
+  it follows sync routes into the threadpool) and to a query-latency histogram.
+- Slow queries (over SLOW_QUERY_MS) are counted and the latest kept in a ring buffer.
+- Outbound HTTP latency per service (supabase, gnews, ip-api) via outbound_call.
+- Point-in-time gauges taken at snapshot time: connection pool usage per instrumented
+  engine and cache hit/miss counters (metrics_service.get_cache_metrics).
+
+Snapshots are plain dicts of additive counters, so workers aggregate by addition: with
+METRICS_DIR set, every worker writes its snapshot there each SNAPSHOT_SECONDS and
+readers merge all files (aggregate_snapshot). Gauges are only summed over snapshots
+written in the last GAUGE_MAX_AGE_SECONDS (live workers).
+"""
+from __future__ import annotations
+import bisect
+import contextvars
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import get_settings
+from app.utils.db_pool import pool_status
+
+logger = logging.getLogger("pageshare.telemetry")
+
+# Upper bounds (ms) of the latency buckets; one more bucket counts everything above.
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+UNMATCHED_ROUTE = "<unmatched>"
+SLOW_QUERY_KEEP = 20
+SLOW_QUERY_TEXT_MAX = 500
+SNAPSHOT_SECONDS = 10.0
+GAUGE_MAX_AGE_SECONDS = 3 * SNAPSHOT_SECONDS
+# Worker snapshot files older than this are ignored (workers long gone).
+SNAPSHOT_MAX_AGE_SECONDS = 86400.0
+
+settings = get_settings()
+SLOW_QUERY_MS = settings.slow_query_ms
+
+
+class Histogram:
+    """Bucketed latency distribution: counts per LATENCY_BUCKETS_MS bucket, sum and count."""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.sum += ms
+        self.count += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"counts": list(self.counts), "sum": self.sum, "count": self.count}
+
+
+def histogram_quantile(hist: Dict[str, Any], q: float) -> Optional[float]:
+    """Estimate the q-quantile (ms) of a histogram dict by interpolating inside its bucket."""
+    count = hist["count"]
+    if not count:
+        return None
+    rank = q * count
+    seen = 0
+    for i, n in enumerate(hist["counts"]):
+        if n and seen + n >= rank:
+            lower = LATENCY_BUCKETS_MS[i - 1] if i else 0.0
+            if i == len(LATENCY_BUCKETS_MS):
+                return float(lower)  # open-ended top bucket
+            return lower + (LATENCY_BUCKETS_MS[i] - lower) * (rank - seen) / n
+        seen += n
+    return float(LATENCY_BUCKETS_MS[-1])
+
+
+def _merge_histograms(into: Dict[str, Any], other: Dict[str, Any]) -> None:
+    into["counts"] = [a + b for a, b in zip(into["counts"], other["counts"])]
+    into["sum"] += other["sum"]
+    into["count"] += other["count"]
+
+
+class RequestQueries:
+    """SQL statements run on behalf of one request; log (a query_audit.QueryLog) keeps each one."""
+
+    __slots__ = ("count", "ms", "path", "log")
+
+    def __init__(self, path: str) -> None:
+        self.count = 0
+        self.ms = 0.0
+        self.path = path
+        self.log = None
+
+
+_current_request: contextvars.ContextVar[Optional[RequestQueries]] = contextvars.ContextVar(
+    "pageshare_request_queries", default=None
+)
+
+
+class _OutboundStats:
+    __slots__ = ("latency", "errors")
+
+    def __init__(self) -> None:
+        self.latency = Histogram()
+        self.errors = 0
+
+
+class _RouteStats:
+    __slots__ = ("latency", "errors", "queries", "query_ms")
+
+    def __init__(self) -> None:
+        self.latency = Histogram()
+        self.errors = 0
+        self.queries = 0
+        self.query_ms = 0.0
+
+
+class Telemetry:
+    """Counters for one worker process. Thread-safe; every update is O(1)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self) -> None:
+        self._routes: Dict[str, _RouteStats] = {}
+        self._day = datetime.now(timezone.utc).date().isoformat()
+        self._requests_today = 0
+        self._queries = Histogram()
+        self._slow_count = 0
+        self._slow_recent: Deque[Dict[str, Any]] = deque(maxlen=SLOW_QUERY_KEEP)
+        self._outbound: Dict[str, _OutboundStats] = {}
+
+    def begin_request(self, path: str):
+        """Start SQL accounting for the current request; returns (token, RequestQueries)."""
+        queries = RequestQueries(path)
+        return _current_request.set(queries), queries
+
+    def end_request(self, token) -> None:
+        _current_request.reset(token)
+
+    def observe_request(self, route: str, status_code: int, ms: float, queries: RequestQueries) -> None:
+        today = datetime.now(timezone.utc).date().isoformat()
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = _RouteStats()
+            stats.latency.observe(ms)
+            if status_code >= 500:
+                stats.errors += 1
+            stats.queries += queries.count
+            stats.query_ms += queries.ms
+            if today != self._day:
+                self._day, self._requests_today = today, 0
+            self._requests_today += 1
+
+    def observe_query(self, ms: float, statement: str) -> None:
+        current = _current_request.get()
+        if current is not None:
+            current.count += 1
+            current.ms += ms
+            if current.log is not None:
+                current.log.record(statement)
+        with self._lock:
+            self._queries.observe(ms)
+            if ms >= SLOW_QUERY_MS:
+                self._slow_count += 1
+                self._slow_recent.append({
+                    "at": datetime.now(timezone.utc).isoformat(),
+                    "ms": round(ms, 1),
+                    "path": current.path if current is not None else None,
+                    "statement": " ".join(statement.split())[:SLOW_QUERY_TEXT_MAX],
+                })
+
+    def observe_outbound(self, service: str, ms: float, ok: bool) -> None:
+        with self._lock:
+            stats = self._outbound.get(service)
+            if stats is None:
+                stats = self._outbound[service] = _OutboundStats()
+            stats.latency.observe(ms)
+            if not ok:
+                stats.errors += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Additive counters of this worker (see merge_snapshots), plus current gauges."""
+        gauges = {"pools": _pool_gauges(), "caches": _cache_counters()}
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "written_at": time.time(),
+                "day": self._day,
+                "requests_today": self._requests_today,
+                "routes": {
+                    route: {
+                        "latency": s.latency.to_dict(),
+                        "errors": s.errors,
+                        "queries": s.queries,
+                        "query_ms": s.query_ms,
+                    }
+                    for route, s in self._routes.items()
+                },
+                "queries": self._queries.to_dict(),
+                "slow_queries": {"count": self._slow_count, "recent": list(self._slow_recent)},
+                "outbound": {
+                    service: {"latency": o.latency.to_dict(), "errors": o.errors}
+                    for service, o in self._outbound.items()
+                },
+                **gauges,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._clear()
+
+
+telemetry = Telemetry()
+_engines: Dict[str, Engine] = {}
+
+
+@contextmanager
+def outbound_call(service: str) -> Iterator[None]:
+    """Time an outbound HTTP call to service; an exception counts as an error."""
+    started = time.perf_counter()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        telemetry.observe_outbound(service, (time.perf_counter() - started) * 1000, ok)
+
+
+def _pool_gauges() -> Dict[str, Dict[str, int]]:
+    """Connection pool usage per instrumented engine (QueuePool-style pools only)."""
+    gauges = {}
+    for name, engine in _engines.items():
+        status = pool_status(engine)
+        if "size" in status:  # e.g. NullPool: nothing is pooled
+            gauges[name] = {k: v for k, v in status.items() if k != "pool"}
+    return gauges
+
+
+def _cache_counters() -> Dict[str, Dict[str, int]]:
+    """hits/misses/size of the caches listed by get_cache_metrics that count them."""
+    from app.services.metrics_service import get_cache_metrics
+
+    try:
+        caches = get_cache_metrics()
+    except Exception as exc:
+        logger.warning("Cache stats unavailable: %s", exc)
+        return {}
+    return {
+        name: {"hits": c["hits"], "misses": c["misses"], "size": c.get("size", 0)}
+        for name, c in caches.items()
+        if isinstance(c, dict) and "hits" in c and "misses" in c
+    }
+
+
+def merge_snapshots(snapshots: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum several workers' snapshots (requests_today only counts snapshots from today)."""
+    today = datetime.now(timezone.utc).date().isoformat()
+    merged: Dict[str, Any] = {
+        "workers": 0,
+        "day": today,
+        "requests_today": 0,
+        "routes": {},
+        "queries": Histogram().to_dict(),
+        "slow_queries": {"count": 0, "recent": []},
+        "outbound": {},
+        "pools": {},
+        "caches": {},
+    }
+    now = time.time()
+    for snap in snapshots:
+        merged["workers"] += 1
+        if snap.get("day") == today:
+            merged["requests_today"] += snap["requests_today"]
+        for route, s in snap["routes"].items():
+            into = merged["routes"].get(route)
+            if into is None:
+                merged["routes"][route] = copy.deepcopy(s)
+                continue
+            _merge_histograms(into["latency"], s["latency"])
+            into["errors"] += s["errors"]
+            into["queries"] += s["queries"]
+            into["query_ms"] += s["query_ms"]
+        _merge_histograms(merged["queries"], snap["queries"])
+        merged["slow_queries"]["count"] += snap["slow_queries"]["count"]
+        merged["slow_queries"]["recent"].extend(snap["slow_queries"]["recent"])
+        for service, o in snap.get("outbound", {}).items():
+            into = merged["outbound"].setdefault(service, {"latency": Histogram().to_dict(), "errors": 0})
+            _merge_histograms(into["latency"], o["latency"])
+            into["errors"] += o["errors"]
+        # Cache counters restart with their worker, so only live workers are summed.
+        if now - snap.get("written_at", 0) <= GAUGE_MAX_AGE_SECONDS:
+            for section in ("pools", "caches"):
+                for name, values in snap.get(section, {}).items():
+                    into = merged[section].setdefault(name, {})
+                    for key, value in values.items():
+                        into[key] = into.get(key, 0) + value
+    recent = sorted(merged["slow_queries"]["recent"], key=lambda q: q["at"], reverse=True)
+    merged["slow_queries"]["recent"] = recent[:SLOW_QUERY_KEEP]
+    return merged
+
+
+def _snapshot_path(directory: str, pid: int) -> str:
+    return os.path.join(directory, f"telemetry-{pid}.json")
+
+
+def write_snapshot(directory: str) -> None:
+    """Atomically write this worker's snapshot into directory."""
+    snap = telemetry.snapshot()
+    path = _snapshot_path(directory, snap["pid"])
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(snap, f)
+    os.replace(tmp, path)
+
+
+def aggregate_snapshot(directory: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Merged snapshot of all workers sharing directory (default METRICS_DIR), this worker's
+    counters taken live. Without a directory, this worker only.
+    """
+    directory = directory if directory is not None else settings.metrics_dir
+    snapshots: List[Dict[str, Any]] = [telemetry.snapshot()]
+    if directory and os.path.isdir(directory):
+        own = _snapshot_path(directory, os.getpid())
+        oldest = time.time() - SNAPSHOT_MAX_AGE_SECONDS
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if not name.startswith("telemetry-") or not name.endswith(".json") or path == own:
+                continue
+            try:
+                if os.path.getmtime(path) < oldest:
+                    continue
+                with open(path, encoding="utf-8") as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError) as exc:
+                logger.warning("Skipping telemetry snapshot %s: %s", name, exc)
+    return merge_snapshots(snapshots)
+
+
+def summarize(snapshot: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """/metrics/health "api" and "database" sections from a (merged) snapshot."""
+    latency = Histogram().to_dict()
+    requests = errors = queries = 0
+    routes: Dict[str, Any] = {}
+    for route, s in sorted(snapshot["routes"].items()):
+        _merge_histograms(latency, s["latency"])
+        n = s["latency"]["count"]
+        requests += n
+        errors += s["errors"]
+        queries += s["queries"]
+        routes[route] = {
+            "requests": n,
+            "avg_ms": _round(s["latency"]["sum"] / n if n else None),
+            "p95_ms": _round(histogram_quantile(s["latency"], 0.95)),
+            "p99_ms": _round(histogram_quantile(s["latency"], 0.99)),
+            "errors": s["errors"],
+            "queries_per_request": _round(s["queries"] / n if n else None),
+            "query_ms_per_request": _round(s["query_ms"] / n if n else None),
+        }
+    q = snapshot["queries"]
+    return {
+        "api": {
+            "response_time_avg_ms": _round(latency["sum"] / requests if requests else None),
+            "response_time_p95_ms": _round(histogram_quantile(latency, 0.95)),
+            "response_time_p99_ms": _round(histogram_quantile(latency, 0.99)),
+            "error_rate": round(errors / requests, 4) if requests else None,
+            "requests_today": snapshot["requests_today"],
+            "requests_total": requests,
+            "workers": snapshot.get("workers", 1),
+            "routes": routes,
+        },
+        "database": {
+            "query_time_avg_ms": _round(q["sum"] / q["count"] if q["count"] else None),
+            "query_time_p95_ms": _round(histogram_quantile(q, 0.95)),
+            "queries_total": q["count"],
+            "queries_per_request_avg": _round(queries / requests if requests else None),
+            "slow_queries_count": snapshot["slow_queries"]["count"],
+            "slow_query_threshold_ms": SLOW_QUERY_MS,
+            "slow_queries_recent": snapshot["slow_queries"]["recent"],
+        },
+    }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None:
+        context._pageshare_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = getattr(context, "_pageshare_started", None)
+    if started is not None:
+        telemetry.observe_query((time.perf_counter() - started) * 1000, statement)
+
+
+def instrument_engine(engine: Engine, name: str = "primary") -> None:
+    """Time every statement run through engine and report its pool as name (idempotent)."""
+    _engines[name] = engine
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class SnapshotWriter:
+    """Background thread writing this worker's snapshot to METRICS_DIR (multi-worker deployments)."""
+
+    def __init__(self, directory: str, interval: float = SNAPSHOT_SECONDS) -> None:
+        self._directory = directory
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="telemetry-snapshot", daemon=True)
+
+    def start(self) -> None:
+        os.makedirs(self._directory, exist_ok=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=self._interval + 1)
+        self._write()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self._write()
+
+    def _write(self) -> None:
+        try:
+            write_snapshot(self._directory)
+        except OSError as exc:
+            logger.warning("Telemetry snapshot write failed: %s", exc)
+
+
+def route_label(scope: Dict[str, Any]) -> str:
+    """
+    "METHOD template" of the route the router matched (e.g. "GET /api/v1/posts/{post_id}"),
+    so the number of distinct labels is bounded by the app's routes.
+    """
+    template = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+    return f"{scope['method']} {template}"
+
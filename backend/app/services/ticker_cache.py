@@ -0,0 +1,209 @@
+"""
+Process-wide ticker dictionary: symbol -> (id, name, type).
+
+The tickers table is small and almost read-only, so symbol <-> id mapping is served
+from memory instead of a DB round trip. Loaded in the app lifespan (or lazily on first
+use), updated after ticker inserts commit, and kept in sync across workers via
+LISTEN/NOTIFY on TICKER_CACHE_CHANNEL (new rows are sent whole, retyped symbols invalidated).
+"""
+from __future__ import annotations
+import json
+import logging
+import select
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Union
+from uuid import UUID
+from sqlalchemy.orm import Session
+from app.models.ticker import Ticker
+
+logger = logging.getLogger("pageshare.ticker_cache")
+
+TICKER_CACHE_CHANNEL = "ticker_cache"
+
+@dataclass(frozen=True)
+class CachedTicker:
+    """Immutable snapshot of one tickers row."""
+
+    id: UUID
+    symbol: str
+    name: Optional[str]
+    type: Optional[str]
+
+class TickerCache:
+    """
+    In-memory symbol and id index over the tickers table, with hit/miss counters.
+    Safe to share between threads; writers swap entries under a lock.
+    """
+
+    def __init__(self) -> None:
+        self._by_symbol: Dict[str, CachedTicker] = {}
+        self._by_id: Dict[UUID, CachedTicker] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self, db: Session) -> int:
+        """Replace the cache with every row in tickers. Returns number of tickers loaded."""
+        rows = db.query(Ticker.id, Ticker.symbol, Ticker.name, Ticker.type).all()
+        by_symbol = {r.symbol: CachedTicker(r.id, r.symbol, r.name, r.type) for r in rows}
+        with self._lock:
+            self._by_symbol = by_symbol
+            self._by_id = {t.id: t for t in by_symbol.values()}
+            self._loaded = True
+        return len(by_symbol)
+
+    def ensure_loaded(self, db: Session) -> None:
+        """Load on first use when the lifespan warm-up did not run (e.g. serverless)."""
+        if not self._loaded:
+            self.load(db)
+
+    def get(self, symbol: str) -> Optional[CachedTicker]:
+        """Return cached ticker for an uppercase symbol, counting a hit or miss."""
+        with self._lock:
+            ticker = self._by_symbol.get(symbol)
+            if ticker is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return ticker
+
+    def get_by_id(self, ticker_id: UUID) -> Optional[CachedTicker]:
+        """Return cached ticker by id, counting a hit or miss."""
+        with self._lock:
+            ticker = self._by_id.get(ticker_id)
+            if ticker is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return ticker
+
+    def put_many(self, tickers: Iterable[CachedTicker]) -> None:
+        """Insert or replace entries (after a committed insert or a DB fallback read)."""
+        with self._lock:
+            for t in tickers:
+                previous = self._by_symbol.get(t.symbol)
+                if previous is not None and previous.id != t.id:
+                    self._by_id.pop(previous.id, None)
+                self._by_symbol[t.symbol] = t
+                self._by_id[t.id] = t
+
+    def invalidate(self, symbol: str) -> None:
+        """Drop one symbol so the next lookup re-reads it from the DB."""
+        with self._lock:
+            ticker = self._by_symbol.pop(symbol, None)
+            if ticker is not None:
+                self._by_id.pop(ticker.id, None)
+
+    def stats(self) -> Dict[str, float]:
+        """Return size and hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._by_symbol),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+ticker_cache = TickerCache()
+
+def warm_ticker_cache() -> None:
+    """Load the cache at startup. Failures are logged; lookups fall back to lazy loading."""
+    from app.database import db_session
+
+    try:
+        with db_session() as db:
+            count = ticker_cache.load(db)
+        logger.info("Ticker cache warmed with %d tickers", count)
+    except Exception as exc:
+        logger.warning("Ticker cache warm-up failed: %s", exc)
+
+def ticker_payload(ticker: CachedTicker) -> str:
+    """NOTIFY payload carrying the whole row, so listeners can cache it without a DB read."""
+    return json.dumps({"id": str(ticker.id), "symbol": ticker.symbol, "name": ticker.name, "type": ticker.type})
+
+def parse_ticker_payload(payload: str) -> Optional[CachedTicker]:
+    """Inverse of ticker_payload; None for anything else (e.g. a bare symbol)."""
+    try:
+        data = json.loads(payload)
+        return CachedTicker(UUID(data["id"]), data["symbol"], data.get("name"), data.get("type"))
+    except (ValueError, TypeError, KeyError):
+        return None
+
+def notify_ticker_changes(db: Session, changes: Iterable[Union[CachedTicker, str]]) -> None:
+    """
+    Queue a NOTIFY per change inside the caller's transaction: a CachedTicker for listeners
+    to cache, or a bare symbol for them to invalidate. Postgres only delivers notifications
+    on commit, so other workers never see a rolled-back ticker.
+    """
+    payloads = [c if isinstance(c, str) else ticker_payload(c) for c in changes]
+    if not payloads:
+        return
+    from sqlalchemy import text
+
+    db.execute(
+        text("SELECT pg_notify(:channel, p) FROM unnest(CAST(:payloads AS text[])) AS p"),
+        {"channel": TICKER_CACHE_CHANNEL, "payloads": payloads},
+    )
+
+def apply_ticker_notification(payload: str) -> None:
+    """Cache the ticker a notification carries; invalidate the symbol if it carries none."""
+    ticker = parse_ticker_payload(payload)
+    if ticker is not None:
+        ticker_cache.put_many([ticker])
+    else:
+        ticker_cache.invalidate(payload)
+
+class TickerCacheListener:
+    """
+    Background thread that LISTENs on TICKER_CACHE_CHANNEL and caches tickers other workers created.
+    Needs a session-mode (or direct) connection; the transaction pooler does not support LISTEN.
+    """
+
+    def __init__(self, poll_seconds: float = 5.0, retry_seconds: float = 10.0) -> None:
+        self._poll_seconds = poll_seconds
+        self._retry_seconds = retry_seconds
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ticker-cache-listener", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=self._poll_seconds + 1)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._listen()
+            except Exception as exc:
+                logger.warning("Ticker cache listener error, retrying: %s", exc)
+                self._stop.wait(self._retry_seconds)
+
+    def _listen(self) -> None:
+        from app.database import db_session, engine
+
+        raw = engine.raw_connection()
+        try:
+            conn = raw.dbapi_connection
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {TICKER_CACHE_CHANNEL}")
+            # Anything may have changed while we were not listening.
+            with db_session() as db:
+                ticker_cache.load(db)
+            while not self._stop.is_set():
+                if select.select([conn], [], [], self._poll_seconds) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    apply_ticker_notification(conn.notifies.pop(0).payload)
+        finally:
+            # Never hand a LISTENing connection back to the pool.
+            raw.invalidate()
@@ -1,86 +1,193 @@
 """
-Ticker creation, lookup, and link to posts. Trending tickers from materialized view.
+Ticker creation, lookup, and link to posts. Trending tickers from mention buckets (trending_service).
+Symbol <-> id lookups go through the in-process ticker cache (see ticker_cache).
 """
 from __future__ import annotations
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
-from sqlalchemy import text
+from sqlalchemy import event, func, literal_column, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
+from app.models.post import Post
 from app.models.post_ticker import PostTicker
 from app.models.ticker import Ticker
+from app.services.suggest_service import index_tickers
+from app.services.ticker_cache import CachedTicker, notify_ticker_changes, ticker_cache
+from app.services.trending_service import DEFAULT_WINDOW, count_linked_mentions, trending_engine
 from app.utils.ticker_type import detect_ticker_type
 
-def get_or_create_ticker(db: Session, symbol: str) -> Ticker:
+_PENDING_CACHE_KEY = "pending_ticker_cache"
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending_tickers(session: Session) -> None:
+    """Move tickers upserted in this transaction into the process cache once committed."""
+    pending = session.info.pop(_PENDING_CACHE_KEY, None)
+    if pending:
+        ticker_cache.put_many(pending)
+        index_tickers(pending)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_tickers(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_CACHE_KEY, None)
+
+def _normalize_symbols(symbols: List[str]) -> List[str]:
     """
-    Get ticker by symbol (uppercase). Create if not exists.
+    Uppercase, drop empties and duplicates. Sorted so concurrent posts lock
+    ticker rows in the same order during the upsert.
+    """
+    return sorted({s.strip().upper() for s in symbols if s and s.strip()})
+
+def upsert_tickers(db: Session, symbols: List[str]) -> Dict[str, UUID]:
+    """
+    Resolve symbols to ticker ids with a single INSERT ... ON CONFLICT (symbol) DO UPDATE ... RETURNING.
+    Creates missing tickers and backfills type on legacy rows. Symbols must already be normalized
+    and unique. Does not commit; caller owns the transaction. The rows reach the ticker cache
+    (and, for newly inserted tickers, other workers via NOTIFY) only when the transaction commits.
+    Returns map symbol -> ticker id.
+    """
+    if not symbols:
+        return {}
+    stmt = pg_insert(Ticker).values(
+        [{"symbol": sym, "type": detect_ticker_type(sym)} for sym in symbols]
+    )
+    # DO UPDATE (not DO NOTHING) so RETURNING also yields rows that already existed.
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Ticker.symbol],
+        set_={"type": func.coalesce(Ticker.type, stmt.excluded.type)},
+    ).returning(
+        Ticker.id, Ticker.symbol, Ticker.name, Ticker.type,
+        literal_column("xmax = 0").label("inserted"),  # false for rows that already existed
+    )
+    result = db.execute(stmt).all()
+    rows = [CachedTicker(r.id, r.symbol, r.name, r.type) for r in result]
+    db.info.setdefault(_PENDING_CACHE_KEY, []).extend(rows)
+    # Only new tickers are news to other workers; re-announcing existing ones would churn their caches.
+    notify_ticker_changes(db, [t for t, r in zip(rows, result) if r.inserted])
+    return {t.symbol: t.id for t in rows}
+
+def resolve_or_create_ticker_ids(db: Session, symbols: List[str]) -> Dict[str, UUID]:
+    """
+    Map normalized symbols to ticker ids. Cached symbols cost nothing; the rest are
+    created/resolved by one upsert. Does not commit.
+    """
+    ids: Dict[str, UUID] = {}
+    missing: List[str] = []
+    for sym in symbols:
+        cached = ticker_cache.get(sym)
+        # Rows with no type still need the upsert to backfill it.
+        if cached is not None and cached.type is not None:
+            ids[sym] = cached.id
+        else:
+            missing.append(sym)
+    ids.update(upsert_tickers(db, missing))
+    return ids
+
+def get_or_create_ticker_id(db: Session, symbol: str) -> UUID:
+    """
+    Get ticker id by symbol (uppercase). Create if not exists. Does not commit.
+    """
+    symbol = symbol.strip().upper()
+    return resolve_or_create_ticker_ids(db, [symbol])[symbol]
+
+def resolve_ticker_id(db: Session, symbol: str) -> Optional[UUID]:
+    """
+    Return ticker id for a symbol, or None if no such ticker. Served from the cache;
+    falls back to the DB on a miss (e.g. ticker created by another worker).
     """
     symbol = symbol.strip().upper()
-    ticker = db.query(Ticker).filter(Ticker.symbol == symbol).first()
-    if ticker:
-        # Backfill type for legacy rows where it was not set yet.
-        if ticker.type is None:
-            ticker.type = detect_ticker_type(symbol)
-            db.add(ticker)
-            db.commit()
-            db.refresh(ticker)
-        return ticker
+    ticker_cache.ensure_loaded(db)
+    cached = ticker_cache.get(symbol)
+    if cached is not None:
+        return cached.id
+    row = (
+        db.query(Ticker.id, Ticker.symbol, Ticker.name, Ticker.type)
+        .filter(Ticker.symbol == symbol)
+        .first()
+    )
+    if row is None:
+        return None
+    ticker_cache.put_many([CachedTicker(row.id, row.symbol, row.name, row.type)])
+    return row.id
 
-    ticker = Ticker(symbol=symbol, type=detect_ticker_type(symbol))
-    db.add(ticker)
-    db.commit()
-    db.refresh(ticker)
-    return ticker
+def get_tickers_by_ids(db: Session, ticker_ids: List[UUID]) -> Dict[UUID, CachedTicker]:
+    """
+    Return map ticker_id -> CachedTicker. Served from the cache; misses are read in one query.
+    """
+    ticker_cache.ensure_loaded(db)
+    found: Dict[UUID, CachedTicker] = {}
+    missing: List[UUID] = []
+    for tid in set(ticker_ids):
+        cached = ticker_cache.get_by_id(tid)
+        if cached is not None:
+            found[tid] = cached
+        else:
+            missing.append(tid)
+    if missing:
+        rows = [
+            CachedTicker(r.id, r.symbol, r.name, r.type)
+            for r in db.query(Ticker.id, Ticker.symbol, Ticker.name, Ticker.type).filter(
+                Ticker.id.in_(missing)
+            )
+        ]
+        ticker_cache.put_many(rows)
+        found.update({t.id: t for t in rows})
+    return found
 
 def link_post_tickers(db: Session, post_id: UUID, symbols: List[str]) -> None:
     """
-    Link a post to tickers. Creates tickers if needed and inserts post_tickers.
-    Deduplicates symbols and skips empty.
+    Link a (live) post to tickers. Creates tickers if needed and inserts post_tickers.
+    Deduplicates symbols and skips empty. At most two statements (ticker upsert for
+    uncached symbols + multi-row post_tickers insert); does not commit so it lands
+    in the caller's transaction.
     """
-    seen: set[str] = set()
-    for sym in symbols:
-        sym = sym.strip().upper()
-        if not sym or sym in seen:
-            continue
-        seen.add(sym)
-        ticker = get_or_create_ticker(db, sym)
-        existing = (
-            db.query(PostTicker)
-            .filter(PostTicker.post_id == post_id, PostTicker.ticker_id == ticker.id)
-            .first()
+    ticker_ids = resolve_or_create_ticker_ids(db, _normalize_symbols(symbols))
+    if not ticker_ids:
+        return
+    # One round trip: insert links (with the post's created_at for the ticker timeline index)
+    # and bump trending buckets for the rows actually inserted.
+    post_created_at = select(Post.created_at).where(Post.id == post_id).scalar_subquery()
+    linked = (
+        pg_insert(PostTicker)
+        .values(
+            [
+                {"post_id": post_id, "ticker_id": tid, "post_created_at": post_created_at}
+                for tid in ticker_ids.values()
+            ]
         )
-        if not existing:
-            db.add(PostTicker(post_id=post_id, ticker_id=ticker.id))
-    db.commit()
+        .on_conflict_do_nothing(index_elements=[PostTicker.post_id, PostTicker.ticker_id])
+        .returning(PostTicker.ticker_id, PostTicker.post_created_at)
+        .cte("linked")
+    )
+    db.execute(count_linked_mentions(linked))
 
 def get_trending_tickers(
     db: Session,
     limit: int = 10,
+    window: str = DEFAULT_WINDOW,
 ) -> List[dict]:
     """
-    Return trending tickers from materialized view trending_tickers.
+    Return trending tickers for a sliding window (1h, 24h or 7d) from mention buckets.
+    mention_count is the count within window; growth compares it with the preceding window.
     limit: max rows (default 10, API doc max 50).
     """
     if limit <= 0:
         return []
     limit = min(limit, 50)
-    result = db.execute(
-        text("""
-            SELECT ticker_id, symbol, name, mention_count, mentions_24h, last_mentioned_at
-            FROM trending_tickers
-            ORDER BY mentions_24h DESC NULLS LAST, mention_count DESC NULLS LAST
-            LIMIT :lim
-        """),
-        {"lim": limit},
-    )
-    rows = result.fetchall()
+    rows = trending_engine.top(db, window=window, limit=limit)
+    tickers = get_tickers_by_ids(db, [r.ticker_id for r in rows])
     return [
         {
-            "ticker_id": str(r[0]),
-            "symbol": r[1],
-            "name": r[2],
-            "mention_count": r[3] or 0,
-            "mentions_24h": r[4] or 0,
-            "last_mentioned_at": r[5],
+            "ticker_id": str(r.ticker_id),
+            "symbol": tickers[r.ticker_id].symbol,
+            "name": tickers[r.ticker_id].name,
+            "window": window,
+            "mention_count": r.mentions[window],
+            "mentions_1h": r.mentions["1h"],
+            "mentions_24h": r.mentions["24h"],
+            "mentions_7d": r.mentions["7d"],
+            "growth": r.growth(window),
+            "last_mentioned_at": r.last_bucket,
         }
         for r in rows
+        if r.ticker_id in tickers
     ]
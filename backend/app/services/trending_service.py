@@ -0,0 +1,183 @@
+"""
+Sliding-window trending tickers from per-ticker 5-minute mention buckets.
+
+Writes: link_post_tickers increments the bucket of the post's created_at; delete_post
+decrements it. Reads: one grouped query sums the buckets for every window (and the
+preceding window, for growth) and an in-memory top-K per window is reused until it is
+REFRESH_SECONDS old.
+"""
+from __future__ import annotations
+import heapq
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import func, literal, literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.selectable import CTE
+from app.models.post import Post
+from app.models.post_ticker import PostTicker
+from app.models.ticker_mention_bucket import TickerMentionBucket
+
+BUCKET_SECONDS = 300
+WINDOWS: Dict[str, timedelta] = {
+    "1h": timedelta(hours=1),
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+}
+DEFAULT_WINDOW = "24h"
+# Growth compares a window with the one before it, so keep two of the largest window.
+RETENTION = 2 * max(WINDOWS.values())
+REFRESH_SECONDS = 5.0
+TOP_K = 50
+
+def mention_bucket(ts: ColumnElement) -> ColumnElement:
+    """SQL expression flooring a timestamptz to the start of its mention bucket."""
+    # Inline constant so the expression renders identically in SELECT and GROUP BY.
+    size = literal_column(str(BUCKET_SECONDS))
+    return func.to_timestamp(func.floor(func.extract("epoch", ts) / size) * size)
+
+def count_linked_mentions(linked: CTE):
+    """
+    Build an INSERT that adds one mention per row of `linked` (a CTE returning ticker_id,
+    post_created_at for newly inserted post_tickers) to the bucket of the post's created_at.
+    """
+    bucket = mention_bucket(linked.c.post_created_at)
+    counts = select(linked.c.ticker_id, bucket, func.count()).group_by(linked.c.ticker_id, bucket)
+    stmt = pg_insert(TickerMentionBucket).from_select(
+        ["ticker_id", "bucket_start", "mention_count"], counts
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[TickerMentionBucket.ticker_id, TickerMentionBucket.bucket_start],
+        set_={"mention_count": TickerMentionBucket.mention_count + stmt.excluded.mention_count},
+    )
+
+def uncount_unlinked_mentions(unlinked: CTE):
+    """
+    Build an UPDATE that removes one mention per row of `unlinked` (a CTE returning
+    ticker_id, post_created_at for deleted post_tickers) from the matching buckets.
+    """
+    bucket = mention_bucket(unlinked.c.post_created_at).label("bucket_start")
+    counts = (
+        select(unlinked.c.ticker_id, bucket, func.count().label("n"))
+        .group_by(unlinked.c.ticker_id, bucket)
+        .subquery("unlinked_counts")
+    )
+    return (
+        update(TickerMentionBucket)
+        .where(
+            TickerMentionBucket.ticker_id == counts.c.ticker_id,
+            TickerMentionBucket.bucket_start == counts.c.bucket_start,
+        )
+        .values(mention_count=func.greatest(TickerMentionBucket.mention_count - counts.c.n, 0))
+    )
+
+def uncount_post_mentions(db: Session, post_id: UUID, created_at: datetime) -> None:
+    """Remove one mention per ticker linked to a post that is being soft-deleted. Does not commit."""
+    db.execute(
+        update(TickerMentionBucket)
+        .where(
+            TickerMentionBucket.ticker_id == PostTicker.ticker_id,
+            PostTicker.post_id == post_id,
+            TickerMentionBucket.bucket_start == mention_bucket(literal(created_at, Post.created_at.type)),
+        )
+        .values(mention_count=func.greatest(TickerMentionBucket.mention_count - 1, 0))
+    )
+
+def prune_mention_buckets(db: Session) -> int:
+    """Delete buckets older than RETENTION. Returns rows deleted."""
+    cutoff = datetime.now(timezone.utc) - RETENTION
+    deleted = (
+        db.query(TickerMentionBucket)
+        .filter(TickerMentionBucket.bucket_start < cutoff)
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return deleted
+
+def growth_rate(current: int, previous: int) -> Optional[float]:
+    """Relative change vs the preceding window; None when there is no baseline."""
+    if previous <= 0:
+        return None
+    return round((current - previous) / previous, 4)
+
+@dataclass(frozen=True)
+class TrendingRow:
+    """Mention counts for one ticker across all windows."""
+
+    ticker_id: UUID
+    mentions: Dict[str, int]
+    previous: Dict[str, int]
+    last_bucket: Optional[datetime]
+
+    def growth(self, window: str) -> Optional[float]:
+        return growth_rate(self.mentions[window], self.previous[window])
+
+def rank_window(rows: List[TrendingRow], window: str, top_k: int = TOP_K) -> List[TrendingRow]:
+    """Top-K tickers by mentions in window; ties broken by the longest window."""
+    longest = max(WINDOWS, key=WINDOWS.get)
+    active = (r for r in rows if r.mentions[window] > 0)
+    return heapq.nlargest(top_k, active, key=lambda r: (r.mentions[window], r.mentions[longest]))
+
+class TrendingEngine:
+    """
+    Caches the ranked top-K for every window and recomputes it at most every
+    REFRESH_SECONDS, so concurrent requests share one aggregate query.
+    """
+
+    def __init__(self, refresh_seconds: float = REFRESH_SECONDS, top_k: int = TOP_K) -> None:
+        self._refresh_seconds = refresh_seconds
+        self._top_k = top_k
+        self._lock = threading.Lock()
+        self._computed_at = 0.0
+        self._ranked: Dict[str, List[TrendingRow]] = {w: [] for w in WINDOWS}
+
+    def top(self, db: Session, window: str = DEFAULT_WINDOW, limit: int = 10) -> List[TrendingRow]:
+        """Return up to limit ranked rows for window, refreshing the snapshot if stale."""
+        if time.monotonic() - self._computed_at >= self._refresh_seconds:
+            with self._lock:
+                # Another request may have refreshed while we waited for the lock.
+                if time.monotonic() - self._computed_at >= self._refresh_seconds:
+                    self._refresh(db)
+        return self._ranked[window][:limit]
+
+    def invalidate(self) -> None:
+        """Force the next read to recompute (e.g. after a bulk backfill)."""
+        self._computed_at = 0.0
+
+    def _refresh(self, db: Session) -> None:
+        rows = self._load_rows(db, datetime.now(timezone.utc))
+        self._ranked = {w: rank_window(rows, w, self._top_k) for w in WINDOWS}
+        self._computed_at = time.monotonic()
+
+    @staticmethod
+    def _load_rows(db: Session, now: datetime) -> List[TrendingRow]:
+        b = TickerMentionBucket
+        columns = [b.ticker_id, func.max(b.bucket_start).label("last_bucket")]
+        for name, span in WINDOWS.items():
+            current = func.sum(b.mention_count).filter(b.bucket_start > now - span)
+            previous = func.sum(b.mention_count).filter(
+                b.bucket_start > now - 2 * span, b.bucket_start <= now - span
+            )
+            columns.append(func.coalesce(current, 0).label(f"cur_{name}"))
+            columns.append(func.coalesce(previous, 0).label(f"prev_{name}"))
+        stmt = (
+            select(*columns)
+            .where(b.bucket_start > now - RETENTION, b.mention_count > 0)
+            .group_by(b.ticker_id)
+        )
+        return [
+            TrendingRow(
+                ticker_id=r.ticker_id,
+                mentions={w: int(r._mapping[f"cur_{w}"]) for w in WINDOWS},
+                previous={w: int(r._mapping[f"prev_{w}"]) for w in WINDOWS},
+                last_bucket=r.last_bucket,
+            )
+            for r in db.execute(stmt)
+        ]
+
+trending_engine = TrendingEngine()
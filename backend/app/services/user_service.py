@@ -10,9 +10,15 @@ from app.models.user_interest import UserInterest
 from app.schemas.user import OnboardingRequest, UpdateUserRequest, UsernameStr
 from app.services.auth_service import CurrentUser, AuthException, AuthErrorCode
 from app.services.storage_service import delete_profile_picture
+from app.services.suggest_service import index_user, unindex_user
+from app.utils.cache import TTLCache
 
 logger = logging.getLogger("pageshare.user")
 
+# user_id -> is admin. Badges are granted by hand in the DB, so other processes' changes
+# show up within the ttl; app code that changes or removes a user calls invalidate_admin_role.
+admin_role_cache = TTLCache(maxsize=1024, ttl=60.0)
+
 def _normalize_username(username: str) -> str:
     return username.strip().lower()
 
@@ -25,6 +31,16 @@ def get_user_by_username(db: Session, username: str) -> Optional[User]:
     normalized = _normalize_username(username)
     return db.execute(select(User).where(User.username == normalized)).scalars().first()
 
+def is_admin(db: Session, user_id: UUID) -> bool:
+    """True if the user's badge is 'admin'. Cached per user for admin_role_cache.ttl seconds."""
+    def load() -> bool:
+        return db.execute(select(User.badge).where(User.id == user_id)).scalar() == "admin"
+
+    return admin_role_cache.get_or_compute(user_id, load)
+
+def invalidate_admin_role(user_id: UUID) -> None:
+    admin_role_cache.invalidate(user_id)
+
 def get_or_create_user_for_auth(db: Session, current: CurrentUser) -> User:
     """
     Ensure we have a row in `users` for the given Supabase auth user id.
@@ -64,6 +80,7 @@ def apply_user_update(db: Session, user: User, payload: UpdateUserRequest) -> Us
     db.add(user)
     db.commit()
     db.refresh(user)
+    index_user(user)
     return user
 
 def validate_username_available(db: Session, username: UsernameStr, exclude_user_id: Optional[str] = None) -> None:
@@ -150,6 +167,7 @@ def apply_onboarding(
     db.add(user)
     db.commit()
     db.refresh(user)
+    index_user(user)
 
     # Interests
     if payload.interests:
@@ -181,4 +199,6 @@ def delete_account(db: Session, current: CurrentUser) -> None:
 
     db.delete(user)
     db.commit()
+    unindex_user(user_id_str)
+    invalidate_admin_role(user.id)
     logger.info("Deleted user account: id=%s username=%s", user_id_str, username)
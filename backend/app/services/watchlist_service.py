@@ -6,22 +6,22 @@ from typing import List
 from uuid import UUID
 from sqlalchemy.orm import Session
 from app.models.watchlist_item import WatchlistItem
-from app.services.ticker_service import get_or_create_ticker
+from app.services.ticker_service import get_or_create_ticker_id, resolve_ticker_id
 
 def add_to_watchlist(db: Session, user_id: UUID, symbol: str) -> bool:
     """
-    Add ticker to user's watchlist. Creates ticker if not exists.
+    Add ticker to user's watchlist. Creates ticker if not exists (same transaction).
     Returns True if added. Raises ValueError if already in watchlist.
     """
-    ticker = get_or_create_ticker(db, symbol)
+    ticker_id = get_or_create_ticker_id(db, symbol)
     existing = (
         db.query(WatchlistItem)
-        .filter(WatchlistItem.user_id == user_id, WatchlistItem.ticker_id == ticker.id)
+        .filter(WatchlistItem.user_id == user_id, WatchlistItem.ticker_id == ticker_id)
         .first()
     )
     if existing:
         raise ValueError("Already in watchlist")
-    db.add(WatchlistItem(user_id=user_id, ticker_id=ticker.id))
+    db.add(WatchlistItem(user_id=user_id, ticker_id=ticker_id))
     db.commit()
     return True
 
@@ -30,20 +30,16 @@ def remove_from_watchlist(db: Session, user_id: UUID, symbol: str) -> bool:
     Remove ticker from user's watchlist by symbol.
     Returns True if removed, False if not found.
     """
-    from app.models.ticker import Ticker
-
-    symbol = symbol.strip().upper()
-    row = (
+    ticker_id = resolve_ticker_id(db, symbol)
+    if ticker_id is None:
+        return False
+    deleted = (
         db.query(WatchlistItem)
-        .join(Ticker, WatchlistItem.ticker_id == Ticker.id)
-        .filter(WatchlistItem.user_id == user_id, Ticker.symbol == symbol)
-        .first()
+        .filter(WatchlistItem.user_id == user_id, WatchlistItem.ticker_id == ticker_id)
+        .delete(synchronize_session=False)
     )
-    if not row:
-        return False
-    db.delete(row)
     db.commit()
-    return True
+    return deleted > 0
 
 def list_watchlist(db: Session, user_id: UUID) -> List[dict]:
     """
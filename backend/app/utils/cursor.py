@@ -0,0 +1,54 @@
+"""
+Opaque keyset cursors for pagination: the sort key of the last item served.
+Timelines use (created_at, id); ranked results (e.g. post search) use (score, id).
+"""
+import base64
+from datetime import datetime
+from typing import List, Tuple
+from uuid import UUID
+
+
+def _encode(*parts: str) -> str:
+    raw = "|".join(parts).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode(cursor: str, n: int) -> List[str]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+    parts = raw.split("|", n - 1)
+    if len(parts) != n:
+        raise ValueError("Invalid cursor")
+    return parts
+
+
+def encode_cursor(created_at: datetime, item_id: UUID) -> str:
+    """Encode the sort key of the last item on a page as a URL-safe string."""
+    return _encode(created_at.isoformat(), str(item_id))
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a cursor from encode_cursor. Raises ValueError when malformed.
+    """
+    try:
+        created_at, item_id = _decode(cursor, 2)
+        return datetime.fromisoformat(created_at), UUID(item_id)
+    except (ValueError, UnicodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def encode_score_cursor(score: float, item_id: UUID) -> str:
+    """Encode (score, id) of the last ranked item. repr() round-trips the float exactly."""
+    return _encode(repr(float(score)), str(item_id))
+
+
+def decode_score_cursor(cursor: str) -> Tuple[float, UUID]:
+    """
+    Decode a cursor from encode_score_cursor. Raises ValueError when malformed.
+    """
+    try:
+        score, item_id = _decode(cursor, 2)
+        return float(score), UUID(item_id)
+    except (ValueError, UnicodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
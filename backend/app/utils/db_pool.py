@@ -0,0 +1,104 @@
+"""
+Engine and connection pool options from settings (DB_* env vars), shared by the sync
+(psycopg2) and async (asyncpg) engines.
+
+- Pooled (default): pool_size/max_overflow/pool_timeout/pool_recycle per engine and worker.
+- DB_NULL_POOL: NullPool, a new connection per checkout closed on return. For serverless
+  (index.py sets it for Vercel): nothing is left open between invocations; pair with a
+  transaction pooler in front of Postgres.
+- Transaction pooler (PgBouncer/Supavisor transaction mode): a server connection is only
+  ours for one transaction, so server-side prepared statements must not be reused.
+  psycopg2 never prepares; asyncpg gets its statement caches off and unique statement names.
+- Liveness: instead of pool_pre_ping (a round trip on every checkout), a connection is
+  pinged only when it sat idle in the pool for DB_PING_IDLE_SECONDS or more.
+"""
+from __future__ import annotations
+import time
+import uuid
+from typing import Any, Dict
+from sqlalchemy import event, exc
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.pool import NullPool
+
+_IDLE_SINCE = "pageshare_idle_since"
+
+
+def async_database_url(url: str, transaction_pooler: bool = False) -> URL:
+    """DATABASE_URL for the asyncpg driver (libpq's sslmode is asyncpg's ssl)."""
+    parsed = make_url(url).set(drivername="postgresql+asyncpg")
+    if "sslmode" in parsed.query:
+        parsed = parsed.difference_update_query(["sslmode"]).update_query_dict(
+            {"ssl": parsed.query["sslmode"]}
+        )
+    if transaction_pooler:
+        # SQLAlchemy's own prepared statement cache (asyncpg dialect option).
+        parsed = parsed.update_query_dict({"prepared_statement_cache_size": "0"})
+    return parsed
+
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def engine_options(settings, driver: str) -> Dict[str, Any]:
+    """create_engine / create_async_engine kwargs; driver is "psycopg2" or "asyncpg"."""
+    options: Dict[str, Any] = {}
+    if settings.db_null_pool:
+        options["poolclass"] = NullPool
+    else:
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+        )
+    if driver == "asyncpg":
+        connect_args: Dict[str, Any] = {"timeout": settings.db_connect_timeout}
+        if settings.db_transaction_pooler:
+            connect_args.update(
+                statement_cache_size=0,
+                prepared_statement_name_func=_unique_statement_name,
+            )
+    else:
+        connect_args = {"connect_timeout": settings.db_connect_timeout}
+    options["connect_args"] = connect_args
+    return options
+
+
+def install_idle_ping(engine: Engine, idle_seconds: float) -> None:
+    """
+    Ping connections that sat in the pool idle_seconds or more before handing them out; a
+    failed ping discards the connection and the pool checks out another (as pool_pre_ping).
+    No-op for NullPool, whose connections are always fresh.
+    """
+    if isinstance(engine.pool, NullPool):
+        return
+    dialect = engine.dialect
+
+    @event.listens_for(engine, "checkin")
+    def _mark_idle(dbapi_connection, connection_record) -> None:
+        connection_record.info[_IDLE_SINCE] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping_if_idle(dbapi_connection, connection_record, connection_proxy) -> None:
+        idle_since = connection_record.info.pop(_IDLE_SINCE, None)
+        if idle_since is None or time.monotonic() - idle_since < idle_seconds:
+            return  # just connected, or recently used
+        try:
+            dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            raise exc.DisconnectionError(f"connection idle {time.monotonic() - idle_since:.0f}s failed ping") from e
+
+
+def pool_status(engine: Engine) -> Dict[str, Any]:
+    """Pool class and, for QueuePool-style pools, size / checked out / checked in / overflow."""
+    pool = engine.pool
+    status: Dict[str, Any] = {"pool": type(pool).__name__}
+    if hasattr(pool, "checkedout"):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+        )
+    return status
@@ -1,10 +1,14 @@
 """
 HTTP helpers for API layer. Reduces duplicated validation and error handling.
 """
+from datetime import datetime
+from typing import Optional, Tuple
 from uuid import UUID
 
 from fastapi import HTTPException, status
 
+from app.utils.cursor import decode_cursor, decode_score_cursor
+
 
 def parse_uuid_or_404(value: str, detail: str = "Not found") -> UUID:
     """
@@ -15,3 +19,26 @@ def parse_uuid_or_404(value: str, detail: str = "Not found") -> UUID:
         return UUID(value)
     except (ValueError, TypeError, AttributeError):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+
+
+def parse_cursor_or_422(value: Optional[str]) -> Optional[Tuple[datetime, UUID]]:
+    """
+    Decode an optional pagination cursor query param or raise 422.
+    Returns None when no cursor was sent (first page).
+    """
+    if not value:
+        return None
+    try:
+        return decode_cursor(value)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid cursor")
+
+
+def parse_score_cursor_or_422(value: Optional[str]) -> Optional[Tuple[float, UUID]]:
+    """Like parse_cursor_or_422 for ranked results keyed by (score, id)."""
+    if not value:
+        return None
+    try:
+        return decode_score_cursor(value)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid cursor")
@@ -0,0 +1,74 @@
+"""
+Read-replica routing with read-your-writes stickiness.
+
+GET endpoints read through get_read_db (replica when DATABASE_READ_URL is set). A client
+that just wrote is pinned to the primary for DB_READ_STICKY_SECONDS so it sees its own
+writes despite replication lag: after every successful write request the
+ReadYourWritesMiddleware returns a pin token, as a cookie and as the X-Primary-Until
+header (for clients that do not send cookies cross-site; they echo it back). The token
+is "<until>.<hmac>": signed so clients cannot pin themselves to the primary for longer.
+"""
+from __future__ import annotations
+import hashlib
+import hmac
+import time
+from typing import Callable, Optional
+from fastapi import Request
+
+PRIMARY_COOKIE = "pageshare_primary"
+PRIMARY_HEADER = "X-Primary-Until"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def _signature(until: int, secret: str) -> str:
+    return hmac.new(secret.encode(), str(until).encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def sign_pin(until: int, secret: str) -> str:
+    """Pin token valid until the unix time until."""
+    return f"{until}.{_signature(until, secret)}"
+
+
+def pinned_to_primary(token: Optional[str], secret: str, max_seconds: float, now: Optional[float] = None) -> bool:
+    """True while token is a valid, unexpired pin (and not further out than max_seconds)."""
+    if not token:
+        return False
+    until_raw, _, signature = token.partition(".")
+    try:
+        until = int(until_raw)
+    except ValueError:
+        return False
+    if not hmac.compare_digest(signature, _signature(until, secret)):
+        return False
+    now = time.time() if now is None else now
+    return now < until <= now + max_seconds + 1
+
+
+def request_pinned(request: Request, secret: str, max_seconds: float) -> bool:
+    token = request.headers.get(PRIMARY_HEADER) or request.cookies.get(PRIMARY_COOKIE)
+    return pinned_to_primary(token, secret, max_seconds)
+
+
+def read_session_dependency(primary: Callable, replica: Callable, secret: str, sticky_seconds: float):
+    """FastAPI dependency yielding a session from replica, or primary while the client is pinned."""
+
+    def get_read_db(request: Request):
+        factory = primary if request_pinned(request, secret, sticky_seconds) else replica
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    return get_read_db
+
+
+def async_read_session_dependency(primary: Callable, replica: Callable, secret: str, sticky_seconds: float):
+    """Async counterpart of read_session_dependency (AsyncSession factories)."""
+
+    async def get_async_read_db(request: Request):
+        factory = primary if request_pinned(request, secret, sticky_seconds) else replica
+        async with factory() as db:
+            yield db
+
+    return get_async_read_db
@@ -8,26 +8,29 @@ def paginated_response(
     data: List[Any],
     page: int,
     per_page: int,
-    total: int,
+    total: Optional[int],
     has_next: Optional[bool] = None,
     has_prev: Optional[bool] = None,
+    cursor: Optional[str] = None,
 ) -> dict:
     """
     Build a standard paginated JSON body: {"data": ..., "pagination": {...}}.
     If has_next is None, it is computed as page * per_page < total.
+    total may be None for keyset pages (no count); pass has_next explicitly then.
     If has_prev is None, it is computed as page > 1.
+    cursor: keyset cursor for the next page; only included when given.
     """
     if has_next is None:
-        has_next = page * per_page < total
+        has_next = total is not None and page * per_page < total
     if has_prev is None:
         has_prev = page > 1
-    return {
-        "data": data,
-        "pagination": {
-            "page": page,
-            "per_page": per_page,
-            "total": total,
-            "has_next": has_next,
-            "has_prev": has_prev,
-        },
+    pagination = {
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "has_next": has_next,
+        "has_prev": has_prev,
     }
+    if cursor is not None:
+        pagination["cursor"] = cursor
+    return {"data": data, "pagination": pagination}
@@ -4,36 +4,44 @@ Symbols are normalized to uppercase and deduplicated.
 """
 from __future__ import annotations
 import re
-from typing import List
+from typing import Iterable, List, Optional
 
 # Match $TICKER or #TICKER. Ticker = letters/numbers, 1-10 chars (e.g. AAPL, BTC, SPY).
 # Allow common suffixes like .US for stocks; we strip and take the base symbol.
+# The class has no whitespace and caps the length at 10, so matches need no strip()
+# and always fit the DB column (symbol VARCHAR(20)).
 _PATTERN = re.compile(
     r"(?:\$|#)([A-Za-z0-9.]{1,10})\b",
     re.UNICODE,
 )
+_findall = _PATTERN.findall
 
-# Max length for a single symbol after normalization (DB: symbol VARCHAR(20))
-_MAX_SYMBOL_LEN = 20
+def _symbols(text: str) -> List[str]:
+    # findall returns the captured strings directly (no Match objects); dict keeps
+    # first-occurrence order while deduplicating. Matches are ASCII, so upper() per
+    # match is exact (uppercasing the whole text would change non-ASCII letters).
+    seen = dict.fromkeys(map(str.upper, _findall(text)))
+    if any(s.endswith(".US") for s in seen):
+        # Remove common suffix like .US for display/storage consistency
+        seen = dict.fromkeys(s[:-3] if s.endswith(".US") else s for s in seen)
+    seen.pop("", None)
+    return list(seen)
 
 def extract_tickers(text: str | None) -> List[str]:
     """
     Extract ticker symbols from text. Supports $TICKER and #TICKER.
     Returns a list of unique, uppercase symbols (order preserved, first occurrence).
     """
-    if not text or not text.strip():
+    # Fast path: most posts mention no ticker at all; skip the regex entirely.
+    if not text or ("$" not in text and "#" not in text):
         return []
+    return _symbols(text)
 
-    seen: set[str] = set()
-    result: List[str] = []
-    for m in _PATTERN.finditer(text):
-        raw = m.group(1).strip().upper()
-        # Remove common suffix like .US for display/storage consistency
-        if raw.endswith(".US"):
-            raw = raw[:-3]
-        if not raw or len(raw) > _MAX_SYMBOL_LEN:
-            continue
-        if raw not in seen:
-            seen.add(raw)
-            result.append(raw)
-    return result
+def extract_tickers_batch(texts: Iterable[Optional[str]]) -> List[List[str]]:
+    """
+    extract_tickers for many texts (e.g. backfills). Same result per text, one list per input.
+    """
+    return [
+        _symbols(t) if t and ("$" in t or "#" in t) else []
+        for t in texts
+    ]
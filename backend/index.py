@@ -1,7 +1,16 @@
 """
 Vercel serverless entrypoint. Exposes the FastAPI app so Vercel can run it.
 See: https://vercel.com/docs/frameworks/backend/fastapi
+Serverless instances are frozen between invocations, so they hold no pooled
+connections: NullPool unless DB_NULL_POOL is set explicitly, and run no background
+threads (activity write-behind, dashboard refresh) unless their settings are set.
 """
-from app.main import app
+import os
+
+os.environ.setdefault("DB_NULL_POOL", "true")
+os.environ.setdefault("DASHBOARD_REFRESH", "false")
+os.environ.setdefault("ACTIVITY_WRITE_BEHIND", "false")
+
+from app.main import app  # noqa: E402
 
 __all__ = ["app"]
@@ -0,0 +1,28 @@
+"""Shared fixtures."""
+from contextlib import contextmanager
+from typing import Optional
+
+import pytest
+from sqlalchemy.engine import Engine
+
+from app.services.query_audit import check_budget, record_queries
+
+
+@pytest.fixture
+def count_queries():
+    """
+    Record the SQL statements a block runs (on every engine unless one is given) and fail
+    the test with the grouped report when they exceed budget:
+
+        with count_queries(budget=3) as log:
+            ...
+    """
+
+    @contextmanager
+    def counter(budget: Optional[int] = None, engine=Engine):
+        with record_queries(engine) as log:
+            yield log
+        if budget is not None:
+            check_budget(log, budget)
+
+    return counter
@@ -0,0 +1,117 @@
+"""Unit tests for app.services.activity_buffer and the batched last_active_at update."""
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.services import activity_buffer as buffer_module
+from app.services.activity_buffer import ActivityBuffer
+from app.services.session_service import touch_users_activity_statement
+
+T0 = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+class _Writes:
+    """Session factory whose touch_users_activity calls are recorded (or fail)."""
+
+    def __init__(self, monkeypatch, fail=False):
+        self.batches = []
+        self.fail = fail
+
+        def fake_touch(db, activity):
+            if self.fail:
+                raise OSError("db down")
+            self.batches.append(dict(activity))
+            return len(activity)
+
+        monkeypatch.setattr(buffer_module, "touch_users_activity", fake_touch)
+
+    @contextmanager
+    def __call__(self):
+        yield object()
+
+
+def _buffer(writes):
+    buf = ActivityBuffer(session_factory=writes)
+    buf._thread = object()  # no background flusher; tests flush explicitly
+    return buf
+
+
+def test_update_is_one_statement_from_values():
+    """All users go in one UPDATE ... FROM (VALUES ...) guarded by the freshness check."""
+    sql = str(touch_users_activity_statement({uuid4(): T0, uuid4(): T0}).compile(dialect=postgresql.dialect()))
+    assert sql.startswith("UPDATE users SET last_active_at=v.ts FROM (VALUES (")
+    assert "AS v (id, ts) WHERE users.id = v.id" in sql
+    assert "users.last_active_at IS NULL OR users.last_active_at < v.ts - " in sql
+
+
+def test_records_coalesce_to_latest_time_per_user(monkeypatch):
+    """Many requests by one user between flushes become one row with the latest time."""
+    writes = _Writes(monkeypatch)
+    buf = _buffer(writes)
+    alice, bob = uuid4(), uuid4()
+    buf.record(alice, T0 + timedelta(seconds=2))
+    buf.record(alice, T0)
+    buf.record(bob, T0)
+    assert buf.flush() == 2
+    assert writes.batches == [{alice: T0 + timedelta(seconds=2), bob: T0}]
+    assert buf.flush() == 0
+
+
+def test_recently_written_users_are_skipped(monkeypatch):
+    """After a flush, the same user is not queued again within the resolution window."""
+    now = [100.0]
+    monkeypatch.setattr(buffer_module.time, "monotonic", lambda: now[0])
+    writes = _Writes(monkeypatch)
+    buf = _buffer(writes)
+    user = uuid4()
+    buf.record(user, T0)
+    buf.flush()
+    now[0] += 30
+    buf.record(user, T0 + timedelta(seconds=30))
+    assert buf.stats()["pending"] == 0 and buf.stats()["skipped"] == 1
+    now[0] += 31
+    buf.record(user, T0 + timedelta(seconds=61))
+    assert buf.stats()["pending"] == 1
+
+
+def test_failed_flush_is_requeued(monkeypatch):
+    """A DB error keeps the times for the next flush instead of losing them."""
+    writes = _Writes(monkeypatch, fail=True)
+    buf = _buffer(writes)
+    user = uuid4()
+    buf.record(user, T0)
+    assert buf.flush() == 0
+    writes.fail = False
+    assert buf.flush() == 1
+    assert writes.batches == [{user: T0}]
+
+
+def test_stop_flushes_pending(monkeypatch):
+    """Shutdown writes whatever is still buffered."""
+    writes = _Writes(monkeypatch)
+    buf = ActivityBuffer(flush_seconds=60, session_factory=writes)
+    buf.record(uuid4(), T0)
+    buf.stop()
+    assert len(writes.batches) == 1
+
+
+def test_record_after_stop_is_dropped(monkeypatch):
+    """Once stopped, records neither queue nor start a new flusher thread."""
+    writes = _Writes(monkeypatch)
+    buf = ActivityBuffer(flush_seconds=60, session_factory=writes)
+    buf.stop()
+    buf.record(uuid4(), T0)
+    assert buf.stats()["pending"] == 0 and buf._thread is None
+
+
+def test_without_write_behind_no_thread_is_started(monkeypatch):
+    """Serverless mode: records wait for an explicit flush (after the response), never a thread."""
+    writes = _Writes(monkeypatch)
+    buf = ActivityBuffer(session_factory=writes, write_behind=False)
+    buf.start()
+    user = uuid4()
+    buf.record(user, T0)
+    assert buf._thread is None
+    assert buf.flush() == 1 and writes.batches == [{user: T0}]
@@ -0,0 +1,103 @@
+"""Unit tests for the verified-token cache in app.services.auth_service."""
+import asyncio
+import time
+
+import jwt
+import pytest
+
+from app.services import auth_service
+from app.services.auth_service import AuthException, CurrentUser, verify_jwt
+
+SECRET = "test-secret-0123456789abcdef0123456789"
+OTHER_SECRET = "other-secret-0123456789abcdef012345678"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache(monkeypatch):
+    monkeypatch.setattr(auth_service.settings, "supabase_jwt_secret", SECRET)
+    auth_service.token_cache.clear()
+    yield
+    auth_service.token_cache.clear()
+
+
+def _token(exp_in=600, secret=SECRET, sub="user-1"):
+    return jwt.encode({"sub": sub, "exp": int(time.time()) + exp_in}, secret, algorithm="HS256")
+
+
+def _count_local(monkeypatch):
+    calls = []
+    real = auth_service._verify_locally
+
+    def counting(token):
+        calls.append(token)
+        return real(token)
+
+    monkeypatch.setattr(auth_service, "_verify_locally", counting)
+    return calls
+
+
+def _fake_api(monkeypatch, result):
+    calls = []
+
+    async def fake(token):
+        calls.append(token)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(auth_service, "_verify_via_supabase_api", fake)
+    return calls
+
+
+def test_valid_token_is_decoded_once(monkeypatch):
+    """Repeated requests with one token skip the HS256 decode after the first."""
+    calls = _count_local(monkeypatch)
+    token = _token()
+    first = asyncio.run(verify_jwt(token))
+    second = asyncio.run(verify_jwt(token))
+    assert first.auth_user_id == second.auth_user_id == "user-1"
+    assert len(calls) == 1
+
+
+def test_cached_user_expires_with_token(monkeypatch):
+    """A valid token is cached no longer than its exp."""
+    asyncio.run(verify_jwt(_token(exp_in=5)))
+    ((expires_at, _),) = auth_service.token_cache._data.values()
+    assert expires_at - time.monotonic() <= 5
+
+
+def test_expired_token_is_negatively_cached(monkeypatch):
+    """An expired token is rejected, and the rejection is served from the cache."""
+    calls = _count_local(monkeypatch)
+    token = _token(exp_in=-10)
+    for _ in range(2):
+        with pytest.raises(AuthException) as exc:
+            asyncio.run(verify_jwt(token))
+        assert exc.value.message == "Token has expired"
+    assert len(calls) == 1
+
+
+def test_api_fallback_result_is_cached(monkeypatch):
+    """Tokens the local secret cannot verify go to the Auth API once."""
+    api = _fake_api(monkeypatch, CurrentUser(auth_user_id="user-2", claims={}))
+    token = _token(secret=OTHER_SECRET, sub="user-2")
+    assert asyncio.run(verify_jwt(token)).auth_user_id == "user-2"
+    assert asyncio.run(verify_jwt(token)).auth_user_id == "user-2"
+    assert len(api) == 1
+
+
+def test_api_rejection_is_cached_but_outage_is_not(monkeypatch):
+    """A token Supabase rejects is cached as invalid; an unreachable API is retried."""
+    api = _fake_api(monkeypatch, None)
+    rejected = _token(secret=OTHER_SECRET)
+    for _ in range(2):
+        with pytest.raises(AuthException):
+            asyncio.run(verify_jwt(rejected))
+    assert len(api) == 1
+
+    api = _fake_api(monkeypatch, auth_service._AuthUnavailable("timeout"))
+    unlucky = _token(secret=OTHER_SECRET, sub="user-3")
+    for _ in range(2):
+        with pytest.raises(AuthException):
+            asyncio.run(verify_jwt(unlucky))
+    assert len(api) == 2
@@ -0,0 +1,32 @@
+"""Unit tests for the ticker backfill command (app.scripts.backfill_tickers)."""
+from uuid import UUID
+
+from app.scripts.backfill_tickers import Progress, diff_links, load_checkpoint, save_checkpoint
+
+P1 = UUID(int=1)
+P2 = UUID(int=2)
+
+
+def test_diff_links_adds_and_removes():
+    """Only symbols that changed per post are reported."""
+    desired = {P1: {"BTC", "ETH"}, P2: {"SOL"}}
+    existing = {P1: {"BTC", "AAPL.US"}, P2: {"SOL"}}
+    adds, removes = diff_links(desired, existing)
+    assert adds == [(P1, "ETH")]
+    assert removes == [(P1, "AAPL.US")]
+
+
+def test_diff_links_post_without_tickers_drops_all_links():
+    """A post whose content no longer matches loses every link."""
+    adds, removes = diff_links({}, {P2: {"DOGE", "XRP"}})
+    assert adds == []
+    assert removes == [(P2, "DOGE"), (P2, "XRP")]
+
+
+def test_checkpoint_round_trip(tmp_path):
+    """Missing checkpoint starts fresh; saved progress is read back unchanged."""
+    path = str(tmp_path / "checkpoint.json")
+    assert load_checkpoint(path) == Progress()
+    progress = Progress(last_post_id=str(P2), scanned=500, added=3, removed=1)
+    save_checkpoint(path, progress)
+    assert load_checkpoint(path) == progress
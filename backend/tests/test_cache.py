@@ -0,0 +1,92 @@
+"""Unit tests for app.utils.cache."""
+import threading
+import time
+
+import pytest
+
+from app.utils import cache as cache_module
+from app.utils.cache import TTLCache
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    """Values are returned until ttl seconds have passed."""
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    c = TTLCache(maxsize=10, ttl=30)
+    c.set("btc", 1)
+    now[0] += 29
+    assert c.get("btc") == 1
+    now[0] += 2
+    assert c.get("btc") is None
+    assert len(c) == 0
+
+
+def test_maxsize_evicts_least_recently_used():
+    """Inserting past maxsize evicts the entry read least recently."""
+    c = TTLCache(maxsize=2, ttl=60)
+    c.set("a", 1)
+    c.set("b", 2)
+    assert c.get("a") == 1
+    c.set("c", 3)
+    assert c.get("b") is None
+    assert (c.get("a"), c.get("c")) == (1, 3)
+    assert c.stats()["evictions"] == 1
+
+
+def test_get_or_compute_single_flight():
+    """Concurrent misses for one key run compute once; the others wait and share it."""
+    c = TTLCache(maxsize=10, ttl=60)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(2)
+        return "rows"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(c.get_or_compute("btc", compute)))
+    leader.start()
+    started.wait(2)
+    followers = [
+        threading.Thread(target=lambda: results.append(c.get_or_compute("btc", compute)))
+        for _ in range(3)
+    ]
+    for t in followers:
+        t.start()
+    deadline = time.monotonic() + 2
+    while c.coalesced < 3 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for t in [leader, *followers]:
+        t.join(2)
+    assert results == ["rows"] * 4
+    assert len(calls) == 1
+    assert c.get_or_compute("btc", compute) == "rows"
+    stats = c.stats()
+    assert (stats["misses"], stats["coalesced"], stats["hits"]) == (1, 3, 1)
+
+
+def test_get_or_compute_error_is_not_cached():
+    """A failed computation propagates and the next call retries."""
+    c = TTLCache(maxsize=10, ttl=60)
+
+    def boom():
+        raise RuntimeError("db down")
+
+    with pytest.raises(RuntimeError):
+        c.get_or_compute("k", boom)
+    assert c.get_or_compute("k", lambda: 5) == 5
+
+
+def test_invalidate_drops_one_key():
+    """invalidate removes only the given key; unknown keys are ignored."""
+    c = TTLCache(maxsize=10, ttl=60)
+    c.set("a", 1)
+    c.set("b", 2)
+    c.invalidate("a")
+    c.invalidate("missing")
+    assert c.get("a") is None
+    assert c.get("b") == 2
@@ -0,0 +1,36 @@
+"""Unit tests for app.utils.cursor."""
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.utils.cursor import decode_cursor, decode_score_cursor, encode_cursor, encode_score_cursor
+
+
+def test_encode_decode_round_trip():
+    """Decoding an encoded cursor returns the same sort key."""
+    created_at = datetime(2026, 1, 16, 10, 0, 0, 123456, tzinfo=timezone.utc)
+    item_id = uuid4()
+    assert decode_cursor(encode_cursor(created_at, item_id)) == (created_at, item_id)
+
+
+def test_encoded_cursor_is_url_safe():
+    """Cursors can go in a query string without escaping."""
+    cursor = encode_cursor(datetime.now(timezone.utc), uuid4())
+    assert all(c.isalnum() or c in "-_" for c in cursor)
+
+
+@pytest.mark.parametrize("bad", ["", "not-base64!", "Zm9v", encode_cursor.__name__])
+def test_decode_invalid_cursor_raises_value_error(bad):
+    """Malformed cursors raise ValueError."""
+    with pytest.raises(ValueError):
+        decode_cursor(bad)
+
+
+def test_score_cursor_round_trips_float_exactly():
+    """Ranked cursors keep the exact float so keyset comparisons stay stable."""
+    item_id = uuid4()
+    score = 0.1 + 0.2
+    assert decode_score_cursor(encode_score_cursor(score, item_id)) == (score, item_id)
+    with pytest.raises(ValueError):
+        decode_score_cursor(encode_cursor(datetime.now(timezone.utc), item_id))
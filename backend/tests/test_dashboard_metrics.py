@@ -0,0 +1,80 @@
+"""Unit tests for the cached, concurrently computed dashboard snapshot (app.services.metrics_service)."""
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+from app.services import metrics_service as m
+
+
+@pytest.fixture(autouse=True)
+def _empty_dashboard_cache():
+    m.dashboard_cache.clear()
+    yield
+    m.dashboard_cache.clear()
+
+
+def _fake_queries(monkeypatch, calls):
+    both_running = threading.Barrier(2, timeout=5)
+
+    def query(name, value, wait=False):
+        def run(db, **kwargs):
+            calls.append((name, db))
+            if wait:
+                both_running.wait()  # only returns once the other waiting query runs too
+            return value
+        return run
+
+    daily = {"dau": 5, "mau": 40, "posts_today": 2, "posts_7d": 9, "posts_30d": 30,
+             "new_users_today": 1, "new_users_7d": 3, "new_users_30d": 8}
+    monkeypatch.setattr(m, "get_daily_metrics", query("daily", daily, wait=True))
+    monkeypatch.setattr(m, "get_total_users", query("total_users", 100, wait=True))
+    monkeypatch.setattr(m, "get_engagement_metrics", query("engagement", None))
+    monkeypatch.setattr(m, "get_growth_counts", query("growth", {
+        "users_7d": 6, "users_14d": 10, "users_30d": 20, "users_60d": 20,
+        "posts_7d": 0, "posts_14d": 0, "posts_30d": 0, "posts_60d": 0,
+    }))
+    monkeypatch.setattr(m, "get_error_counts", query("errors", {"total_today": 1}))
+    monkeypatch.setattr(m, "get_trending_metrics", query("trending", {"trending_tickers": []}))
+
+
+def test_snapshot_runs_each_query_once_concurrently_in_own_sessions(monkeypatch):
+    """daily_metrics and the user count are read once and shared; queries overlap."""
+    calls, sessions = [], []
+
+    @contextmanager
+    def session_factory():
+        sessions.append(object())
+        yield sessions[-1]
+
+    _fake_queries(monkeypatch, calls)
+    snapshot = m.compute_dashboard_metrics(session_factory)
+    assert sorted(name for name, _ in calls) == [
+        "daily", "engagement", "errors", "growth", "total_users", "trending",
+    ]
+    assert len({id(db) for _, db in calls}) == len(calls) == len(sessions)
+    assert snapshot["user_metrics"]["total_users"] == snapshot["platform_health"]["total_users"] == 100
+    assert snapshot["engagement_metrics"]["total_posts_period"] == {"today": 2, "this_week": 9, "this_month": 30}
+    assert snapshot["growth_metrics"]["user_growth"] == {"week_over_week": 0.5, "month_over_month": 20.0}
+
+
+def test_dashboard_is_served_from_cache_with_live_runtime_health(monkeypatch):
+    """Page loads reuse the snapshot until the refresher replaces it; runtime health is per call."""
+    computed = []
+
+    def compute():
+        computed.append(1)
+        return {"trending": None, "platform_health": {"errors": {}, "total_users": len(computed)}}
+
+    runtime = iter(range(100))
+    monkeypatch.setattr(m, "compute_dashboard_metrics", compute)
+    monkeypatch.setattr(m, "_runtime_health", lambda: {"api": next(runtime)})
+    first, second = m.get_dashboard_metrics(), m.get_dashboard_metrics()
+    assert len(computed) == 1
+    assert first["platform_health"] == {"api": 0, "errors": {}, "total_users": 1}
+    assert second["platform_health"]["api"] == 1
+
+    m.DashboardRefresher().refresh()
+    assert m.get_dashboard_metrics()["platform_health"]["total_users"] == 2
+    assert len(computed) == 2
+    assert m.get_cache_metrics()["dashboard"]["hits"] == 2
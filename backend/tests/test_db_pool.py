@@ -0,0 +1,81 @@
+"""Unit tests for app.utils.db_pool."""
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool, QueuePool
+
+from app.utils import db_pool
+from app.utils.db_pool import async_database_url, engine_options, install_idle_ping, pool_status
+
+
+def _settings(**overrides):
+    values = dict(
+        db_null_pool=False,
+        db_pool_size=7,
+        db_max_overflow=3,
+        db_pool_timeout=5.0,
+        db_pool_recycle=600,
+        db_connect_timeout=4,
+        db_transaction_pooler=False,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_pooled_and_null_pool_options():
+    """Pool sizing comes from settings; DB_NULL_POOL swaps in NullPool without sizing."""
+    pooled = engine_options(_settings(), "psycopg2")
+    assert pooled["pool_size"] == 7 and pooled["max_overflow"] == 3
+    assert pooled["pool_recycle"] == 600 and pooled["pool_timeout"] == 5.0
+    assert pooled["connect_args"] == {"connect_timeout": 4}
+    assert "pool_pre_ping" not in pooled
+    null = engine_options(_settings(db_null_pool=True), "psycopg2")
+    assert null["poolclass"] is NullPool and "pool_size" not in null
+
+
+def test_transaction_pooler_disables_asyncpg_prepared_statement_reuse():
+    """Behind a transaction pooler asyncpg caches nothing and names statements uniquely."""
+    args = engine_options(_settings(db_transaction_pooler=True), "asyncpg")["connect_args"]
+    assert args["statement_cache_size"] == 0 and args["timeout"] == 4
+    names = {args["prepared_statement_name_func"]() for _ in range(3)}
+    assert len(names) == 3
+    assert "statement_cache_size" not in engine_options(_settings(), "asyncpg")["connect_args"]
+    url = async_database_url("postgresql://u:p@pooler:6543/db?sslmode=require", transaction_pooler=True)
+    assert url.drivername == "postgresql+asyncpg"
+    assert dict(url.query) == {"ssl": "require", "prepared_statement_cache_size": "0"}
+
+
+def test_connections_are_pinged_only_after_idling(monkeypatch):
+    """Recently used connections skip the ping; idle ones are pinged and replaced if dead."""
+    now = [1000.0]
+    monkeypatch.setattr(db_pool.time, "monotonic", lambda: now[0])
+    engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=1, max_overflow=0)
+    install_idle_ping(engine, idle_seconds=30)
+    pings = []
+
+    def ping(dbapi_connection):
+        pings.append(dbapi_connection)
+        raise RuntimeError("server closed the connection")
+
+    monkeypatch.setattr(engine.dialect, "do_ping", ping)
+    with engine.connect() as conn:
+        first = conn.connection.dbapi_connection
+        conn.execute(text("SELECT 1"))
+    now[0] += 10
+    with engine.connect() as conn:
+        assert conn.connection.dbapi_connection is first and pings == []
+    now[0] += 31
+    with engine.connect() as conn:
+        assert pings == [first]
+        assert conn.connection.dbapi_connection is not first
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+
+
+def test_pool_status():
+    """QueuePool reports usage; NullPool only its class."""
+    engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=2)
+    with engine.connect():
+        assert pool_status(engine) == {
+            "pool": "QueuePool", "size": 2, "checked_out": 1, "checked_in": 0, "overflow": 0,
+        }
+    assert pool_status(create_engine("sqlite://", poolclass=NullPool)) == {"pool": "NullPool"}
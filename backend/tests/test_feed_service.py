@@ -0,0 +1,32 @@
+"""Unit tests for the watchlist feed merge in app.services.feed_service."""
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from app.services.feed_service import merge_timelines
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _key(minutes_ago: int, n: int):
+    return (T0 - timedelta(minutes=minutes_ago), UUID(int=n))
+
+
+def test_merge_orders_newest_first_and_dedupes():
+    """Posts mentioning several watched tickers appear once, in timeline order."""
+    btc = [_key(1, 1), _key(3, 3), _key(5, 5)]
+    eth = [_key(2, 2), _key(3, 3), _key(6, 6)]
+    keys = merge_timelines([btc, eth], limit=10)
+    assert [k[1].int for k in keys] == [1, 2, 3, 5, 6]
+
+
+def test_merge_breaks_time_ties_by_post_id_and_respects_limit():
+    """Equal timestamps order by post id ascending, matching the keyset cursor."""
+    a = [_key(1, 4), _key(2, 7)]
+    b = [_key(1, 2), _key(2, 9)]
+    keys = merge_timelines([a, b], limit=3)
+    assert [k[1].int for k in keys] == [2, 4, 7]
+
+
+def test_merge_empty():
+    """No watched tickers yields no keys."""
+    assert merge_timelines([], limit=5) == []
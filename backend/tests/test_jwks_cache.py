@@ -0,0 +1,108 @@
+"""Unit tests for app.services.jwks_cache and JWKS verification in verify_jwt."""
+import asyncio
+import json
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jwt.algorithms import ECAlgorithm, RSAAlgorithm
+
+from app.services import auth_service, jwks_cache as jwks_module
+from app.services.auth_service import AuthException, verify_jwt
+from app.services.jwks_cache import JWKSCache
+
+RSA_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+EC_KEY = ec.generate_private_key(ec.SECP256R1())
+
+
+def _jwk(private_key, kid):
+    algorithm = RSAAlgorithm if isinstance(private_key, rsa.RSAPrivateKey) else ECAlgorithm
+    jwk = algorithm.to_jwk(private_key.public_key(), as_dict=True)
+    jwk["kid"] = kid
+    return jwk
+
+
+def _token(private_key, kid, alg, exp_in=600):
+    claims = {"sub": "user-1", "exp": int(time.time()) + exp_in}
+    return jwt.encode(claims, private_key, algorithm=alg, headers={"kid": kid})
+
+
+@pytest.fixture(autouse=True)
+def _no_api(monkeypatch):
+    """Fail loudly if verification reaches the Supabase Auth API."""
+    async def unexpected(token):
+        raise AssertionError("network fallback used")
+
+    monkeypatch.setattr(auth_service, "_verify_via_supabase_api", unexpected)
+    auth_service.token_cache.clear()
+    yield
+    auth_service.token_cache.clear()
+
+
+def _use(monkeypatch, cache):
+    monkeypatch.setattr(auth_service, "jwks_cache", cache)
+    return cache
+
+
+def test_rs256_and_es256_verify_locally_from_file(monkeypatch, tmp_path):
+    """Tokens signed with keys listed in a local JWKS file verify without the network."""
+    path = tmp_path / "jwks.json"
+    path.write_text(json.dumps({"keys": [_jwk(RSA_KEY, "rsa-1"), _jwk(EC_KEY, "ec-1")]}))
+    _use(monkeypatch, JWKSCache(path=str(path)))
+    assert asyncio.run(verify_jwt(_token(RSA_KEY, "rsa-1", "RS256"))).auth_user_id == "user-1"
+    assert asyncio.run(verify_jwt(_token(EC_KEY, "ec-1", "ES256"))).auth_user_id == "user-1"
+
+
+def test_known_kid_with_bad_signature_is_rejected(monkeypatch):
+    """A token whose signature does not match the published key fails locally."""
+    other = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    async def fetch():
+        return {"keys": [_jwk(RSA_KEY, "rsa-1")]}
+
+    _use(monkeypatch, JWKSCache(fetch=fetch))
+    with pytest.raises(AuthException):
+        asyncio.run(verify_jwt(_token(other, "rsa-1", "RS256")))
+
+
+def test_unknown_kid_refetches_once_per_interval(monkeypatch):
+    """A rotated key is picked up by re-fetching; repeated unknown kids do not hammer the URL."""
+    now = [1000.0]
+    monkeypatch.setattr(jwks_module.time, "monotonic", lambda: now[0])
+    documents = [{"keys": [_jwk(RSA_KEY, "old")]}, {"keys": [_jwk(RSA_KEY, "old"), _jwk(EC_KEY, "new")]}]
+    fetches = []
+
+    async def fetch():
+        fetches.append(1)
+        return documents[min(len(fetches), len(documents)) - 1]
+
+    cache = JWKSCache(fetch=fetch)
+    assert asyncio.run(cache.get_key("old")) is not None
+    assert asyncio.run(cache.get_key("new")) is None  # just fetched; too soon to retry
+    now[0] += jwks_module.MIN_REFETCH_SECONDS
+    assert asyncio.run(cache.get_key("new")) is not None
+    assert asyncio.run(cache.get_key("missing")) is None
+    assert len(fetches) == 2
+
+
+def test_failed_fetch_keeps_cached_keys(monkeypatch):
+    """A JWKS outage leaves the previously loaded keys in service."""
+    async def failing():
+        raise OSError("unreachable")
+
+    cache = JWKSCache(fetch=failing)
+    cache.load({"keys": [_jwk(RSA_KEY, "rsa-1")]})
+    asyncio.run(cache.refresh())
+    assert asyncio.run(cache.get_key("rsa-1")) is not None
+    assert cache.stats()["failures"] == 1
+
+
+def test_load_ignores_symmetric_and_encryption_keys():
+    """Only RS256/ES256 signing keys are kept."""
+    cache = JWKSCache()
+    cache.load({"keys": [
+        {"kty": "oct", "kid": "hs", "k": "c2VjcmV0"},
+        dict(_jwk(RSA_KEY, "enc"), use="enc"),
+        _jwk(RSA_KEY, "sig"),
+    ]})
+    assert cache.stats()["keys"] == 1
@@ -0,0 +1,68 @@
+"""Unit tests for app.services.prometheus_export."""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from app.services import telemetry as telemetry_module
+from app.services.prometheus_export import render_prometheus
+from app.services.telemetry import instrument_engine, merge_snapshots, outbound_call, telemetry
+
+
+@pytest.fixture(autouse=True)
+def _reset(monkeypatch):
+    telemetry.reset()
+    monkeypatch.setattr(telemetry_module, "_engines", {})
+    monkeypatch.setattr(telemetry_module, "_cache_counters", lambda: {"search_results": {"hits": 3, "misses": 1, "size": 2}})
+    yield
+    telemetry.reset()
+
+
+def _scrape():
+    queries = telemetry.begin_request("/api/v1/posts/1")[1]
+    telemetry.observe_request("GET /api/v1/posts/{post_id}", 200, 7.0, queries)
+    telemetry.observe_request("GET /api/v1/posts/{post_id}", 500, 700.0, queries)
+    telemetry.observe_request('GET /odd"path', 200, 1.0, queries)
+    return render_prometheus(merge_snapshots([telemetry.snapshot()]))
+
+
+def test_request_histogram_is_cumulative_in_seconds():
+    """Buckets are cumulative with le in seconds; +Inf equals _count."""
+    text = _scrape()
+    labels = 'method="GET",route="/api/v1/posts/{post_id}"'
+    assert f'pageshare_http_request_duration_seconds_bucket{{{labels},le="0.01"}} 1' in text
+    assert f'pageshare_http_request_duration_seconds_bucket{{{labels},le="1.0"}} 2' in text
+    assert f'pageshare_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"pageshare_http_request_duration_seconds_count{{{labels}}} 2" in text
+    assert f"pageshare_http_request_errors_total{{{labels}}} 1" in text
+    assert 'route="/odd\\"path"' in text
+
+
+def test_families_are_contiguous_and_typed():
+    """Every sample follows its own # TYPE line and no family is split."""
+    seen, current = [], None
+    for line in _scrape().splitlines():
+        if line.startswith("# TYPE"):
+            current = line.split()[2]
+            assert current not in seen
+            seen.append(current)
+        elif not line.startswith("#"):
+            name = line.split("{")[0].split(" ")[0]
+            assert name.startswith(current)
+
+
+def test_pool_cache_and_outbound_metrics():
+    """QueuePool gauges, cache ratios and outbound latency/errors are exported."""
+    engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=3)
+    instrument_engine(engine)
+    with engine.connect():
+        with outbound_call("gnews"):
+            pass
+        with pytest.raises(OSError):
+            with outbound_call("ip-api"):
+                raise OSError("timeout")
+        text = _scrape()
+    assert 'pageshare_db_pool_checked_out{engine="primary"} 1' in text
+    assert 'pageshare_db_pool_size{engine="primary"} 3' in text
+    assert 'pageshare_cache_hit_ratio{cache="search_results"} 0.75' in text
+    assert 'pageshare_outbound_request_duration_seconds_count{service="gnews"} 1' in text
+    assert 'pageshare_outbound_request_errors_total{service="ip-api"} 1' in text
@@ -0,0 +1,102 @@
+"""Unit tests for app.services.query_audit and the count_queries fixture."""
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.middleware.logging import RequestLoggingMiddleware
+from app.models import Base
+from app.models.reaction import Reaction
+from app.models.repost import Repost
+from app.services.post_service import _get_user_interactions
+from app.services.query_audit import QueryBudgetExceeded, statement_shape
+from app.services import telemetry
+from app.services.telemetry import instrument_engine
+
+
+def _engine():
+    # One shared connection, so routes running in the threadpool see the same database.
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.execute(text("INSERT INTO items VALUES (1, 'a'), (2, 'b'), (3, 'c'), (4, 'd')"))
+    return engine
+
+
+def test_shape_collapses_literals_parameters_and_in_lists():
+    """Statements differing only in values share one shape; casts are left alone."""
+    a = statement_shape("SELECT * FROM posts WHERE id IN (%(id_1)s, %(id_2)s) AND n > 5")
+    b = statement_shape("SELECT *\n  FROM posts WHERE id IN (%(id_1)s) AND n > 10")
+    assert a == b == "SELECT * FROM posts WHERE id IN (?) AND n > ?"
+    assert statement_shape("SELECT $1::uuid, 'x'") == "SELECT ?::uuid, ?"
+
+
+def test_repeated_statements_are_grouped_with_their_call_site(count_queries):
+    """A per-row loop shows up as one shape, counted, pointing at the line that ran it."""
+    engine = _engine()
+    with count_queries(engine=engine) as log, engine.connect() as conn:
+        ids = [r[0] for r in conn.execute(text("SELECT id FROM items"))]
+        for item_id in ids:
+            conn.execute(text("SELECT name FROM items WHERE id = :id"), {"id": item_id})
+    assert log.count == 5
+    shape, n, sites = log.repeated()[0]
+    assert (shape, n) == ("SELECT name FROM items WHERE id = ?", 4)
+    (site,) = sites
+    assert site.startswith("tests/test_query_audit.py:") and site.endswith("in test_repeated_statements_are_grouped_with_their_call_site")
+
+
+def test_budget_failure_names_the_offending_statements(count_queries):
+    """Going over budget fails with the grouped report."""
+    engine = _engine()
+    with pytest.raises(QueryBudgetExceeded) as exc:
+        with count_queries(budget=2, engine=engine), engine.connect() as conn:
+            for item_id in range(1, 5):
+                conn.execute(text("SELECT name FROM items WHERE id = :id"), {"id": item_id})
+    message = str(exc.value)
+    assert "ran 4 SQL statements (budget 2)" in message
+    assert "4x SELECT name FROM items WHERE id = ?" in message
+
+
+def test_user_interactions_cost_one_statement_at_any_page_size(count_queries):
+    """Liked/reposted flags for a page of posts are one round trip, however many posts."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Reaction.__table__, Repost.__table__])
+    user_id, now = uuid4(), datetime.now(timezone.utc)
+    post_ids = [uuid4() for _ in range(40)]
+    with Session(engine) as db:
+        db.add(Reaction(id=uuid4(), user_id=user_id, post_id=post_ids[0], created_at=now))
+        db.add(Repost(id=uuid4(), user_id=user_id, post_id=post_ids[1], type="normal", created_at=now))
+        db.commit()
+        for page in (post_ids[:1], post_ids):
+            with count_queries(budget=1, engine=engine):
+                flags = _get_user_interactions(db, user_id, page)
+        assert flags[post_ids[0]] == (True, False)
+        assert flags[post_ids[1]] == (False, True)
+        assert flags[post_ids[2]] == (False, False)
+
+
+def test_dev_mode_logs_requests_with_repeated_statements(caplog, monkeypatch):
+    """With the audit on, the middleware reports an N+1 route with its call site."""
+    engine = _engine()
+    # Register on a copy, so the temporary engine leaves no pool gauges behind.
+    monkeypatch.setattr(telemetry, "_engines", dict(telemetry._engines))
+    instrument_engine(engine, name="audit-test")
+    app = FastAPI()
+    app.add_middleware(RequestLoggingMiddleware, query_audit=True)
+
+    @app.get("/items")
+    def items():
+        with engine.connect() as conn:
+            return [conn.execute(text("SELECT name FROM items WHERE id = :id"), {"id": i}).scalar() for i in range(1, 5)]
+
+    caplog.set_level("WARNING", logger="pageshare.query_audit")
+    assert TestClient(app).get("/items").json() == ["a", "b", "c", "d"]
+    (record,) = caplog.records
+    message = record.getMessage()
+    assert message.startswith("QUERY AUDIT GET /items: 4 statements")
+    assert "4x at tests/test_query_audit.py:" in message
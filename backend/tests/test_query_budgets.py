@@ -0,0 +1,133 @@
+"""
+Endpoint SQL statement budgets (QUERY_BUDGETS) against a real database.
+
+Needs TEST_DATABASE_URL: a scratch Postgres database. The tests migrate it to head, add
+their own users/posts/ticker and remove them afterwards. Skipped when it is not set.
+"""
+import os
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.config import BASE_DIR
+from app.services.query_audit import QUERY_BUDGETS
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "")
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="needs TEST_DATABASE_URL (scratch Postgres database)")
+
+POSTS = 25
+
+
+def _migrate() -> None:
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(BASE_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BASE_DIR / "alembic"))
+    command.upgrade(config, "head")
+
+
+def _seed(db):
+    """alice writes POSTS posts (tickers, a quote repost); bob likes and replies to each."""
+    from app.models.comment import Comment
+    from app.models.post import Post
+    from app.models.post_ticker import PostTicker
+    from app.models.reaction import Reaction
+    from app.models.ticker import Ticker
+    from app.models.user import User
+
+    suffix = uuid4().hex[:8]
+    alice = User(id=uuid4(), username=f"budget_a_{suffix}", display_name="Alice")
+    bob = User(id=uuid4(), username=f"budget_b_{suffix}", display_name="Bob")
+    ticker = Ticker(id=uuid4(), symbol=f"BGT{suffix.upper()}", type="other")
+    db.add_all([alice, bob, ticker])
+    db.flush()
+    now = datetime.now(timezone.utc)
+    posts = [
+        Post(id=uuid4(), user_id=alice.id, content=f"budget post {i}", created_at=now - timedelta(minutes=i))
+        for i in range(POSTS)
+    ]
+    db.add_all(posts)
+    db.flush()
+    db.add(Post(
+        id=uuid4(), user_id=bob.id, content="quoted", original_post_id=posts[0].id,
+        repost_type="quote", created_at=now,
+    ))
+    for post in posts:
+        db.add(PostTicker(post_id=post.id, ticker_id=ticker.id, post_created_at=post.created_at))
+        db.add(Reaction(user_id=bob.id, post_id=post.id))
+        db.add(Comment(post_id=post.id, user_id=bob.id, content="reply"))
+    db.commit()
+    return alice.id, bob.id, ticker.id
+
+
+def _cleanup(db, user_ids, ticker_id):
+    from app.models.comment import Comment
+    from app.models.post import Post
+    from app.models.post_ticker import PostTicker
+    from app.models.reaction import Reaction
+    from app.models.ticker import Ticker
+    from app.models.ticker_mention_bucket import TickerMentionBucket
+    from app.models.user import User
+
+    post_ids = [p for (p,) in db.query(Post.id).filter(Post.user_id.in_(user_ids))]
+    db.query(Comment).filter(Comment.user_id.in_(user_ids)).delete(synchronize_session=False)
+    db.query(Reaction).filter(Reaction.user_id.in_(user_ids)).delete(synchronize_session=False)
+    db.query(PostTicker).filter(
+        PostTicker.post_id.in_(post_ids) | (PostTicker.ticker_id == ticker_id)
+    ).delete(synchronize_session=False)
+    db.query(TickerMentionBucket).filter(TickerMentionBucket.ticker_id == ticker_id).delete(synchronize_session=False)
+    db.query(Ticker).filter(Ticker.id == ticker_id).delete(synchronize_session=False)
+    db.query(Post).filter(Post.original_post_id.in_(post_ids)).delete(synchronize_session=False)
+    db.query(Post).filter(Post.id.in_(post_ids)).delete(synchronize_session=False)
+    db.query(User).filter(User.id.in_(user_ids)).delete(synchronize_session=False)
+    db.commit()
+
+
+@pytest.fixture(scope="module")
+def api():
+    """TestClient on the real app and database, authenticated as bob."""
+    from fastapi.testclient import TestClient
+
+    from app.config import get_settings
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("DATABASE_URL", TEST_DATABASE_URL)
+        get_settings.cache_clear()
+        _migrate()
+        from app.database import SessionLocal
+        from app.main import app
+        from app.middleware.auth import get_current_user, get_optional_user
+        from app.services.auth_service import CurrentUser
+
+        with SessionLocal() as db:
+            alice_id, bob_id, ticker_id = _seed(db)
+        bob = CurrentUser(auth_user_id=str(bob_id), claims={})
+        app.dependency_overrides[get_current_user] = lambda: bob
+        app.dependency_overrides[get_optional_user] = lambda: bob
+        try:
+            yield TestClient(app), {"alice": alice_id, "bob": bob_id}
+        finally:
+            app.dependency_overrides.clear()
+            with SessionLocal() as db:
+                _cleanup(db, [alice_id, bob_id], ticker_id)
+            get_settings.cache_clear()
+
+
+@pytest.mark.parametrize("route, path", [
+    ("GET /api/v1/feed", "/api/v1/feed"),
+    ("GET /api/v1/posts", "/api/v1/posts"),
+    ("GET /api/v1/users/{user_id}/likes", "/api/v1/users/{bob}/likes"),
+    ("GET /api/v1/users/{user_id}/replies", "/api/v1/users/{bob}/replies"),
+])
+def test_endpoint_statement_count_does_not_grow_with_page_size(api, count_queries, route, path):
+    """A full page of 1 and of 20 posts both fit the route's budget (no per-row queries)."""
+    client, ids = api
+    url = path.format(**ids)
+    client.get(url, params={"per_page": 1})  # load lazily warmed caches (tickers) first
+    for per_page in (1, 20):
+        with count_queries(budget=QUERY_BUDGETS[route]):
+            r = client.get(url, params={"per_page": per_page})
+        assert r.status_code == 200
+        assert len(r.json()["data"]) == per_page
@@ -0,0 +1,94 @@
+"""Unit tests for read-replica routing (app.utils.read_routing, ReadYourWritesMiddleware)."""
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.config import Settings
+from app.middleware.read_routing import ReadYourWritesMiddleware
+from app.utils import read_routing
+from app.utils.read_routing import PRIMARY_HEADER, pinned_to_primary, read_session_dependency, sign_pin
+
+SECRET = "test-pin-secret"
+
+
+def test_pin_tokens_are_signed_and_expire():
+    """Only unexpired tokens with a valid signature, no further out than allowed, pin."""
+    now = 1_000_000.0
+    token = sign_pin(int(now + 5), SECRET)
+    assert pinned_to_primary(token, SECRET, 5, now=now)
+    assert not pinned_to_primary(token, SECRET, 5, now=now + 6)
+    assert not pinned_to_primary(token, "other-secret", 5, now=now)
+    assert not pinned_to_primary(f"{int(now + 5)}.{'0' * 32}", SECRET, 5, now=now)
+    assert not pinned_to_primary(sign_pin(int(now + 3600), SECRET), SECRET, 5, now=now)
+    assert not pinned_to_primary("garbage", SECRET, 5, now=now)
+    assert not pinned_to_primary(None, SECRET, 5, now=now)
+
+
+def _database(path, name):
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE source (name TEXT)"))
+        conn.execute(text("INSERT INTO source VALUES (:name)"), {"name": name})
+    return sessionmaker(bind=engine)
+
+
+def _app(tmp_path):
+    primary = _database(tmp_path / "primary.db", "primary")
+    replica = _database(tmp_path / "replica.db", "replica")
+    get_read_db = read_session_dependency(primary, replica, SECRET, sticky_seconds=5)
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, secret=SECRET, sticky_seconds=5)
+
+    @app.get("/source")
+    def source(db=Depends(get_read_db)):
+        return db.execute(text("SELECT name FROM source")).scalar()
+
+    @app.post("/write")
+    def write():
+        return {}
+
+    @app.post("/rejected")
+    def rejected():
+        raise HTTPException(status_code=400, detail="no")
+
+    return app
+
+
+def test_reads_go_to_the_replica_until_the_client_writes(tmp_path, monkeypatch):
+    """A successful write pins the client (cookie or header) to the primary for a few seconds."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(read_routing.time, "time", lambda: now[0])
+    monkeypatch.setattr("app.middleware.read_routing.time.time", lambda: now[0])
+    client = TestClient(_app(tmp_path), base_url="https://testserver")
+    assert client.get("/source").json() == "replica"
+
+    r = client.post("/rejected")
+    assert r.status_code == 400 and PRIMARY_HEADER not in r.headers
+    assert client.get("/source").json() == "replica"
+
+    r = client.post("/write")
+    token = r.headers[PRIMARY_HEADER]
+    assert "pageshare_primary=" in r.headers["set-cookie"]
+    assert client.get("/source").json() == "primary"  # cookie
+    other = TestClient(client.app, base_url="https://testserver")
+    assert other.get("/source", headers={PRIMARY_HEADER: token}).json() == "primary"  # header
+    assert other.get("/source").json() == "replica"
+
+    now[0] += 6
+    assert client.get("/source").json() == "replica"
+
+
+def test_replica_requires_a_shared_pin_secret(monkeypatch):
+    """With a replica configured, a missing pin secret fails at startup instead of per worker."""
+    monkeypatch.setenv("APP_ENV", "dev")
+    monkeypatch.setenv("DATABASE_READ_URL", "postgresql://replica/db")
+    monkeypatch.setenv("READ_PIN_SECRET", "")
+    monkeypatch.setenv("SUPABASE_JWT_SECRET", "")
+    with pytest.raises(RuntimeError, match="READ_PIN_SECRET"):
+        Settings()
+    monkeypatch.setenv("SUPABASE_JWT_SECRET", "jwt-secret")
+    assert Settings().read_pin_secret == "jwt-secret"
+    monkeypatch.setenv("READ_PIN_SECRET", SECRET)
+    assert Settings().read_pin_secret == SECRET
@@ -0,0 +1,52 @@
+"""Unit tests for app.services.recent_search_service (SQL is compiled, not executed)."""
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.services import recent_search_service
+from app.services.recent_search_service import (
+    MAX_RECENT,
+    RecentSearchEntry,
+    list_recent_searches,
+    upsert_recent_search_statement,
+)
+
+
+def _entry(result_id):
+    return RecentSearchEntry(uuid4(), "ticker", result_id, result_id, None, None, datetime.now(timezone.utc))
+
+
+def test_add_is_one_upsert_with_window_trim():
+    """The upsert bumps created_at on conflict and trims via row_number in the same statement."""
+    stmt = upsert_recent_search_statement(uuid4(), "ticker", "NVDA", "nvda", None, None)
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("WITH trimmed AS \n(DELETE FROM recent_searches")
+    assert "row_number() OVER (ORDER BY recent_searches.created_at DESC" in sql
+    assert "ON CONFLICT (user_id, type, result_id) DO UPDATE SET" in sql
+    assert "created_at = now()" in sql
+    assert "RETURNING recent_searches.id" in sql
+
+
+def test_trim_excludes_upserted_row_and_keeps_max_minus_one():
+    """Other rows ranked MAX_RECENT and later are deleted, leaving room for the upserted one."""
+    stmt = upsert_recent_search_statement(uuid4(), "ticker", "NVDA", "nvda", None, None)
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    assert "NOT (recent_searches.type = %(type_1)s AND recent_searches.result_id = %(result_id_1)s)" in str(compiled)
+    assert compiled.params["rn_1"] == MAX_RECENT
+
+
+def test_list_reads_the_database_every_time_with_clamped_limit(monkeypatch):
+    """Lists are not cached (a write in another worker must show up at once); limit is clamped."""
+    loads = []
+    rows = (_entry("NVDA"),)
+
+    def fake_load(db, user_id, limit):
+        loads.append(limit)
+        return rows
+
+    monkeypatch.setattr(recent_search_service, "_load_recent_searches", fake_load)
+    user_id = uuid4()
+    assert list_recent_searches(None, user_id) == list(rows)
+    assert list_recent_searches(None, user_id, limit=500) == list(rows)
+    assert loads == [MAX_RECENT, 50]
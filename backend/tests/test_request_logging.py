@@ -0,0 +1,40 @@
+"""Unit tests for the raw ASGI RequestLoggingMiddleware."""
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.logging import init_request_logging
+
+
+def _app():
+    app = FastAPI()
+    init_request_logging(app)
+
+    @app.get("/id")
+    async def request_id(request: Request):
+        return {"request_id": request.state.request_id}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"chunk{i}\n".encode()
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+def test_request_id_is_shared_with_route_and_returned():
+    """The id set on scope state is visible to the route and echoed in X-Request-ID."""
+    r = TestClient(_app()).get("/id")
+    assert r.headers["X-Request-ID"] == r.json()["request_id"]
+
+
+def test_streaming_response_passes_through(caplog):
+    """Streamed bodies arrive intact and the request is logged once it completes."""
+    caplog.set_level("INFO", logger="pageshare.request")
+    r = TestClient(_app()).get("/stream")
+    assert r.text == "chunk0\nchunk1\nchunk2\n"
+    assert "X-Request-ID" in r.headers
+    assert any("GET /stream" in rec.getMessage() for rec in caplog.records)
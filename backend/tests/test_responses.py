@@ -22,3 +22,17 @@ def test_paginated_response_explicit_has_next():
     """Explicit has_next is respected."""
     result = paginated_response([], page=1, per_page=10, total=100, has_next=False)
     assert result["pagination"]["has_next"] is False
+
+
+def test_paginated_response_includes_cursor_only_when_given():
+    """Keyset pages carry pagination.cursor; offset pages keep the old shape."""
+    with_cursor = paginated_response([], page=1, per_page=10, total=None, has_next=True, cursor="abc")
+    assert with_cursor["pagination"]["cursor"] == "abc"
+    assert with_cursor["pagination"]["total"] is None
+    assert "cursor" not in paginated_response([], page=1, per_page=10, total=5)["pagination"]
+
+
+def test_paginated_response_without_total_defaults_has_next_false():
+    """Unknown total never reports has_next unless the caller says so."""
+    result = paginated_response([], page=1, per_page=10, total=None)
+    assert result["pagination"]["has_next"] is False
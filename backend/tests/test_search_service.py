@@ -0,0 +1,145 @@
+"""Unit tests for app.services.search_service (SQL is compiled, not executed)."""
+from sqlalchemy.dialects import postgresql
+
+from app.services import search_service
+from app.services.search_service import _like_escape
+
+
+class _CaptureSession:
+    """Records the candidate count statement; page query returns no rows."""
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+
+        class _Result:
+            def scalar_one(self):
+                return 0
+
+        return _Result()
+
+    def query(self, *_):
+        class _Query:
+            def __getattr__(self, _name):
+                return lambda *a, **k: self
+
+            def all(self):
+                return []
+
+        return _Query()
+
+
+def test_like_escape_makes_wildcards_literal():
+    """%, _ and backslash in user input are escaped for LIKE ... ESCAPE '\\'."""
+    assert _like_escape("a_b%c\\") == "a\\_b\\%c\\\\"
+
+
+def test_short_query_is_exact_plus_prefix_only():
+    """Queries shorter than TRGM_MIN_LEN skip trigram matching."""
+    db = _CaptureSession()
+    search_service.search_users(db, "jo")
+    sql = db.statements[0]
+    assert "LIKE" in sql and sql.count("UNION") == 1
+    assert "ILIKE" not in sql
+
+
+def test_exact_match_survives_a_capped_prefix():
+    """Exact matches are unioned in uncapped; the capped prefix select keeps the shortest names."""
+    db = _CaptureSession()
+    search_service.search_users(db, "a")
+    sql = db.statements[0]
+    assert "WHERE users.deleted_at IS NULL AND (users.username = %(username_1)s OR lower(users.display_name) = %(lower_1)s) UNION" in sql
+    assert "ORDER BY length(users.username), users.username \n LIMIT" in sql
+    db = _CaptureSession()
+    search_service.search_tickers(db, "a")
+    sql = db.statements[0]
+    assert "WHERE tickers.symbol = %(symbol_1)s UNION" in sql
+    assert "ORDER BY length(tickers.symbol), tickers.symbol \n LIMIT" in sql
+
+
+def test_long_query_adds_trigram_candidates():
+    """Longer queries union in ILIKE and similarity (%) matches, capped."""
+    db = _CaptureSession()
+    search_service.search_tickers(db, "bitcoin")
+    sql = db.statements[0]
+    assert sql.count("UNION") == 2 and "ILIKE" in sql and "tickers.name %% " in sql
+    assert sql.count("LIMIT") == 2
+
+
+def test_search_posts_keyset_and_rank_order(monkeypatch):
+    """Post search filters on content_tsv, orders by ts_rank then id, and applies the cursor."""
+    from uuid import uuid4
+
+    from sqlalchemy.orm import Query, Session
+
+    captured = []
+    monkeypatch.setattr(Query, "all", lambda self: captured.append(self.statement) or [])
+    rows, next_key = search_service.search_posts(
+        Session(), "apple earnings", per_page=10, cursor=(0.25, uuid4()), exclude_user_ids=[uuid4()]
+    )
+    assert rows == [] and next_key is None
+    sql = str(captured[0].compile(dialect=postgresql.dialect()))
+    assert "posts.content_tsv @@ websearch_to_tsquery" in sql
+    assert "ORDER BY CAST(ts_rank(posts.content_tsv" in sql and "DESC, posts.id" in sql
+    assert "posts.user_id NOT IN" in sql
+    assert "AS posts_content_tsv" not in sql  # deferred: the document is never loaded
+
+
+def test_search_posts_cursor_compares_rank_as_float8(monkeypatch):
+    """ts_rank (float4) and the cursor rank are both cast to float8, so boundary ties match."""
+    from uuid import uuid4
+
+    from sqlalchemy.orm import Query, Session
+
+    captured = []
+    monkeypatch.setattr(Query, "all", lambda self: captured.append(self.statement) or [])
+    search_service.search_posts(Session(), "apple", cursor=(0.0607927, uuid4()))
+    sql = str(captured[0].compile(dialect=postgresql.dialect()))
+    rank = "CAST(ts_rank(posts.content_tsv, websearch_to_tsquery(%(websearch_to_tsquery_1)s, %(websearch_to_tsquery_2)s)) AS FLOAT(53))"
+    assert f"{rank} < CAST(%(param_1)s AS FLOAT(53))" in sql
+    assert f"{rank} = CAST(%(param_1)s AS FLOAT(53))" in sql
+    assert f"ORDER BY {rank} DESC" in sql
+
+
+def _fake_searches(monkeypatch, calls, barrier=None):
+    def fake(name):
+        def search(db, q, page, per_page):
+            calls.append((name, db, per_page))
+            if barrier is not None:
+                barrier.wait()  # only returns if both searches are in flight together
+            return [], 0
+        return search
+
+    monkeypatch.setattr(search_service, "search_users", fake("users"))
+    monkeypatch.setattr(search_service, "search_tickers", fake("tickers"))
+    monkeypatch.setattr(
+        search_service, "_search_in_own_session",
+        lambda search, q, page, per_page: search("own-session", q, page, per_page),
+    )
+
+
+def test_federated_search_runs_types_concurrently(monkeypatch):
+    """type=all runs the first search on the request session while the second runs on its own."""
+    import threading
+
+    calls = []
+    _fake_searches(monkeypatch, calls, threading.Barrier(2, timeout=2))
+    results = search_service.federated_search(
+        "request-session", "btc", ("users", "tickers"), per_page={"users": 5, "tickers": 10}
+    )
+    assert results == {"users": ([], 0), "tickers": ([], 0)}
+    assert sorted(calls) == [("tickers", "own-session", 10), ("users", "request-session", 5)]
+
+
+def test_federated_search_runs_inline_when_no_slot_is_free(monkeypatch):
+    """With every federated slot taken, sub-searches run sequentially on the request session."""
+    import threading
+
+    calls = []
+    _fake_searches(monkeypatch, calls)
+    monkeypatch.setattr(search_service, "_federated_slots", threading.BoundedSemaphore(1))
+    search_service._federated_slots.acquire()
+    search_service.federated_search("request-session", "btc", ("users", "tickers"))
+    assert calls == [("users", "request-session", 20), ("tickers", "request-session", 20)]
@@ -0,0 +1,94 @@
+"""Unit tests and lookup benchmark for app.services.suggest_service.PrefixIndex."""
+import random
+import string
+import timeit
+
+from app.services import suggest_service
+from app.services.suggest_service import PrefixIndex, ticker_suggestion, user_suggestion
+
+
+def _index():
+    index = PrefixIndex()
+    index.rebuild(
+        [
+            user_suggestion(1, "alice", "Alice Smith", None, score=10),
+            user_suggestion(2, "alicia", "Alicia Keys", None, score=500),
+            user_suggestion(3, "bob", "Bob Alfred", None, score=50),
+        ]
+    )
+    return index
+
+
+def test_search_ranks_by_score_and_matches_later_words():
+    """Prefix hits on username or any display-name word, highest score first."""
+    index = _index()
+    assert [s.label for s in index.search("ali")] == ["alicia", "alice"]
+    assert [s.label for s in index.search("al")] == ["alicia", "bob", "alice"]
+    assert [s.label for s in index.search("smi")] == ["alice"]
+    assert index.search("zz") == []
+
+
+def test_upsert_rename_replaces_keys_and_keeps_score():
+    """A rename drops the old keys, refreshes memoized short prefixes and keeps the score."""
+    index = _index()
+    assert [s.label for s in index.search("b")] == ["bob"]
+    index.upsert(*user_suggestion(3, "robert", "Robert", None))
+    assert index.search("b") == []
+    assert index.search("bob") == []
+    (robert,) = index.search("rob")
+    assert robert.score == 50
+
+
+def test_remove_and_ticker_entries():
+    """Removed items disappear; tickers match on symbol and name words."""
+    index = _index()
+    index.remove("2")
+    assert [s.label for s in index.search("ali")] == ["alice"]
+    tickers = PrefixIndex()
+    tickers.rebuild([ticker_suggestion("AAPL", "Apple Inc.", score=3)])
+    assert [s.label for s in tickers.search("inc")] == ["AAPL"]
+    assert [s.label for s in tickers.search("aap")] == ["AAPL"]
+
+
+def test_long_prefix_ranges_are_ranked_in_full(monkeypatch):
+    """Past MAX_SCAN entries the best item still wins, wherever it sorts in the range."""
+    monkeypatch.setattr(suggest_service, "MAX_SCAN", 5)
+    index = PrefixIndex()
+    index.rebuild(user_suggestion(i, f"abc{i:02d}", None, None, score=i) for i in range(40))
+    assert [s.label for s in index.search("abc", limit=3)] == ["abc39", "abc38", "abc37"]
+    assert [s.label for s in index.search("abc1", limit=2)] == ["abc19", "abc18"]
+
+
+def test_memoized_tops_are_updated_in_place_on_upsert(monkeypatch):
+    """Writes merge into memoized top lists; only a listed item dropping out forces a rescan."""
+    monkeypatch.setattr(suggest_service, "MAX_SCAN", 5)
+    index = PrefixIndex()
+    index.rebuild(user_suggestion(i, f"abc{i:02d}", None, None, score=i) for i in range(40))
+    index.search("a")
+    memo = index._tops["a"]
+    index.upsert(*user_suggestion(100, "abzz", None, None, score=1000))
+    index.upsert(*user_suggestion(101, "zed", None, None, score=2000))
+    assert index._tops["a"] is memo
+    assert [s.label for s in index.search("a", limit=2)] == ["abzz", "abc39"]
+    index.upsert(*user_suggestion(100, "zara", None, None))
+    assert "a" not in index._tops
+    assert [s.label for s in index.search("a", limit=2)] == ["abc39", "abc38"]
+    index.remove("39")
+    assert [s.label for s in index.search("a", limit=2)] == ["abc38", "abc37"]
+
+
+def test_benchmark_lookup_on_50k_users():
+    """Lookups stay in the tens of microseconds on a 50K-user index."""
+    rng = random.Random(7)
+
+    def name():
+        return "".join(rng.choices(string.ascii_lowercase, k=8))
+    index = PrefixIndex()
+    index.rebuild(
+        user_suggestion(i, name(), f"{name()} {name()}", None, rng.randint(0, 1000))
+        for i in range(50_000)
+    )
+    for prefix in ("a", "ab", "abc", "abcd"):
+        index.search(prefix)  # memoize short prefixes
+        per_call = min(timeit.repeat(lambda: index.search(prefix), number=200, repeat=3)) / 200
+        assert per_call < 1e-3, prefix
@@ -0,0 +1,102 @@
+"""Unit tests for app.services.telemetry."""
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.middleware.logging import init_request_logging
+from app.services import telemetry as telemetry_module
+from app.services.telemetry import (
+    Histogram,
+    aggregate_snapshot,
+    histogram_quantile,
+    instrument_engine,
+    merge_snapshots,
+    summarize,
+    telemetry,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    telemetry.reset()
+    yield
+    telemetry.reset()
+
+
+def test_histogram_quantiles_interpolate_within_buckets():
+    """p50 of 100 samples spread over 0-10ms lands inside the 5-10ms bucket."""
+    h = Histogram()
+    for i in range(100):
+        h.observe(i / 10)
+    d = h.to_dict()
+    assert d["count"] == 100 and d["counts"][0] == 51  # 0.0 .. 5.0 inclusive
+    assert 4 <= histogram_quantile(d, 0.5) <= 6
+    assert histogram_quantile(Histogram().to_dict(), 0.5) is None
+
+
+def test_routes_are_labelled_by_template():
+    """Requests are aggregated per method and route template, not per concrete path."""
+    app = FastAPI()
+    init_request_logging(app)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    client = TestClient(app)
+    for i in range(3):
+        client.get(f"/items/{i}")
+    client.get("/nope")
+    routes = telemetry.snapshot()["routes"]
+    assert routes["GET /items/{item_id}"]["latency"]["count"] == 3
+    assert routes["GET <unmatched>"]["latency"]["count"] == 1
+    assert telemetry.snapshot()["requests_today"] == 4
+
+
+def test_queries_are_attributed_to_the_current_request(monkeypatch):
+    """cursor-execute events count statements per request and sample slow ones."""
+    monkeypatch.setattr(telemetry_module, "SLOW_QUERY_MS", 0.0)
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    instrument_engine(engine)  # idempotent
+    token, queries = telemetry.begin_request("/feed")
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT   2"))
+    telemetry.end_request(token)
+    assert queries.count == 2 and queries.ms >= 0
+    snap = telemetry.snapshot()
+    assert snap["queries"]["count"] == 2
+    assert snap["slow_queries"]["count"] == 2
+    assert snap["slow_queries"]["recent"][-1]["statement"] == "SELECT 2"
+    assert snap["slow_queries"]["recent"][-1]["path"] == "/feed"
+
+
+def test_snapshots_merge_across_workers(tmp_path):
+    """Other workers' snapshot files add to this worker's live counters."""
+    telemetry.observe_request("GET /health", 200, 3.0, telemetry.begin_request("/health")[1])
+    other = telemetry.snapshot()
+    other["pid"] = -1
+    (tmp_path / "telemetry--1.json").write_text(json.dumps(other))
+    stale = dict(other, day="2000-01-01")
+    (tmp_path / "telemetry--2.json").write_text(json.dumps(stale))
+    merged = aggregate_snapshot(str(tmp_path))
+    assert merged["workers"] == 3
+    assert merged["routes"]["GET /health"]["latency"]["count"] == 3
+    assert merged["requests_today"] == 2  # the snapshot from another day is not "today"
+
+
+def test_summarize_fills_health_fields():
+    """Health numbers come out of the snapshot: averages, error rate, slow query count."""
+    queries = telemetry.begin_request("/x")[1]
+    telemetry.observe_request("GET /x", 200, 10.0, queries)
+    telemetry.observe_request("GET /x", 503, 30.0, queries)
+    health = summarize(merge_snapshots([telemetry.snapshot()]))
+    assert health["api"]["response_time_avg_ms"] == 20.0
+    assert health["api"]["error_rate"] == 0.5
+    assert health["api"]["requests_today"] == 2
+    assert health["database"]["slow_queries_count"] == 0
+    assert health["database"]["query_time_avg_ms"] is None
@@ -0,0 +1,94 @@
+"""Unit tests for app.services.ticker_cache."""
+from uuid import uuid4
+
+from app.services.ticker_cache import CachedTicker, TickerCache
+
+
+def _ticker(symbol: str) -> CachedTicker:
+    return CachedTicker(id=uuid4(), symbol=symbol, name=None, type="other")
+
+
+def test_get_counts_hits_and_misses():
+    """Lookups update hit/miss counters and hit_ratio."""
+    cache = TickerCache()
+    btc = _ticker("BTC")
+    cache.put_many([btc])
+    assert cache.get("BTC") == btc
+    assert cache.get("ETH") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+    assert stats["size"] == 1
+
+
+def test_get_by_id_returns_same_entry():
+    """Entries are reachable by id as well as symbol."""
+    cache = TickerCache()
+    aapl = _ticker("AAPL")
+    cache.put_many([aapl])
+    assert cache.get_by_id(aapl.id) == aapl
+
+
+def test_put_many_replaces_symbol_and_drops_old_id():
+    """Re-inserting a symbol with a new id removes the stale id entry."""
+    cache = TickerCache()
+    old = _ticker("SOL")
+    new = CachedTicker(id=uuid4(), symbol="SOL", name="Solana", type="crypto")
+    cache.put_many([old])
+    cache.put_many([new])
+    assert cache.get("SOL") == new
+    assert cache.get_by_id(old.id) is None
+
+
+def test_invalidate_removes_symbol_and_id():
+    """Invalidated symbols miss on both indexes."""
+    cache = TickerCache()
+    doge = _ticker("DOGE")
+    cache.put_many([doge])
+    cache.invalidate("DOGE")
+    assert cache.get("DOGE") is None
+    assert cache.get_by_id(doge.id) is None
+    cache.invalidate("UNKNOWN")
+
+
+def test_notifications_cache_new_tickers_and_invalidate_bare_symbols(monkeypatch):
+    """A row payload is cached as-is; a bare symbol (backfill retype) is dropped."""
+    from app.services import ticker_cache as module
+
+    cache = TickerCache()
+    monkeypatch.setattr(module, "ticker_cache", cache)
+    pepe = _ticker("PEPE")
+    module.apply_ticker_notification(module.ticker_payload(pepe))
+    assert cache.get("PEPE") == pepe
+    module.apply_ticker_notification("PEPE")
+    assert cache.get("PEPE") is None
+
+
+def test_upsert_notifies_only_inserted_rows():
+    """RETURNING flags inserted rows, so existing tickers are not re-announced to every worker."""
+    from sqlalchemy.dialects import postgresql
+
+    from app.services import ticker_service
+
+    executed = []
+    existing, created = _ticker("BTC"), _ticker("NEWCOIN")
+
+    class Row:
+        def __init__(self, t, inserted):
+            self.id, self.symbol, self.name, self.type, self.inserted = t.id, t.symbol, t.name, t.type, inserted
+
+    class FakeSession:
+        info = {}
+
+        def execute(self, stmt, params=None):
+            executed.append((stmt, params))
+            result = [Row(existing, False), Row(created, True)]
+            return type("Result", (), {"all": lambda self: result})()
+
+    ids = ticker_service.upsert_tickers(FakeSession(), ["BTC", "NEWCOIN"])
+    assert ids == {"BTC": existing.id, "NEWCOIN": created.id}
+    upsert_sql = str(executed[0][0].compile(dialect=postgresql.dialect()))
+    assert "xmax = 0 AS inserted" in upsert_sql
+    (notified,) = executed[1][1]["payloads"]
+    assert "NEWCOIN" in notified and "BTC" not in notified
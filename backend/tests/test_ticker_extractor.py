@@ -0,0 +1,30 @@
+"""
+Tests for app.utils.ticker_extractor (behaviour only; timings and their regression budgets
+live in app/scripts/bench_ticker_extractor.py).
+"""
+from app.scripts.bench_ticker_extractor import ADVERSARIAL, PLAIN_POST, SHORT_POST
+from app.utils.ticker_extractor import extract_tickers, extract_tickers_batch
+
+
+def test_extract_normalizes_dedupes_and_strips_us_suffix():
+    """Uppercase, first-occurrence order, .US removed before dedupe."""
+    assert extract_tickers("$aapl.us then $AAPL and #Tsla $btc $BTC") == ["AAPL", "TSLA", "BTC"]
+
+
+def test_extract_skips_empty_and_suffix_only():
+    """No markers, None, and a bare .US yield nothing."""
+    assert extract_tickers(None) == []
+    assert extract_tickers("no tickers here") == []
+    assert extract_tickers("$.US and $.us") == []
+
+
+def test_extract_respects_length_and_word_boundary():
+    """Symbols longer than 10 chars do not match; trailing dots are dropped."""
+    assert extract_tickers("$ABCDEFGHIJK") == []
+    assert extract_tickers("buy $SPY.") == ["SPY"]
+
+
+def test_batch_matches_single():
+    """extract_tickers_batch returns one list per text, identical to extract_tickers."""
+    texts = [SHORT_POST, PLAIN_POST, None, "", "$x.us #X", *ADVERSARIAL]
+    assert extract_tickers_batch(texts) == [extract_tickers(t) for t in texts]
@@ -0,0 +1,37 @@
+"""Unit tests for app.services.trending_service (pure ranking helpers)."""
+from uuid import uuid4
+
+from app.services.trending_service import TrendingRow, WINDOWS, growth_rate, rank_window
+
+
+def _row(**mentions) -> TrendingRow:
+    counts = {w: mentions.get(w, 0) for w in WINDOWS}
+    return TrendingRow(ticker_id=uuid4(), mentions=counts, previous=dict(counts), last_bucket=None)
+
+
+def test_growth_rate_relative_change():
+    """Growth is (current - previous) / previous, rounded."""
+    assert growth_rate(15, 10) == 0.5
+    assert growth_rate(5, 10) == -0.5
+
+
+def test_growth_rate_without_baseline_is_none():
+    """No mentions in the preceding window means growth is undefined."""
+    assert growth_rate(7, 0) is None
+
+
+def test_rank_window_orders_by_window_mentions_and_skips_zero():
+    """Tickers are ranked by mentions in the requested window; idle ones are excluded."""
+    hot = _row(**{"1h": 5, "24h": 10, "7d": 10})
+    steady = _row(**{"1h": 1, "24h": 40, "7d": 90})
+    idle = _row(**{"7d": 3})
+    assert rank_window([idle, steady, hot], "1h") == [hot, steady]
+    assert rank_window([idle, steady, hot], "24h") == [steady, hot]
+    assert rank_window([idle, steady, hot], "7d") == [steady, hot, idle]
+
+
+def test_rank_window_caps_at_top_k():
+    """Only top_k rows are returned."""
+    rows = [_row(**{"24h": n, "7d": n}) for n in range(1, 6)]
+    top = rank_window(rows, "24h", top_k=2)
+    assert [r.mentions["24h"] for r in top] == [5, 4]
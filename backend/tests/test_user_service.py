@@ -0,0 +1,52 @@
+"""Unit tests for the admin role cache in app.services.user_service."""
+from uuid import uuid4
+
+import pytest
+
+from app.services import user_service
+from app.services.user_service import invalidate_admin_role, is_admin
+
+
+class _BadgeSession:
+    """Answers the badge lookup and counts round trips."""
+
+    def __init__(self, badge):
+        self.badge = badge
+        self.queries = 0
+
+    def execute(self, stmt):
+        self.queries += 1
+        badge = self.badge
+
+        class _Result:
+            def scalar(self):
+                return badge
+
+        return _Result()
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    user_service.admin_role_cache.clear()
+    yield
+    user_service.admin_role_cache.clear()
+
+
+def test_admin_role_is_looked_up_once_per_user():
+    """require_admin checks after the first hit the cache, for admins and non-admins alike."""
+    admin, member = uuid4(), uuid4()
+    db = _BadgeSession("admin")
+    assert is_admin(db, admin) and is_admin(db, admin)
+    db.badge = "Verified"
+    assert not is_admin(db, member) and not is_admin(db, member)
+    assert db.queries == 2
+
+
+def test_invalidate_admin_role_forces_reload():
+    """A revoked badge takes effect on the next check once the user is invalidated."""
+    user_id = uuid4()
+    db = _BadgeSession("admin")
+    assert is_admin(db, user_id)
+    db.badge = None
+    invalidate_admin_role(user_id)
+    assert not is_admin(db, user_id)
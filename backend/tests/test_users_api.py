@@ -0,0 +1,85 @@
+"""Route tests for app.api.users: async routes run the sync service code through AsyncSession.run_sync."""
+import os
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import get_settings
+from app.services.auth_service import CurrentUser
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+class _RunSyncSession:
+    """AsyncSession stand-in: run_sync hands the function a sync session, as the real one does."""
+
+    def __init__(self):
+        self.sync_session = object()
+        self.run_sync_calls = 0
+
+    async def run_sync(self, fn, *args, **kwargs):
+        self.run_sync_calls += 1
+        return fn(self.sync_session, *args, **kwargs)
+
+
+@pytest.fixture
+def users_api(monkeypatch):
+    """The users router with its async sessions and auth overridden (engines are never connected)."""
+    # Importing app.database creates (unconnected) engines, so it needs some DATABASE_URL.
+    monkeypatch.setenv("DATABASE_URL", os.getenv("TEST_DATABASE_URL") or "postgresql://test@localhost/test")
+    get_settings.cache_clear()
+    from app.api import users
+    from app.database import get_async_db, get_async_read_db
+    from app.middleware.auth import get_current_user
+
+    get_settings.cache_clear()
+    db = _RunSyncSession()
+    me = CurrentUser(auth_user_id=str(uuid4()), claims={})
+    app = FastAPI()
+    app.include_router(users.router, prefix="/api/v1")
+    app.dependency_overrides[get_async_db] = lambda: db
+    app.dependency_overrides[get_async_read_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: me
+    monkeypatch.setattr(users, "get_user_stats", lambda sync_db, user_id: (3, 2, 1))
+    monkeypatch.setattr(users, "get_user_interests", lambda sync_db, user_id: ["crypto"])
+    return TestClient(app), users, db, me
+
+
+def test_get_me_runs_service_code_on_the_sync_session(users_api, monkeypatch):
+    """GET /users/me loads (or creates) the user and its stats inside one run_sync call."""
+    client, users, db, me = users_api
+    seen = []
+    user = SimpleNamespace(
+        id=me.auth_user_id, username="alice", display_name="Alice", bio=None, profile_picture_url=None,
+        badge=None, timezone=None, country=None, country_code=None, created_at=NOW, updated_at=NOW,
+    )
+
+    def get_or_create(sync_db, current):
+        seen.append((sync_db, current))
+        return user
+
+    monkeypatch.setattr(users, "get_or_create_user_for_auth", get_or_create)
+    r = client.get("/api/v1/users/me")
+    assert r.status_code == 200
+    body = r.json()
+    assert body["username"] == "alice" and body["interests"] == ["crypto"]
+    assert body["stats"] == {"follower_count": 3, "following_count": 2, "post_count": 1}
+    assert seen == [(db.sync_session, me)] and db.run_sync_calls == 1
+
+
+def test_unknown_profile_is_a_404_raised_inside_run_sync(users_api, monkeypatch):
+    """An HTTPException from the sync loader propagates out of run_sync as the response."""
+    from app.api import deps
+
+    client, _, db, _ = users_api
+    lookups = []
+    monkeypatch.setattr(deps, "get_user_by_id", lambda sync_db, user_id: lookups.append(sync_db))
+    r = client.get(f"/api/v1/users/{uuid4()}")
+    assert r.status_code == 404 and r.json() == {"detail": "User not found"}
+    assert lookups == [db.sync_session] and db.run_sync_calls == 1
+    assert client.get("/api/v1/users/not-a-uuid").status_code == 404
+    assert db.run_sync_calls == 1  # rejected before touching the database
@@ -0,0 +1,42 @@
+import { afterEach, beforeEach, describe, expect, it, vi } from 'vitest';
+
+describe('apiFetch read-your-writes pin', () => {
+  const sent: Headers[] = [];
+
+  beforeEach(() => {
+    vi.resetModules();
+    sent.length = 0;
+    vi.stubEnv('NEXT_PUBLIC_API_URL', 'https://api.example.com');
+  });
+
+  afterEach(() => {
+    vi.unstubAllGlobals();
+    vi.unstubAllEnvs();
+  });
+
+  function stubFetch(responseHeaders: Record<string, string>[]) {
+    vi.stubGlobal(
+      'fetch',
+      vi.fn(async (_url: string, init: RequestInit) => {
+        sent.push(new Headers(init.headers));
+        return new Response('{}', { headers: responseHeaders.shift() ?? {} });
+      })
+    );
+  }
+
+  it('echoes the pin from a write on later requests until it expires', async () => {
+    const until = Math.floor(Date.now() / 1000) + 5;
+    stubFetch([{ 'X-Primary-Until': `${until}.abc` }]);
+    const { apiFetch } = await import('./client');
+
+    await apiFetch('/posts', { method: 'POST', body: '{}' });
+    await apiFetch('/feed');
+    expect(sent[0].get('X-Primary-Until')).toBeNull();
+    expect(sent[1].get('X-Primary-Until')).toBe(`${until}.abc`);
+
+    vi.spyOn(Date, 'now').mockReturnValue((until + 1) * 1000);
+    await apiFetch('/feed');
+    expect(sent[2].get('X-Primary-Until')).toBeNull();
+    vi.restoreAllMocks();
+  });
+});
@@ -1,5 +1,6 @@
 /**
- * API client for backend. Adds Authorization header when session exists.
+ * API client for backend. Adds Authorization header when session exists, and echoes the
+ * backend's read-your-writes pin (X-Primary-Until) so reads right after a write see it.
  */
 
 /**
@@ -26,6 +27,42 @@ function parseErrorDetail(text: string, fallback: string): string {
   }
 }
 
+/**
+ * Read-your-writes pin. After a write the backend returns a short-lived token; while it is
+ * valid, requests that send it back read from the primary database instead of a lagging
+ * replica. Kept in sessionStorage too, so a reload right after posting still sends it.
+ */
+const PRIMARY_HEADER = 'X-Primary-Until';
+const PRIMARY_STORAGE_KEY = 'pageshare_primary_until';
+let primaryPin: string | null = null;
+
+function pinStorage(): Storage | null {
+  try {
+    return typeof sessionStorage === 'undefined' ? null : sessionStorage;
+  } catch {
+    return null;
+  }
+}
+
+/** Current pin token ("<unix until>.<signature>"), or null when none or expired. */
+function currentPin(): string | null {
+  const token = primaryPin ?? pinStorage()?.getItem(PRIMARY_STORAGE_KEY) ?? null;
+  if (!token) return null;
+  const until = Number(token.split('.')[0]);
+  return Number.isFinite(until) && until > Date.now() / 1000 ? token : null;
+}
+
+function rememberPin(res: Response): void {
+  const token = res.headers.get(PRIMARY_HEADER);
+  if (!token) return;
+  primaryPin = token;
+  try {
+    pinStorage()?.setItem(PRIMARY_STORAGE_KEY, token);
+  } catch {
+    // Storage full or disabled: the in-memory pin still covers this page.
+  }
+}
+
 export interface ApiClientOptions {
   /** Access token for Authorization header. If not provided, no auth header is sent. */
   accessToken?: string | null;
@@ -34,7 +71,7 @@ export interface ApiClientOptions {
 }
 
 /**
- * Fetch wrapper that adds base URL and optional Authorization header.
+ * Fetch wrapper that adds base URL, optional Authorization header and the read-your-writes pin.
  */
 export async function apiFetch(
   path: string,
@@ -52,11 +89,17 @@ export async function apiFetch(
   if (!headers.has('Content-Type') && fetchOptions.body && typeof fetchOptions.body === 'string') {
     headers.set('Content-Type', 'application/json');
   }
+  const pin = currentPin();
+  if (pin && !headers.has(PRIMARY_HEADER)) {
+    headers.set(PRIMARY_HEADER, pin);
+  }
 
-  return fetch(url, {
+  const res = await fetch(url, {
     ...fetchOptions,
     headers,
   });
+  rememberPin(res);
+  return res;
 }
 
 /**
@@ -122,18 +165,13 @@ export async function apiUploadMedia(
   files: File[],
   accessToken: string
 ): Promise<{ uploads: { url: string; filename: string; content_type: string; size_bytes: number }[] }> {
-  const base = getBaseUrl();
-  const url = `${base}/api/v1/media/upload`;
-
   const formData = new FormData();
   files.forEach((file) => formData.append('files', file));
 
-  const res = await fetch(url, {
+  const res = await apiFetch('/media/upload', {
     method: 'POST',
-    headers: {
-      Authorization: `Bearer ${accessToken}`,
-    },
     body: formData,
+    accessToken,
   });
 
   if (!res.ok) {
@@ -151,18 +189,13 @@ export async function apiUploadProfilePicture(
   file: File,
   accessToken: string
 ): Promise<{ data: { profile_picture_url?: string | null } }> {
-  const base = getBaseUrl();
-  const url = `${base}/api/v1/users/me/profile-picture`;
-
   const formData = new FormData();
   formData.append('file', file);
 
-  const res = await fetch(url, {
+  const res = await apiFetch('/users/me/profile-picture', {
     method: 'POST',
-    headers: {
-      Authorization: `Bearer ${accessToken}`,
-    },
     body: formData,
+    accessToken,
   });
 
   if (!res.ok) {